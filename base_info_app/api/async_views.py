@@ -0,0 +1,14 @@
+from coderr_backend.async_views import AsyncReadView
+from ..models import PlatformStats
+from .views import BaseInfoView
+
+
+class AsyncBaseInfoView(AsyncReadView):
+    """GET /api/base-info/ unter ASGI – öffentlich, eine Primärschlüssel-Abfrage."""
+    sync_view_class = BaseInfoView
+    authentication_classes = []
+    requires_authentication = False
+
+    async def get(self, request):
+        stats = await PlatformStats.aload()
+        return self.render(BaseInfoView.serialize(stats))
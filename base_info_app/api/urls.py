@@ -1,6 +1,9 @@
 from django.urls import path
+from coderr_backend.async_views import read_view
 from . import views
+from .async_views import AsyncBaseInfoView
 
 urlpatterns = [
-    path('', views.BaseInfoView.as_view(), name='base-info'),
+    path('', read_view(views.BaseInfoView, AsyncBaseInfoView), name='base-info'),
+    path('metrics/', views.MetricsView.as_view(), name='base-info-metrics'),
 ]
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class BaseInfoAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'base_info_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from coderr_backend.database import configure_sqlite
+        # Gilt für alle Verbindungen des Projekts, auch in Management-Kommandos
+        connection_created.connect(configure_sqlite, dispatch_uid='configure_sqlite')
@@ -0,0 +1,111 @@
+"""
+Hilfsfunktionen für die Benchmark-Kommandos: eine wegwerfbare Testdatenbank,
+ein schneller Seed und Messung/EXPLAIN einzelner QuerySets.
+"""
+import re
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+from base_info_app.fake_data import FakeDataGenerator
+
+
+@contextmanager
+def benchmark_database(test_name=None):
+    """
+    Legt eine frische Testdatenbank (inkl. Migrationen) an und entfernt sie danach.
+    Die eigentliche Datenbank aus den Settings wird dabei nicht angefasst.
+    test_name setzt TEST['NAME'], z. B. eine Datei statt SQLite im Speicher,
+    wenn mehrere Threads gleichzeitig schreiben.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if test_name is not None:
+        test_settings['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
+
+
+def seed_dataset(businesses=200, customers=2000, offers_per_business=10, orders=20000, reviews=10000,
+                 batch_size=1000, seed=42):
+    """Befüllt die Datenbank über den FakeDataGenerator; Kennzahlen und Zähler werden danach neu berechnet."""
+    FakeDataGenerator(prefix='bench', password=None, batch_size=batch_size, seed=seed, tokens=False).generate(
+        businesses=businesses, customers=customers, offers_per_business=offers_per_business,
+        orders=orders, reviews=reviews,
+    )
+    rebuild_aggregates()
+    analyze()
+
+
+def rebuild_aggregates():
+    """bulk_create umgeht die Signal-Handler – abgeleitete Tabellen deshalb neu berechnen."""
+    from base_info_app.models import PlatformStats
+    from offers_app.cache import bump_generation
+    from orders_app.models import OrderStatusCount
+    from reviews_app.models import BusinessRating
+    PlatformStats.recompute()
+    BusinessRating.rebuild()
+    OrderStatusCount.rebuild()
+    bump_generation()
+
+
+def analyze():
+    # Statistiken für den Query-Planer (sqlite_stat1 bzw. pg_statistic) aktualisieren
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def time_queryset(queryset, repeat=20):
+    """Median- und Maximalzeit (ms) für das vollständige Auswerten des QuerySets."""
+    return time_callable(lambda: list(queryset.all()), repeat)
+
+
+def time_callable(func, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': round(statistics.median(timings), 3), 'max_ms': round(max(timings), 3)}
+
+
+def percentiles(timings):
+    """p50/p95/p99 und Maximum (ms) einer Liste von Laufzeiten in Sekunden."""
+    if not timings:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+    ordered = sorted(timings)
+
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+    return {'p50_ms': pick(0.50), 'p95_ms': pick(0.95), 'p99_ms': pick(0.99), 'max_ms': round(ordered[-1] * 1000, 3)}
+
+
+def explain(queryset):
+    return queryset.explain().splitlines()
+
+
+def explain_count(queryset):
+    """Plan der COUNT(*)-Abfrage, die z. B. PageNumberPagination ausführt."""
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN SELECT COUNT(*) FROM ({sql}) subquery", params)
+        return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+
+
+def plan_warnings(plan_lines):
+    """Markiert vollständige Tabellenscans und temporäre Sortierungen im SQLite-Plan."""
+    warnings = []
+    for line in plan_lines:
+        match = re.search(r'\bSCAN (\S+)(.*)', line)
+        if match and 'USING' not in match.group(2) and 'VIRTUAL TABLE' not in match.group(2):
+            warnings.append('full scan')
+        if 'TEMP B-TREE' in line:
+            warnings.append('temp b-tree')
+    return warnings
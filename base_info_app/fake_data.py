@@ -0,0 +1,202 @@
+"""
+Schneller Generator für synthetische Daten (Benutzer, Profile, Tokens, Angebote,
+Bestellungen, Bewertungen) in großen Mengen.
+
+Statt über RegistrationView/OfferSerializer (Passwort-Hashing und mehrere
+Abfragen pro Objekt) wird alles per bulk_create in Blöcken geschrieben:
+  - ein einziger, vorab berechneter Passwort-Hash für alle Benutzer,
+  - Token-Schlüssel mit Token.generate_key() ohne Token.save(),
+  - Primärschlüssel kommen aus bulk_create (RETURNING), es werden nur IDs
+    und wenige Werte im Speicher gehalten.
+bulk_create umgeht die Signal-Handler – abgeleitete Tabellen (PlatformStats,
+BusinessRating, OrderStatusCount) muss der Aufrufer danach neu berechnen,
+siehe benchmarks.rebuild_aggregates().
+
+Verteilungen: Anzahl Angebote je Anbieter und Bestellungen/Bewertungen je
+Anbieter folgen einer schiefen Verteilung (wenige sehr gefragte Anbieter),
+Preise sind log-normalverteilt, Bewertungen überwiegend 4–5 Sterne.
+"""
+import math
+import random
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from rest_framework.authtoken.models import Token
+
+from coderr_backend.database import write_transaction
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from reviews_app.models import Review
+from user_auth_app.models import Profile
+
+User = get_user_model()
+
+CATEGORIES = [
+    ('Logo Design', ['Logo', 'Vektordateien', 'Farbvarianten']),
+    ('Webseite', ['Responsive Layout', 'Kontaktformular', 'SEO-Grundlagen']),
+    ('Übersetzung', ['Korrekturlesen', 'Fachbegriffe', 'Glossar']),
+    ('Social Media', ['Beitragsplanung', 'Grafiken', 'Hashtag-Recherche']),
+    ('Fotografie', ['Bildbearbeitung', 'Nutzungsrechte', 'Online-Galerie']),
+    ('Videoschnitt', ['Untertitel', 'Farbkorrektur', 'Musik']),
+]
+CITIES = ['Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt', 'Stuttgart', 'Leipzig', 'Dresden']
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Hanna', 'Jonas', 'Lea', 'Lukas', 'Mia', 'Paul']
+LAST_NAMES = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner', 'Becker', 'Hoffmann']
+OFFER_TYPES = ('basic', 'standard', 'premium')
+ORDER_STATUSES = (['completed', 'in_progress', 'cancelled'], [60, 25, 15])
+RATINGS = ([1, 2, 3, 4, 5], [3, 4, 10, 33, 50])
+
+
+def popularity_weights(count, rng, skew=1.1):
+    """Kumulierte, zipf-artige Gewichte in zufälliger Reihenfolge (für rng.choices(cum_weights=...))."""
+    weights = [1 / (rank ** skew) for rank in range(1, count + 1)]
+    rng.shuffle(weights)
+    return list(accumulate(weights))
+
+
+def chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+class FakeDataGenerator:
+    """
+    Erzeugt die Daten blockweise. Alle Zufallswerte stammen aus einem Random
+    mit festem Seed – gleiche Parameter liefern denselben Datensatz.
+    """
+
+    def __init__(self, prefix='fake', password=None, batch_size=5000, seed=42, tokens=True, progress=None):
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.tokens = tokens
+        self.progress = progress or (lambda message: None)
+        # Ein Hash für alle: make_password ist mit Absicht langsam (ohne Passwort: nicht nutzbar)
+        self.password_hash = make_password(password)
+
+    def generate(self, businesses, customers, offers_per_business, orders, reviews):
+        with write_transaction():
+            business_ids = self.create_users('business', businesses)
+            customer_ids = self.create_users('customer', customers)
+            offers = self.create_offers(business_ids, offers_per_business)
+            self.create_orders(offers, customer_ids, orders)
+            self.create_reviews(business_ids, customer_ids, reviews)
+        return {'businesses': len(business_ids), 'customers': len(customer_ids), 'offers': len(offers)}
+
+    def create_users(self, user_type, count):
+        rng = self.rng
+        ids = []
+        for start, size in chunks(count, self.batch_size):
+            users = []
+            for index in range(start, start + size):
+                username = f"{self.prefix}_{user_type}_{index}"
+                users.append(User(
+                    username=username, email=f"{username}@example.com", password=self.password_hash,
+                    first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                ))
+            users = User.objects.bulk_create(users, batch_size=self.batch_size)
+            Profile.objects.bulk_create([
+                Profile(
+                    user_id=user.id, type=user_type, email=user.email, first_name=user.first_name,
+                    last_name=user.last_name, location=rng.choice(CITIES),
+                    working_hours='9-17' if user_type == 'business' else '',
+                )
+                for user in users
+            ], batch_size=self.batch_size)
+            if self.tokens:
+                Token.objects.bulk_create(
+                    [Token(key=Token.generate_key(), user_id=user.id) for user in users], batch_size=self.batch_size
+                )
+            ids.extend(user.id for user in users)
+            self.progress(f"{len(ids)}/{count} {user_type}-Benutzer")
+        return ids
+
+    def create_offers(self, business_ids, offers_per_business):
+        """Legt Angebote mit je drei Details an und gibt (business_id, titel, basispreis, lieferzeit, kategorie) je Angebot zurück."""
+        rng = self.rng
+        # Wenige Anbieter mit vielen Angeboten, die meisten mit wenigen (Mittelwert offers_per_business)
+        counts = [max(1, round(rng.expovariate(1 / offers_per_business))) for _ in business_ids]
+        specs = [
+            (business_id, index) for business_id, count in zip(business_ids, counts) for index in range(count)
+        ]
+        offers = []
+        for start, size in chunks(len(specs), self.batch_size):
+            batch = []
+            for business_id, index in specs[start:start + size]:
+                category = rng.randrange(len(CATEGORIES))
+                base_price = Decimal(min(5000, max(10, round(math.exp(rng.gauss(4.6, 0.8))))))
+                delivery = rng.choice([1, 2, 3, 3, 5, 5, 7, 7, 10, 14])
+                offer = Offer(
+                    user_id=business_id, title=f"{CATEGORIES[category][0]} Paket {index + 1}",
+                    description=f"{CATEGORIES[category][0]}: {', '.join(CATEGORIES[category][1])}",
+                    min_price=base_price, min_delivery_time=delivery,
+                )
+                batch.append(offer)
+                offers.append((business_id, offer.title, base_price, delivery, category))
+            batch = Offer.objects.bulk_create(batch, batch_size=self.batch_size)
+            OfferDetail.objects.bulk_create([
+                OfferDetail(offer_id=offer.id, **detail_values(spec, step))
+                for offer, spec in zip(batch, offers[start:start + size])
+                for step in range(3)
+            ], batch_size=self.batch_size)
+            self.progress(f"{len(offers)}/{len(specs)} Angebote")
+        return offers
+
+    def create_orders(self, offers, customer_ids, count):
+        rng = self.rng
+        offer_weights = popularity_weights(len(offers), rng)
+        statuses, status_weights = ORDER_STATUSES
+        for start, size in chunks(count, self.batch_size):
+            batch = []
+            for offer in rng.choices(offers, cum_weights=offer_weights, k=size):
+                values = detail_values(offer, rng.choices(range(3), weights=[50, 35, 15])[0])
+                values.pop('title')
+                batch.append(Order(
+                    customer_user_id=rng.choice(customer_ids), business_user_id=offer[0], title=offer[1],
+                    status=rng.choices(statuses, status_weights)[0], **values,
+                ))
+            Order.objects.bulk_create(batch, batch_size=self.batch_size)
+            self.progress(f"{start + size}/{count} Bestellungen")
+
+    def create_reviews(self, business_ids, customer_ids, count):
+        """Eindeutige Paare (Anbieter, Bewerter) wie von unique_together verlangt."""
+        rng = self.rng
+        count = min(count, len(business_ids) * len(customer_ids))
+        business_weights = popularity_weights(len(business_ids), rng)
+        ratings, rating_weights = RATINGS
+        pairs = set()
+        created = 0
+        while created < count:
+            batch = []
+            while len(batch) < min(self.batch_size, count - created):
+                business_index = rng.choices(range(len(business_ids)), cum_weights=business_weights)[0]
+                pair = business_index * len(customer_ids) + rng.randrange(len(customer_ids))
+                if pair in pairs:
+                    continue
+                pairs.add(pair)
+                batch.append(Review(
+                    business_user_id=business_ids[business_index],
+                    reviewer_id=customer_ids[pair % len(customer_ids)],
+                    rating=rng.choices(ratings, rating_weights)[0],
+                    description=rng.choice(['Gute Zusammenarbeit', 'Schnell und zuverlässig', 'Sehr zu empfehlen',
+                                            'Ganz okay', 'Kommunikation könnte besser sein']),
+                ))
+            Review.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+            self.progress(f"{created}/{count} Bewertungen")
+
+
+def detail_values(offer, step):
+    """Werte des Details basic/standard/premium (step 0–2) eines Angebots – auch für Bestellungen."""
+    _, _, base_price, delivery, category = offer
+    offer_type = OFFER_TYPES[step]
+    return {
+        'title': offer_type.title(),
+        'revisions': (1, 3, 5)[step],
+        'delivery_time_in_days': delivery + (2 - step) * 2,
+        'price': base_price * (1, 2, 4)[step],
+        'features': CATEGORIES[category][1][:step + 1],
+        'offer_type': offer_type,
+    }
@@ -0,0 +1,333 @@
+import io
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.urls import resolve
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from base_info_app.benchmarks import benchmark_database, percentiles, seed_dataset
+from base_info_app.management.commands.benchmark_offer_import import offer_payload
+from offers_app.models import Offer
+from orders_app.models import Order
+from user_auth_app.models import Profile
+
+User = get_user_model()
+
+
+class Session:
+    """Ein virtueller Nutzer: eigener Client im eigenen Thread, misst jede Anfrage."""
+
+    def __init__(self, recorder, identity, rng):
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.recorder = recorder
+        self.identity = identity
+        self.rng = rng
+
+    def request(self, method, path, expected=200, data=None, token=None):
+        self.client.credentials(**({'HTTP_AUTHORIZATION': f"Token {token}"} if token else {}))
+        endpoint = f"{method.upper()} /{resolve(path.split('?')[0]).route}"
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count):
+            response = getattr(self.client, method)(path, data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+        elapsed = time.perf_counter() - start
+        self.recorder.add(endpoint, elapsed, queries, response, expected)
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('get', path, **kwargs)
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = {}
+        self.aborted = defaultdict(int)
+
+    def add(self, endpoint, elapsed, queries, response, expected):
+        ok = response.status_code == expected
+        with self.lock:
+            self.samples[endpoint].append((elapsed, queries, ok))
+            if not ok and endpoint not in self.errors:
+                self.errors[endpoint] = f"{response.status_code}: {response.content[:200].decode(errors='replace')}"
+
+    def abort(self, scenario):
+        with self.lock:
+            self.aborted[scenario] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            timings = [sample[0] for sample in samples]
+            queries = [sample[1] for sample in samples]
+            endpoints[endpoint] = {
+                'requests': len(samples),
+                'errors': sum(1 for sample in samples if not sample[2]),
+                'rps': round(len(samples) / elapsed, 1),
+                **percentiles(timings),
+                'queries_avg': round(sum(queries) / len(queries), 2),
+                'queries_max': max(queries),
+            }
+            if endpoint in self.errors:
+                endpoints[endpoint]['first_error'] = self.errors[endpoint]
+        all_samples = [sample for samples in self.samples.values() for sample in samples]
+        total = {
+            'requests': len(all_samples),
+            'errors': sum(1 for sample in all_samples if not sample[2]),
+            'rps': round(len(all_samples) / elapsed, 1),
+            **percentiles([sample[0] for sample in all_samples]),
+            'queries_avg': round(sum(sample[1] for sample in all_samples) / max(len(all_samples), 1), 2),
+            'aborted_scenarios': dict(sorted(self.aborted.items())),
+        }
+        return total, endpoints
+
+
+# --- Szenarien: jede Funktion ist ein Durchlauf eines virtuellen Nutzers ---
+
+def anonymous_browsing(session, data):
+    session.get('/api/offers/')
+    session.get('/api/offers/?search=logo')
+    session.get(f"/api/offers/?creator_id={session.rng.choice(data['businesses'])}&ordering=min_price")
+    session.get('/api/offers/?min_price=500&max_delivery_time=5&ordering=-min_price')
+    page = session.get('/api/offers/?pagination=cursor').json()
+    if page.get('next'):
+        session.get(page['next'].split('localhost', 1)[1])
+    session.get('/api/base-info/')
+    session.get(data['media_path'])
+
+
+def onboarding(session, data):
+    username = f"neu_{session.identity['index']}_{next(session.identity['counter'])}"
+    session.request('post', '/api/registration/', data={
+        'username': username, 'email': f"{username}@example.com", 'password': 'geheim123',
+        'repeated_password': 'geheim123', 'type': 'customer',
+    })
+    session.request('post', '/api/login/', data={'username': username, 'password': 'geheim123'})
+
+
+def customer_ordering(session, data):
+    token = session.identity['customer_token']
+    offer = session.identity['offer']
+    session.get('/api/offers/?ordering=min_price')
+    session.get(f"/api/offers/{offer['id']}/", token=token)
+    session.get(f"/api/offerdetails/{offer['detail_id']}/", token=token)
+    order = session.request(
+        'post', '/api/orders/', expected=201, data={'offer_detail_id': offer['detail_id']}, token=token
+    ).json()
+    session.get('/api/orders/', token=token)
+    session.get(f"/api/orders/{order['id']}/", token=token)
+    session.get(f"/api/profile/{session.identity['customer_id']}/", token=token)
+    session.request('patch', f"/api/profile/{session.identity['customer_id']}/",
+                    data={'location': session.rng.choice(['Berlin', 'Hamburg', 'München'])}, token=token)
+    session.get('/api/profiles/business/', token=token)
+
+
+def business_dashboard(session, data):
+    token = session.identity['business_token']
+    business_id = session.identity['business_id']
+    session.get(f"/api/profile/{business_id}/", token=token)
+    session.get('/api/orders/', token=token)
+    session.request('patch', f"/api/orders/{session.identity['order_id']}/",
+                    data={'status': session.rng.choice(['in_progress', 'completed'])}, token=token)
+    session.get(f"/api/order-count/{business_id}/", token=token)
+    session.get(f"/api/completed-order-count/{business_id}/", token=token)
+    session.get(f"/api/reviews/?business_user_id={business_id}", token=token)
+    session.get('/api/profiles/customer/', token=token)
+
+    index = next(session.identity['counter'])
+    offer = session.request('post', '/api/offers/', expected=201, data=offer_payload(index), token=token).json()
+    session.request('patch', f"/api/offers/{offer['id']}/", data=offer_payload(index + 1), token=token)
+    session.request('delete', f"/api/offers/{offer['id']}/", expected=204, token=token)
+    session.request('post', '/api/offers/bulk/', expected=201,
+                    data=[offer_payload(index + step) for step in range(3)], token=token)
+
+
+def review_posting(session, data):
+    token = session.identity['customer_token']
+    business_id = session.identity['business_id']
+    session.get(f"/api/reviews/?business_user_id={business_id}&ordering=-rating", token=token)
+    review = session.request('post', '/api/reviews/', expected=201, data={
+        'business_user': business_id, 'rating': session.rng.randint(1, 5), 'description': 'Schnell und zuverlässig',
+    }, token=token).json()
+    session.get(f"/api/reviews/{review['id']}/", token=token)
+    session.request('patch', f"/api/reviews/{review['id']}/", data={'rating': 5}, token=token)
+    session.get(f"/api/profile/{business_id}/", token=token)
+    # Wieder löschen, damit der nächste Durchlauf erneut bewerten darf
+    session.request('delete', f"/api/reviews/{review['id']}/", expected=204, token=token)
+
+
+def administration(session, data):
+    session.get('/api/base-info/metrics/', token=data['admin_token'])
+    order = session.request('post', '/api/orders/', expected=201, data={
+        'offer_detail_id': session.identity['offer']['detail_id'],
+    }, token=session.identity['customer_token']).json()
+    session.request('delete', f"/api/orders/{order['id']}/", expected=204, token=data['admin_token'])
+
+
+SCENARIOS = {
+    'anonymous_browsing': anonymous_browsing,
+    'customer_ordering': customer_ordering,
+    'business_dashboard': business_dashboard,
+    'review_posting': review_posting,
+    'onboarding': onboarding,
+    'administration': administration,
+}
+DEFAULT_MIX = 'anonymous_browsing=6,customer_ordering=3,business_dashboard=2,review_posting=2,onboarding=1,administration=1'
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise CommandError(f"Unbekanntes Szenario: {name} (verfügbar: {', '.join(SCENARIOS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Lastbenchmark über alle API-Routen: erzeugt eine temporäre Datenbank mit Testdaten und lässt "
+        "virtuelle Nutzer parallel realistische Abläufe ausführen (anonymes Stöbern, Bestellen, "
+        "Business-Dashboard, Bewerten, Registrierung, Administration). Ausgabe als JSON mit Durchsatz, "
+        "p50/p95/p99 und SQL-Abfragen pro Anfrage je Endpunkt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=8, help='Gleichzeitige virtuelle Nutzer (Threads).')
+        parser.add_argument('--iterations', type=int, default=20, help='Szenario-Durchläufe pro Nutzer.')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='Gewichtung der Szenarien, z. B. "anonymous_browsing=3,onboarding=1".')
+        parser.add_argument('--businesses', type=int, default=100)
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--offers-per-business', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='JSON in diese Datei schreiben statt auf stdout.')
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        recorder = Recorder()
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            MEDIA_ROOT=os.path.join(directory, 'media'), IMAGE_RENDITIONS_ASYNC=False,
+        ), benchmark_database(test_name=os.path.join(directory, 'benchmark.sqlite3')):
+            # Datei statt SQLite im Speicher: die Threads schreiben gleichzeitig
+            self.stderr.write("Erzeuge Testdaten ...")
+            seed_dataset(
+                businesses=options['businesses'], customers=options['customers'],
+                offers_per_business=options['offers_per_business'],
+                orders=options['customers'] * 10, reviews=options['customers'] * 3, seed=options['seed'],
+            )
+            data, identities = self.prepare(options['users'])
+
+            self.stderr.write(f"Starte {options['users']} virtuelle Nutzer ...")
+            threads = [
+                threading.Thread(target=self.run_user, args=(recorder, identity, data, mix, options))
+                for identity in identities
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+        total, endpoints = recorder.summary(elapsed)
+        result = {
+            'config': {key: options[key] for key in (
+                'users', 'iterations', 'businesses', 'customers', 'offers_per_business', 'seed')},
+            'mix': mix,
+            'duration_s': round(elapsed, 3),
+            'total': total,
+            'endpoints': endpoints,
+        }
+        output = json.dumps(result, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(
+                f"{total['requests']} Anfragen, {total['rps']} req/s, p99 {total['p99_ms']} ms, "
+                f"{total['errors']} Fehler – Ergebnis in {options['output']}"
+            ))
+        else:
+            self.stdout.write(output)
+
+    def prepare(self, users):
+        """Eigene Kunden/Anbieter pro virtuellem Nutzer, damit Bewertungen und Bestellungen nicht kollidieren."""
+        password = make_password('geheim123')
+        admin = User.objects.create(username='benchmark_admin', password=password, is_staff=True)
+        data = {
+            'admin_token': Token.objects.create(user=admin).key,
+            'businesses': list(Profile.objects.filter(type='business').values_list('user_id', flat=True)[:50]),
+            'media_path': self.create_media(),
+        }
+        identities = []
+        for index in range(users):
+            customer = User.objects.create(username=f"benchmark_customer_{index}", password=password)
+            business = User.objects.create(username=f"benchmark_business_{index}", password=password)
+            Profile.objects.create(user=customer, type='customer')
+            Profile.objects.create(user=business, type='business')
+            offer = Offer.objects.create(user=business, title=f"Benchmark {index}", description='Logo Design')
+            detail = offer.details.create(
+                title='Basic', revisions=1, delivery_time_in_days=5, price=100, features=['Logo'], offer_type='basic'
+            )
+            order = Order.objects.create(
+                customer_user=customer, business_user=business, title=offer.title, revisions=1,
+                delivery_time_in_days=5, price=100, features=['Logo'], offer_type='basic', status='in_progress',
+            )
+            identities.append({
+                'index': index,
+                'counter': itertools.count(),
+                'customer_id': customer.id,
+                'customer_token': Token.objects.create(user=customer).key,
+                'business_id': business.id,
+                'business_token': Token.objects.create(user=business).key,
+                'offer': {'id': offer.id, 'detail_id': detail.id},
+                'order_id': order.id,
+            })
+        return data, identities
+
+    def create_media(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 600), (30, 120, 200)).save(buffer, 'JPEG')
+        profile = Profile.objects.filter(type='business').first()
+        profile.file.save('benchmark.jpg', ContentFile(buffer.getvalue()))
+        return profile.file.url
+
+    def run_user(self, recorder, identity, data, mix, options):
+        rng = random.Random(options['seed'] + identity['index'])
+        session = Session(recorder, identity, rng)
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        try:
+            for _ in range(options['iterations']):
+                name = rng.choices(names, weights)[0]
+                try:
+                    SCENARIOS[name](session, data)
+                except (KeyError, ValueError):
+                    # Eine Antwort ohne erwarteten Inhalt (Fehler ist bereits gezählt) – Durchlauf abbrechen
+                    recorder.abort(name)
+        finally:
+            connection.close()
@@ -0,0 +1,145 @@
+import asyncio
+import importlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from django.urls import clear_url_caches
+from rest_framework.authtoken.models import Token
+
+from base_info_app.benchmarks import benchmark_database, percentiles, seed_dataset
+from offers_app.models import Offer, OfferDetail
+from user_auth_app.models import Profile
+
+# Module mit read_view(); werden für den ASGI-Lauf mit ASYNC_READ_VIEWS neu geladen
+URL_MODULES = [
+    'base_info_app.api.urls', 'orders_app.api.urls', 'offers_app.api.urls', 'reviews_app.api.urls',
+    'coderr_backend.urls',
+]
+
+
+@contextmanager
+def async_read_views(enabled):
+    # Die Test-Clients senden Host "testserver"
+    try:
+        with override_settings(ASYNC_READ_VIEWS=enabled, ALLOWED_HOSTS=['testserver']):
+            reload_urls()
+            yield
+    finally:
+        reload_urls()
+
+
+def reload_urls():
+    for name in URL_MODULES:
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+class Command(BaseCommand):
+    help = (
+        "Vergleicht in einer temporären Datenbank die lesenden Endpunkte unter WSGI (synchrone "
+        "Views in einem Thread-Pool) und ASGI (Async-Views) bei 50–500 gleichzeitigen Clients: "
+        "Anfragen/s sowie p50/p95/p99 der Antwortzeit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, nargs='+', default=[50, 100, 250, 500])
+        parser.add_argument('--requests', type=int, default=2000, help='Anfragen je Durchlauf.')
+        parser.add_argument('--wsgi-threads', type=int, default=32, help='Threads des simulierten WSGI-Servers.')
+        parser.add_argument('--businesses', type=int, default=100)
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben.')
+
+    def handle(self, *args, **options):
+        results = []
+        with benchmark_database():
+            self.stderr.write("Erzeuge Testdaten ...")
+            seed_dataset(businesses=options['businesses'], customers=options['customers'],
+                         orders=options['customers'] * 5, reviews=options['customers'] * 2)
+            paths, token = self.get_paths()
+            headers = {'Authorization': f"Token {token}"}
+
+            for clients in options['clients']:
+                with async_read_views(False):
+                    wsgi = self.run_wsgi(paths, headers, clients, options['requests'], options['wsgi_threads'])
+                with async_read_views(True):
+                    asgi = self.run_asgi(paths, headers, clients, options['requests'])
+                results.append({'clients': clients, 'wsgi': wsgi, 'asgi': asgi})
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{result['clients']} gleichzeitige Clients"))
+            for name in ('wsgi', 'asgi'):
+                row = result[name]
+                self.stdout.write(
+                    f"  {name.upper()}  {row['rps']:>8} req/s  p50 {row['p50_ms']} ms  p95 {row['p95_ms']} ms  "
+                    f"p99 {row['p99_ms']} ms  Fehler {row['errors']}"
+                )
+
+    def get_paths(self):
+        business = Profile.objects.filter(type='business').select_related('user').first().user
+        token = Token.objects.create(user=business).key
+        offer = Offer.objects.filter(user=business).first()
+        detail = OfferDetail.objects.filter(offer=offer).first()
+        paths = [
+            '/api/offers/',
+            '/api/offers/?ordering=min_price&max_delivery_time=5',
+            f"/api/offers/{offer.id}/",
+            f"/api/offerdetails/{detail.id}/",
+            f"/api/reviews/?business_user_id={business.id}",
+            f"/api/order-count/{business.id}/",
+            f"/api/completed-order-count/{business.id}/",
+            '/api/base-info/',
+        ]
+        return paths, token
+
+    def run_wsgi(self, paths, headers, clients, total, threads):
+        """Clients als asyncio-Tasks, die Anfragen laufen wie unter einem WSGI-Server in einem Thread-Pool."""
+        local = threading.local()
+
+        def request(path):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client()
+            return client.get(path, headers=headers).status_code
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                return await self.drive(lambda path: loop.run_in_executor(pool, request, path), paths, clients, total)
+        return asyncio.run(main())
+
+    def run_asgi(self, paths, headers, clients, total):
+        async def main():
+            client = AsyncClient()
+
+            async def request(path):
+                return (await client.get(path, headers=headers)).status_code
+            return await self.drive(request, paths, clients, total)
+        return asyncio.run(main())
+
+    async def drive(self, request, paths, clients, total):
+        """Startet `clients` gleichzeitige Clients, die zusammen `total` Anfragen stellen."""
+        timings = []
+        errors = 0
+        remaining = iter(range(total))
+
+        async def client_loop():
+            nonlocal errors
+            for index in remaining:
+                start = time.perf_counter()
+                status_code = await request(paths[index % len(paths)])
+                timings.append(time.perf_counter() - start)
+                if status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        return {'rps': round(total / elapsed, 1), **percentiles(timings), 'errors': errors}
@@ -0,0 +1,77 @@
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from base_info_app.benchmarks import benchmark_database
+from offers_app.models import Offer
+from user_auth_app.models import Profile
+
+User = get_user_model()
+
+
+def offer_payload(index):
+    return {
+        'title': f"Import {index}",
+        'description': f"Logo Design Paket {index}",
+        'details': [
+            {'title': offer_type.title(), 'revisions': step + 1, 'delivery_time_in_days': 7 - step * 2,
+             'price': 100 + step * 50, 'features': ['Logo'], 'offer_type': offer_type}
+            for step, offer_type in enumerate(('basic', 'standard', 'premium'))
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Vergleicht in einer temporären Datenbank den Durchsatz (Angebote/s) von einzelnen "
+        "POST /api/offers/ mit dem Sammelimport POST /api/offers/bulk/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, default=500)
+        parser.add_argument('--chunk-size', type=int, default=500, help='Angebote pro Bulk-Anfrage.')
+        parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben.')
+
+    def handle(self, *args, **options):
+        count = options['offers']
+        with benchmark_database():
+            user = User.objects.create_user(username='import_business', password='!')
+            Profile.objects.create(user=user, type='business')
+            client = APIClient(SERVER_NAME='localhost')
+            client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+            payloads = [offer_payload(index) for index in range(count)]
+
+            start = time.perf_counter()
+            for payload in payloads:
+                response = client.post('/api/offers/', payload, format='json')
+                if response.status_code != 201:
+                    raise CommandError(f"POST /api/offers/ fehlgeschlagen: {response.status_code}")
+            single_seconds = time.perf_counter() - start
+
+            Offer.objects.all().delete()
+            start = time.perf_counter()
+            chunk_size = options['chunk_size']
+            for offset in range(0, count, chunk_size):
+                response = client.post('/api/offers/bulk/', payloads[offset:offset + chunk_size], format='json')
+                if response.status_code != 201:
+                    raise CommandError(f"POST /api/offers/bulk/ fehlgeschlagen: {response.status_code}")
+            bulk_seconds = time.perf_counter() - start
+
+        results = [
+            {'name': 'POST /api/offers/ (einzeln)', 'offers': count, 'seconds': round(single_seconds, 3),
+             'offers_per_second': round(count / single_seconds, 1)},
+            {'name': f"POST /api/offers/bulk/ ({chunk_size} pro Anfrage)", 'offers': count,
+             'seconds': round(bulk_seconds, 3), 'offers_per_second': round(count / bulk_seconds, 1)},
+        ]
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(f"{result['name']}: {result['offers_per_second']} Angebote/s ({result['seconds']} s)")
+        self.stdout.write(self.style.SUCCESS(
+            f"Sammelimport ist {round(single_seconds / bulk_seconds, 1)}x schneller."
+        ))
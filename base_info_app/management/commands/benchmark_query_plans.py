@@ -0,0 +1,135 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from base_info_app.benchmarks import (
+    benchmark_database, explain, explain_count, plan_warnings, seed_dataset, time_callable, time_queryset,
+)
+from base_info_app.models import PlatformStats
+from offers_app.api.views import OfferListCreateView
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order, OrderStatusCount
+from reviews_app.models import Review
+from user_auth_app.api.views import BusinessProfileListView
+
+
+def view_queryset(view_class, path):
+    """Die Hauptabfrage einer List-View mit echten Filtern der View (ohne Pagination)."""
+    view = view_class()
+    view.request = Request(APIRequestFactory().get(path))
+    view.format_kwarg = None
+    view.kwargs = {}
+    return view.filter_queryset(view.get_queryset())
+
+
+def offer_list_queryset(query_string):
+    return view_queryset(OfferListCreateView, f"/api/offers/?{query_string}")
+
+
+def business_profile_queryset(query_string):
+    return view_queryset(BusinessProfileListView, f"/api/profiles/business/?{query_string}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Erzeugt in einer temporären Datenbank einen großen Datensatz und gibt für die "
+        "Hauptabfrage jedes Endpunkts EXPLAIN QUERY PLAN und Laufzeiten aus."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--businesses', type=int, default=500)
+        parser.add_argument('--customers', type=int, default=5000)
+        parser.add_argument('--offers-per-business', type=int, default=20)
+        parser.add_argument('--orders', type=int, default=100000)
+        parser.add_argument('--reviews', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.stderr.write("Erzeuge Testdaten ...")
+            seed_dataset(
+                businesses=options['businesses'],
+                customers=options['customers'],
+                offers_per_business=options['offers_per_business'],
+                orders=options['orders'],
+                reviews=options['reviews'],
+            )
+            results = [
+                self.measure(name, queryset, options['repeat'])
+                for name, queryset in self.get_queries()
+            ]
+            results.insert(1, self.measure_count(
+                'GET /api/offers/ (COUNT der Pagination)', offer_list_queryset(''), options['repeat']
+            ))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            flags = ', '.join(result['warnings']) or 'ok'
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{result['name']}  median {result['median_ms']} ms, max {result['max_ms']} ms  [{flags}]"
+            ))
+            for line in result['plan']:
+                self.stdout.write(f"    {line}")
+
+    def get_queries(self):
+        business = (
+            Order.objects.values('business_user_id').annotate(total=Count('id')).order_by('-total').first()
+        )['business_user_id']
+        customer = Order.objects.values_list('customer_user_id', flat=True).first()
+        offer = Offer.objects.filter(user_id=business).first()
+        # Cursor irgendwo in der Mitte der Liste, um tiefes Blättern zu messen
+        cursor_offer = Offer.objects.order_by('-updated_at', '-id')[Offer.objects.count() // 2]
+        offer_ids = list(Offer.objects.order_by('-updated_at').values_list('id', flat=True)[:6])
+
+        return [
+            ('GET /api/offers/', offer_list_queryset('')[:6]),
+            ('GET /api/offers/?min_price=500&ordering=min_price', offer_list_queryset('min_price=500&ordering=min_price')[:6]),
+            ('GET /api/offers/?max_delivery_time=3', offer_list_queryset('max_delivery_time=3')[:6]),
+            (f"GET /api/offers/?creator_id={business}", offer_list_queryset(f"creator_id={business}")[:6]),
+            ('GET /api/offers/?search=logo', offer_list_queryset('search=logo')[:6]),
+            ('GET /api/offers/?pagination=cursor (mittlere Seite)', Offer.objects.filter(
+                Q(updated_at__lt=cursor_offer.updated_at) | Q(updated_at=cursor_offer.updated_at, id__lt=cursor_offer.id)
+            ).order_by('-updated_at', '-id')[:7]),
+            ('GET /api/offers/ (details prefetch)', OfferDetail.objects.filter(offer_id__in=offer_ids).only('id', 'offer_id')),
+            (f"GET /api/offers/{offer.id}/", Offer.objects.filter(pk=offer.id)),
+            (f"GET /api/offerdetails/{offer.id}/", OfferDetail.objects.filter(pk=offer.id)),
+            ('GET /api/orders/ (business)', Order.objects.filter(
+                Q(customer_user=business) | Q(business_user=business)).order_by('-created_at')),
+            ('GET /api/orders/ (customer)', Order.objects.filter(
+                Q(customer_user=customer) | Q(business_user=customer)).order_by('-created_at')),
+            (f"GET /api/order-count/{business}/", OrderStatusCount.objects.filter(
+                business_user_id=business, status='in_progress')),
+            (f"GET /api/reviews/?business_user_id={business}", Review.objects.filter(
+                business_user__id=business).order_by('-updated_at')),
+            (f"GET /api/reviews/?reviewer_id={customer}", Review.objects.filter(
+                reviewer__id=customer).order_by('-updated_at')),
+            ('GET /api/reviews/', Review.objects.order_by('-updated_at')[:50]),
+            ('GET /api/base-info/', PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_PK)),
+            ('GET /api/profiles/business/', business_profile_queryset('')[:20]),
+            # Sortierung nach Bewertung: Sortierschritt über alle Geschäftsprofile (siehe BusinessProfileListView)
+            ('GET /api/profiles/business/?ordering=-average_rating', business_profile_queryset('ordering=-average_rating')[:20]),
+        ]
+
+    def measure_count(self, name, queryset, repeat):
+        plan = explain_count(queryset)
+        return {
+            'name': name,
+            **time_callable(queryset.count, repeat),
+            'plan': plan,
+            'warnings': sorted(set(plan_warnings(plan))),
+        }
+
+    def measure(self, name, queryset, repeat):
+        plan = explain(queryset)
+        return {
+            'name': name,
+            **time_queryset(queryset, repeat),
+            'plan': plan,
+            'warnings': sorted(set(plan_warnings(plan))),
+        }
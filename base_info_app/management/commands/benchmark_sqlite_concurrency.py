@@ -0,0 +1,199 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections, connection, connections, transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from base_info_app.benchmarks import benchmark_database, percentiles, seed_dataset
+from coderr_backend.database import sqlite_pragmas
+from offers_app.models import Offer, OfferDetail
+from user_auth_app.models import Profile
+
+User = get_user_model()
+
+# SQLite so, wie Django es ohne coderr_backend/database.py öffnet
+DEFAULT_PROFILE = {
+    'pragmas': {'busy_timeout': None, 'journal_mode': 'DELETE', 'synchronous': 'FULL', 'mmap_size': 0, 'cache_size': None},
+    'transaction_mode': 'DEFERRED',
+    'conn_max_age': 0,
+}
+
+
+@contextmanager
+def database_profile(profile):
+    """Setzt PRAGMAs, transaction_mode und CONN_MAX_AGE für alle neuen Verbindungen (auch in Threads)."""
+    settings_dict = connection.settings_dict
+    saved = settings_dict.get('CONN_MAX_AGE'), dict(settings_dict.get('OPTIONS', {}))
+    connections.close_all()
+    try:
+        with override_settings(SQLITE_PRAGMAS=profile['pragmas']):
+            settings_dict['CONN_MAX_AGE'] = profile['conn_max_age']
+            settings_dict.setdefault('OPTIONS', {})['transaction_mode'] = profile['transaction_mode']
+            # journal_mode lässt sich nur umstellen, solange keine andere Verbindung offen ist
+            connection.ensure_connection()
+            yield
+            connections.close_all()
+    finally:
+        settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'] = saved
+
+
+def tuned_profile():
+    """Die Werte aus den Settings (SQLITE_PRAGMAS und DATABASES['default']), mit WAL wie unter wsgi.py/asgi.py."""
+    database = settings.DATABASES['default']
+    pragmas = dict(settings.SQLITE_PRAGMAS)
+    if pragmas['journal_mode'] is None:
+        pragmas.update(journal_mode='WAL', synchronous=pragmas['synchronous'] or 'NORMAL')
+    return {
+        'pragmas': pragmas,
+        'transaction_mode': database.get('OPTIONS', {}).get('transaction_mode', 'DEFERRED'),
+        'conn_max_age': database.get('CONN_MAX_AGE', 0),
+    }
+
+
+def profiles():
+    """Standardwerte, die Settings und die Settings mit dem jeweils anderen transaction_mode."""
+    tuned = tuned_profile()
+    other_mode = 'DEFERRED' if tuned['transaction_mode'] == 'IMMEDIATE' else 'IMMEDIATE'
+    return [
+        ('default', DEFAULT_PROFILE),
+        ('tuned', tuned),
+        (f"tuned, transaction_mode={other_mode}", {**tuned, 'transaction_mode': other_mode}),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Misst in einer temporären SQLite-Datei gleichzeitige Lese- und Schreibzugriffe "
+        "(GET auf Angebote/Bewertungen, POST /api/orders/) – einmal mit den SQLite-Standardwerten, "
+        "einmal mit den Einstellungen aus coderr_backend/database.py und einmal zusätzlich mit dem "
+        "anderen transaction_mode (IMMEDIATE/DEFERRED): Durchsatz, p95 und Anzahl \"database is locked\". "
+        "atomic_reads sind rein lesende atomic()-Blöcke – sie zeigen, was IMMEDIATE Lesern kostet."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8, help='Lesende Threads.')
+        parser.add_argument('--writers', type=int, default=4, help='Schreibende Threads.')
+        parser.add_argument('--atomic-readers', type=int, default=2,
+                            help='Threads mit rein lesenden atomic()-Blöcken (wie ATOMIC_REQUESTS bei GET).')
+        parser.add_argument('--seconds', type=float, default=10, help='Dauer je Durchlauf.')
+        parser.add_argument('--businesses', type=int, default=100)
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben.')
+
+    def handle(self, *args, **options):
+        results = {}
+        with tempfile.TemporaryDirectory() as directory, \
+                benchmark_database(test_name=os.path.join(directory, 'concurrency.sqlite3')):
+            # Datei statt SQLite im Speicher: nur so greifen Journal-Modus und Sperren wie im Betrieb
+            self.stderr.write("Erzeuge Testdaten ...")
+            seed_dataset(businesses=options['businesses'], customers=options['customers'],
+                         orders=options['customers'] * 5, reviews=options['customers'] * 2)
+            data = self.prepare()
+            for name, profile in profiles():
+                self.stderr.write(f"Durchlauf '{name}' ...")
+                with database_profile(profile):
+                    results[name] = {
+                        'transaction_mode': profile['transaction_mode'],
+                        'pragmas': sqlite_pragmas(connection),
+                        **self.run(data, options),
+                    }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, row in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}: {row['transaction_mode']} {row['pragmas']}"))
+            for kind in ('reads', 'atomic_reads', 'writes'):
+                stats = row[kind]
+                self.stdout.write(
+                    f"  {kind:<12} {stats['per_second']:>8} /s  p50 {stats['p50_ms']} ms  p95 {stats['p95_ms']} ms  "
+                    f"p99 {stats['p99_ms']} ms  locked {stats['locked']}  Fehler {stats['errors']}"
+                )
+
+    def prepare(self):
+        detail_ids = list(OfferDetail.objects.values_list('id', flat=True)[:500])
+        offer = Offer.objects.first()
+        business_id = offer.user_id
+        return {
+            'customers': list(User.objects.filter(profile__type='customer')[:200]),
+            'detail_ids': detail_ids,
+            'paths': [
+                '/api/offers/',
+                '/api/offers/?ordering=min_price&max_delivery_time=5',
+                f"/api/offers/{offer.id}/",
+                f"/api/reviews/?business_user_id={business_id}",
+                f"/api/order-count/{business_id}/",
+                '/api/base-info/',
+            ],
+            'reader': Profile.objects.filter(type='business').select_related('user').first().user,
+        }
+
+    def run(self, data, options):
+        deadline = time.perf_counter() + options['seconds']
+        results = {'reads': [], 'atomic_reads': [], 'writes': []}
+        lock = threading.Lock()
+
+        def worker(kind, index):
+            rng = random.Random(index)
+            client = APIClient(SERVER_NAME='localhost')
+            user = data['customers'][index % len(data['customers'])] if kind == 'writes' else data['reader']
+            client.force_authenticate(user)
+            timings, locked, errors = [], 0, 0
+            try:
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        if kind == 'reads':
+                            response = client.get(rng.choice(data['paths']))
+                            ok = response.status_code == 200
+                        elif kind == 'atomic_reads':
+                            with transaction.atomic():
+                                ok = len(Offer.objects.order_by('-updated_at')[:20].values_list('id', 'title')) > 0
+                        else:
+                            response = client.post('/api/orders/', {'offer_detail_id': rng.choice(data['detail_ids'])},
+                                                   format='json')
+                            ok = response.status_code == 201
+                    except OperationalError as error:
+                        locked += 'locked' in str(error)
+                        errors += 'locked' not in str(error)
+                        ok = None
+                    timings.append(time.perf_counter() - start)
+                    errors += ok is False
+                    # Wie request_finished unter einem echten Server: Verbindung je nach CONN_MAX_AGE schließen
+                    close_old_connections()
+            finally:
+                connections.close_all()
+            with lock:
+                results[kind].append((timings, locked, errors))
+
+        threads = [threading.Thread(target=worker, args=('reads', index)) for index in range(options['readers'])]
+        threads += [threading.Thread(target=worker, args=('atomic_reads', index))
+                    for index in range(options['atomic_readers'])]
+        threads += [threading.Thread(target=worker, args=('writes', index)) for index in range(options['writers'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        summary = {}
+        for kind, rows in results.items():
+            timings = [timing for row in rows for timing in row[0]]
+            summary[kind] = {
+                'count': len(timings),
+                'per_second': round(len(timings) / elapsed, 1),
+                **percentiles(timings),
+                'locked': sum(row[1] for row in rows),
+                'errors': sum(row[2] for row in rows),
+            }
+        return summary
@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from base_info_app.benchmarks import analyze, rebuild_aggregates
+from base_info_app.fake_data import FakeDataGenerator
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Erzeugt synthetische Benutzer (mit Profil und Token), Angebote mit je drei Details, "
+        "Bestellungen und Bewertungen per bulk_create in der konfigurierten Datenbank."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Anzahl Benutzer insgesamt.')
+        parser.add_argument('--business-share', type=float, default=0.1, help='Anteil der Anbieter (0–1).')
+        parser.add_argument('--offers-per-business', type=int, default=5, help='Mittlere Anzahl Angebote je Anbieter.')
+        parser.add_argument('--orders', type=int, default=None, help='Standard: 5 je Kunde.')
+        parser.add_argument('--reviews', type=int, default=None, help='Standard: 1 je Kunde.')
+        parser.add_argument('--password', default='geheim123', help='Gemeinsames Passwort aller erzeugten Benutzer.')
+        parser.add_argument('--prefix', default='fake', help='Präfix der Benutzernamen.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if not 0 < options['business_share'] < 1:
+            raise CommandError("--business-share muss zwischen 0 und 1 liegen.")
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Es gibt bereits Benutzer mit dem Präfix '{prefix}_' – anderes --prefix wählen.")
+
+        businesses = max(1, round(options['users'] * options['business_share']))
+        customers = max(1, options['users'] - businesses)
+        orders = options['orders'] if options['orders'] is not None else customers * 5
+        reviews = options['reviews'] if options['reviews'] is not None else customers
+
+        start = time.perf_counter()
+        generator = FakeDataGenerator(
+            prefix=prefix, password=options['password'], batch_size=options['batch_size'], seed=options['seed'],
+            progress=self.stderr.write if options['verbosity'] > 1 else None,
+        )
+        counts = generator.generate(
+            businesses=businesses, customers=customers, offers_per_business=options['offers_per_business'],
+            orders=orders, reviews=reviews,
+        )
+        # bulk_create umgeht die Signal-Handler
+        rebuild_aggregates()
+        analyze()
+        elapsed = time.perf_counter() - start
+
+        rows = (
+            (counts['businesses'] + counts['customers']) * 3  # Benutzer, Profil, Token
+            + counts['offers'] * 4 + orders + min(reviews, businesses * customers)
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['businesses']} Anbieter, {counts['customers']} Kunden, {counts['offers']} Angebote, "
+            f"{orders} Bestellungen und {min(reviews, businesses * customers)} Bewertungen erzeugt: "
+            f"{rows} Zeilen in {elapsed:.1f} s ({rows / elapsed * 60:,.0f} Zeilen/min)."
+        ))
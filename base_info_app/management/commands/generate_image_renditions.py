@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from coderr_backend.images import is_current, update_renditions
+from offers_app.models import Offer
+from user_auth_app.models import Profile
+
+# (Modell, Bildfeld, Feld mit der Rendition-Zuordnung)
+TARGETS = {
+    'offers': (Offer, 'image', 'image_renditions'),
+    'profiles': (Profile, 'file', 'file_renditions'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Erzeugt fehlende oder veraltete Bildvarianten (Renditions) für vorhandene "
+        "Angebotsbilder und Profilbilder (Backfill)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=sorted(TARGETS), help='Nur Angebote oder nur Profile bearbeiten.')
+        parser.add_argument('--workers', type=int, default=1, help='Anzahl paralleler Threads.')
+
+    def handle(self, *args, **options):
+        names = [options['only']] if options['only'] else sorted(TARGETS)
+        for name in names:
+            model, field_name, renditions_field = TARGETS[name]
+            pending = [
+                instance.pk
+                for instance in model.objects.exclude(**{field_name: ''}).exclude(**{f"{field_name}__isnull": True})
+                .only('pk', field_name, renditions_field).order_by('pk').iterator()
+                if not is_current(getattr(instance, renditions_field), getattr(instance, field_name))
+            ]
+
+            if options['workers'] > 1:
+                with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                    results = executor.map(lambda pk: self.process(model, pk, field_name, renditions_field, True), pending)
+                    failed = sum(1 for ok in results if not ok)
+            else:
+                failed = sum(1 for pk in pending if not self.process(model, pk, field_name, renditions_field))
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {len(pending) - failed} von {len(pending)} Bildern verarbeitet."
+            ))
+            if failed:
+                self.stdout.write(self.style.WARNING(f"{name}: {failed} Bild(er) fehlgeschlagen."))
+
+    def process(self, model, pk, field_name, renditions_field, threaded=False):
+        try:
+            update_renditions(model, pk, field_name, renditions_field)
+            return True
+        except (OSError, ValueError) as exc:
+            self.stderr.write(f"{model.__name__} {pk}: {exc}")
+            return False
+        finally:
+            if threaded:
+                connection.close()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from coderr_backend.database import write_transaction
+from base_info_app.models import PlatformStats
+
+
+class Command(BaseCommand):
+    help = "Berechnet die Plattform-Kennzahlen für /api/base-info/ aus den Quelltabellen neu und meldet Abweichungen."
+
+    def handle(self, *args, **options):
+        with write_transaction():
+            stored = PlatformStats.objects.select_for_update().filter(pk=PlatformStats.SINGLETON_PK).first()
+            actual = PlatformStats.calculate()
+            drift = {
+                field: (getattr(stored, field, None), value)
+                for field, value in actual.items()
+                if getattr(stored, field, None) != value
+            }
+            PlatformStats.recompute()
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Keine Abweichungen gefunden."))
+            return
+        for field, (old, new) in drift.items():
+            self.stdout.write(f"{field}: {old} -> {new}")
+        self.stdout.write(self.style.WARNING(f"{len(drift)} Kennzahl(en) korrigiert."))
@@ -0,0 +1,45 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from coderr_backend.replicas import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Kopiert die primäre SQLite-Datenbank per Online-Backup in das Replikat (SQLITE_REPLICA_PATH). "
+        "Leser des Replikats sehen bis zum Ende der Kopie den alten Stand, Schreiber der primären "
+        "Datenbank werden nicht blockiert (WAL). Mit --interval läuft die Kopie fortlaufend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Sekunden zwischen zwei Kopien (0 = einmalig).')
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError("Kein Replikat konfiguriert – SQLITE_REPLICA_PATH setzen.")
+        primary = connections['default']
+        if primary.vendor != 'sqlite' or settings.DATABASES[alias]['ENGINE'] != primary.settings_dict['ENGINE']:
+            raise CommandError("sync_replica kopiert nur SQLite-Dateien; andere Datenbanken replizieren selbst.")
+
+        while True:
+            elapsed = self.copy(primary, settings.DATABASES[alias]['NAME'])
+            self.stdout.write(self.style.SUCCESS(f"Replikat '{alias}' aktualisiert in {elapsed * 1000:.0f} ms."))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, primary, path):
+        start = time.perf_counter()
+        primary.ensure_connection()
+        target = sqlite3.connect(path, timeout=(settings.SQLITE_PRAGMAS.get('busy_timeout') or 5000) / 1000)
+        try:
+            # In einem Schritt: die Kopie entspricht einem einzigen Stand der primären Datenbank
+            primary.connection.backup(target)
+        finally:
+            target.close()
+        return time.perf_counter() - start
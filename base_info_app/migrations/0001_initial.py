@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:43
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def create_stats_row(apps, schema_editor):
+    PlatformStats = apps.get_model('base_info_app', 'PlatformStats')
+    Review = apps.get_model('reviews_app', 'Review')
+    Offer = apps.get_model('offers_app', 'Offer')
+    Profile = apps.get_model('user_auth_app', 'Profile')
+    reviews = Review.objects.aggregate(count=Count('id'), total=Sum('rating'))
+    PlatformStats.objects.update_or_create(pk=1, defaults={
+        'review_count': reviews['count'],
+        'rating_sum': reviews['total'] or 0,
+        'business_profile_count': Profile.objects.filter(type='business').count(),
+        'offer_count': Offer.objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('offers_app', '0005_offer_updated_at_id_idx'),
+        ('reviews_app', '0001_initial'),
+        ('user_auth_app', '0005_alter_profile_description_alter_profile_email_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('business_profile_count', models.PositiveIntegerField(default=0)),
+                ('offer_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(create_stats_row, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,75 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, F, Sum
 
-# Create your models here.
+from offers_app.models import Offer
+from reviews_app.models import Review
+
+
+class PlatformStats(models.Model):
+    """
+    Einzeilige Tabelle (pk=1) mit den Kennzahlen für /api/base-info/.
+    Wird von den Signal-Handlern in signals.py laufend angepasst und kann mit
+    `manage.py reconcile_platform_stats` jederzeit neu berechnet werden.
+    """
+    SINGLETON_PK = 1
+
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    business_profile_count = models.PositiveIntegerField(default=0)
+    offer_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'platform stats'
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return 0.0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @classmethod
+    def calculate(cls):
+        """Berechnet alle Kennzahlen direkt aus den Quelltabellen."""
+        reviews = Review.objects.aggregate(count=Count('id'), total=Sum('rating'))
+        return {
+            'review_count': reviews['count'],
+            'rating_sum': reviews['total'] or 0,
+            'business_profile_count': get_user_model().objects.filter(profile__type='business').count(),
+            'offer_count': Offer.objects.count(),
+        }
+
+    @classmethod
+    def recompute(cls):
+        stats, _ = cls.objects.update_or_create(pk=cls.SINGLETON_PK, defaults=cls.calculate())
+        return stats
+
+    @classmethod
+    def load(cls):
+        try:
+            return cls.objects.get(pk=cls.SINGLETON_PK)
+        except cls.DoesNotExist:
+            return cls.recompute()
+
+    @classmethod
+    async def aload(cls):
+        try:
+            return await cls.objects.aget(pk=cls.SINGLETON_PK)
+        except cls.DoesNotExist:
+            return await sync_to_async(cls.recompute)()
+
+    @classmethod
+    def bump(cls, **deltas):
+        """Addiert die Deltas atomar in der Datenbank (UPDATE ... SET x = x + n)."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updated = cls.objects.filter(pk=cls.SINGLETON_PK).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        if not updated:
+            cls.recompute()
+
+    def __str__(self):
+        return f"{self.review_count} Bewertungen, {self.offer_count} Angebote"
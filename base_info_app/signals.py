@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from offers_app.models import Offer
+from offers_app.signals import offers_bulk_created
+from reviews_app.models import Review
+from user_auth_app.models import Profile
+from .models import PlatformStats
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.bump(review_count=1, rating_sum=instance.rating)
+        return
+    previous = getattr(instance, '_loaded_rating', None)
+    if previous is not None:
+        PlatformStats.bump(rating_sum=instance.rating - previous)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    PlatformStats.bump(review_count=-1, rating_sum=-instance.rating)
+
+
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.bump(offer_count=1)
+
+
+@receiver(offers_bulk_created, sender=Offer)
+def offers_bulk_created_handler(sender, offers, **kwargs):
+    PlatformStats.bump(offer_count=len(offers))
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    PlatformStats.bump(offer_count=-1)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.bump(business_profile_count=int(instance.type == 'business'))
+    elif hasattr(instance, '_loaded_type'):
+        # Ohne _loaded_type (z. B. .only() ohne type) ist kein Typwechsel bekannt
+        PlatformStats.bump(
+            business_profile_count=int(instance.type == 'business') - int(instance._loaded_type == 'business')
+        )
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    if instance.type == 'business':
+        PlatformStats.bump(business_profile_count=-1)
@@ -1,3 +1,81 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from offers_app.models import Offer
+from reviews_app.models import Review
+from user_auth_app.models import Profile
+from .models import PlatformStats
+
+
+class PlatformStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user('customer', password='secret')
+        Profile.objects.create(user=self.customer, type='customer')
+
+    def base_info(self):
+        response = self.client.get('/api/base-info/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_profile_create_and_delete(self):
+        self.assertEqual(self.base_info()['business_profile_count'], 1)
+        other = User.objects.create_user('other', password='secret')
+        profile = Profile.objects.create(user=other, type='business')
+        self.assertEqual(self.base_info()['business_profile_count'], 2)
+        profile.delete()
+        self.assertEqual(self.base_info()['business_profile_count'], 1)
+
+    def test_profile_type_change(self):
+        profile = Profile.objects.get(user=self.customer)
+        profile.type = 'business'
+        profile.save()
+        self.assertEqual(self.base_info()['business_profile_count'], 2)
+
+    def test_partial_profile_save_keeps_business_count(self):
+        profile = Profile.objects.only('id', 'user_id', 'location').get(user=self.business)
+        profile.location = 'Berlin'
+        profile.save()
+        self.assertEqual(self.base_info()['business_profile_count'], 1)
+        self.assertEqual(Profile.objects.get(user=self.business).location, 'Berlin')
+
+    def test_offer_create_and_delete(self):
+        offer = Offer.objects.create(user=self.business, title='Logo Design', description='Logos')
+        Offer.objects.create(user=self.business, title='Webseite', description='Webseiten')
+        self.assertEqual(self.base_info()['offer_count'], 2)
+        offer.delete()
+        self.assertEqual(self.base_info()['offer_count'], 1)
+
+    def test_review_create_and_delete(self):
+        review = Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description='Gut')
+        other = User.objects.create_user('other', password='secret')
+        Review.objects.create(business_user=self.business, reviewer=other, rating=5, description='Sehr gut')
+        info = self.base_info()
+        self.assertEqual(info['review_count'], 2)
+        self.assertEqual(info['average_rating'], 4.5)
+
+        review.delete()
+        info = self.base_info()
+        self.assertEqual(info['review_count'], 1)
+        self.assertEqual(info['average_rating'], 5.0)
+
+    def test_reconcile_repairs_drift(self):
+        Offer.objects.create(user=self.business, title='Logo Design', description='Logos')
+        PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_PK).update(offer_count=7, business_profile_count=0)
+
+        output = StringIO()
+        call_command('reconcile_platform_stats', stdout=output)
+        self.assertIn('offer_count: 7 -> 1', output.getvalue())
+        info = self.base_info()
+        self.assertEqual(info['offer_count'], 1)
+        self.assertEqual(info['business_profile_count'], 1)
 
-# Create your tests here.
+        output = StringIO()
+        call_command('reconcile_platform_stats', stdout=output)
+        self.assertIn('Keine Abweichungen', output.getvalue())
@@ -12,5 +12,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_backend.settings')
+# Server-Prozesse: SQLite im WAL-Modus (coderr_backend/database.py)
+os.environ.setdefault('SQLITE_JOURNAL_MODE', 'WAL')
+# Lesende Endpunkte nativ async beantworten (coderr_backend/async_views.py)
+os.environ.setdefault('ASYNC_READ_VIEWS', '1')
+# Keine persistenten Verbindungen im Async-Betrieb (Django-Doku): Threads von sync_to_async halten sie sonst offen
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
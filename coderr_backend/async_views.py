@@ -0,0 +1,159 @@
+"""
+Native Async-Varianten der lesenden Endpunkte für den Betrieb unter ASGI.
+
+DRF-Views sind synchron; unter uvicorn belegt jede Anfrage damit für die
+gesamte Datenbankwartezeit einen Thread. Die Views hier beantworten GET/HEAD
+mit der async ORM-API (aget, acount, aaggregate, async for) und übernehmen
+Filter, Serializer, Pagination und bedingte GETs aus der synchronen View –
+Antworten und Statuscodes sind identisch. Alle anderen Methoden (POST, PATCH,
+DELETE, OPTIONS) gehen unverändert an die synchrone DRF-View.
+
+Aktiv nur mit ASYNC_READ_VIEWS (asgi.py setzt das), unter WSGI bleibt es bei
+den synchronen Views, damit keine Event-Loop pro Anfrage entsteht.
+
+Hinweis: Djangos async ORM führt die Abfragen weiterhin in einem Thread aus;
+ASYNC_DB_CONCURRENCY begrenzt wie die Thread-Anzahl unter WSGI, wie viele
+Anfragen gleichzeitig auf die Datenbank zugreifen.
+"""
+import asyncio
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from coderr_backend.conditional import aconditional_response, alist_validators
+from coderr_backend.pagination import KeysetPagination
+from user_auth_app.api.authentication import CachedTokenAuthentication
+
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def db_slot():
+    """Semaphore pro Event-Loop, begrenzt gleichzeitige Datenbankarbeit auf ASYNC_DB_CONCURRENCY."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(settings.ASYNC_DB_CONCURRENCY)
+    return semaphore
+
+
+def read_view(sync_view_class, async_view_class):
+    """View-Funktion für urls.py: async unter ASGI (ASYNC_READ_VIEWS), sonst die DRF-View."""
+    if settings.ASYNC_READ_VIEWS:
+        return async_view_class.as_view()
+    return sync_view_class.as_view()
+
+
+class AsyncReadView(View):
+    """
+    Basisklasse: GET/HEAD laufen async (Authentifizierung, Rechteprüfung,
+    Fehlerformat wie DRF); alles andere übernimmt sync_view_class.
+    """
+    sync_view_class = None
+    authentication_classes = [CachedTokenAuthentication]
+    requires_authentication = True  # IsAuthenticated bzw. AllowAny der synchronen View
+    renderer = JSONRenderer()
+    sync_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        sync_view = cls.sync_view_class.as_view() if cls.sync_view_class else None
+        view = super().as_view(sync_view=sync_view, **initkwargs)
+        # Wie bei DRF: Token-Authentifizierung, kein CSRF-Schutz über Sessions
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            if self.sync_view is None:
+                return await self.http_method_not_allowed(request, *args, **kwargs)
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+        drf_request = Request(request, authenticators=[])
+        try:
+            drf_request.user, drf_request.auth = await self.authenticate(request)
+            if self.requires_authentication and not drf_request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            async with db_slot():
+                response = await self.get(drf_request, *args, **kwargs)
+        except (exceptions.APIException, Http404, PermissionDenied) as exc:
+            response = self.handle_exception(exc)
+        if self.sync_view_class is not None:
+            response['Allow'] = ', '.join(self.get_sync_view(drf_request).allowed_methods)
+        return response
+
+    async def authenticate(self, request):
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().aauthenticate(request)
+            if result is not None:
+                return result
+        return AnonymousUser(), None
+
+    def handle_exception(self, exc):
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        elif isinstance(exc, PermissionDenied):
+            exc = exceptions.PermissionDenied(*exc.args)
+
+        auth_header = None
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            if self.authentication_classes:
+                auth_header = self.authentication_classes[0]().authenticate_header(None)
+            else:
+                exc.status_code = 403
+
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if auth_header:
+            response['WWW-Authenticate'] = auth_header
+        return response
+
+    def render(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), status=status, content_type=self.renderer.media_type)
+
+    def get_sync_view(self, request, **kwargs):
+        """Instanz der synchronen View für Queryset, Filter, Serializer und Pagination (ohne DB-Zugriff)."""
+        view = self.sync_view_class()
+        view.setup(request, **kwargs)
+        view.format_kwarg = None
+        return view
+
+    async def list_response(self, request, view):
+        """Wie ConditionalGetMixin.list: Validatoren per Aggregat (Keyset: aus der Seite), 304 vor dem Serialisieren."""
+        # FilterSets validieren z. B. ModelChoiceFilter per queryset.get() – das darf nicht auf der Event-Loop laufen
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        paginator = view.paginator
+        if isinstance(paginator, KeysetPagination):
+            page = await paginator.apaginate_queryset(queryset, request, view)
+            return await aconditional_response(
+                request, view.page_etag(request, page), None,
+                self.render_page(view, paginator, page),
+            )
+
+        etag, last_modified, view.list_count = await alist_validators(
+            request, queryset, **view.get_list_aggregates()
+        )
+
+        async def render():
+            paginator = view.paginator
+            if paginator is None:
+                objects = [obj async for obj in queryset]
+                return self.render(view.get_serializer(objects, many=True).data)
+            page = await paginator.apaginate_queryset(queryset, request, view)
+            return await self.render_page(view, paginator, page)()
+
+        return await aconditional_response(request, etag, last_modified, render)
+
+    def render_page(self, view, paginator, page):
+        async def render():
+            data = view.get_serializer(page, many=True).data
+            return self.render(paginator.get_paginated_response(data).data)
+        return render
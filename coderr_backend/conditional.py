@@ -0,0 +1,197 @@
+"""
+Bedingte GET-Anfragen (ETag / Last-Modified -> 304) für die API.
+
+Die Validatoren werden ohne Serializer berechnet:
+  - Detail: ETag und Last-Modified aus updated_at des Objekts,
+  - Liste:  nur ETag aus MAX(updated_at) und COUNT(*) des gefilterten
+            QuerySets, dazu Pfad inkl. Query-String und der angemeldete
+            Benutzer. Kein Last-Modified: Löschen einer älteren Zeile ändert
+            MAX(updated_at) nicht, If-Modified-Since würde also fälschlich 304 liefern.
+  - Keyset-Seite (?pagination=cursor): ETag aus den geladenen Zeilen der
+            Seite und dem Cursor – ohne Aggregat über die ganze Liste, damit
+            der Cursor-Modus bei jeder Seitentiefe gleich viel kostet.
+Stimmen If-None-Match bzw. If-Modified-Since, wird 304 geantwortet, bevor ein
+Serializer läuft. Änderungen an verknüpften Daten ohne eigenes updated_at
+(z. B. Vorname des Anbieters in user_details) ändern den Validator nicht.
+
+In coderr_backend.metrics landen:
+  conditional.304 / conditional.200   Anzahl Antworten mit bzw. ohne Treffer
+  conditional.bytes_saved             nicht erneut gesendete Bytes
+  conditional.render_ms_saved         eingesparte Zeit für Serialisieren + Rendern
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from coderr_backend import metrics
+from coderr_backend.pagination import KeysetPagination
+
+# Größe und Renderzeit der letzten Antworten je ETag, um Einsparungen zu beziffern
+COST_CACHE_SIZE = 2048
+_costs = OrderedDict()
+_costs_lock = threading.Lock()
+
+
+def make_etag(*parts):
+    return '"%s"' % hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def timestamp(value):
+    return int(value.timestamp()) if value is not None else None
+
+
+def object_validators(instance, *extra):
+    """ETag und Last-Modified für ein einzelnes Objekt mit updated_at."""
+    updated_at = instance.updated_at
+    etag = make_etag(instance._meta.label, instance.pk, updated_at.isoformat(), *extra)
+    return etag, timestamp(updated_at)
+
+
+def list_validators(request, queryset, **extra_aggregates):
+    """
+    ETag, Last-Modified (immer None) und Anzahl für eine Liste – eine Aggregat-Abfrage, kein Serializer.
+    Die Anzahl kann die Pagination übernehmen (siehe CountedPageNumberPagination).
+    """
+    summary = queryset.order_by().aggregate(
+        last_modified=Max('updated_at'), count=Count('pk'), **extra_aggregates
+    )
+    return summary_validators(request, queryset.model, summary)
+
+
+async def alist_validators(request, queryset, **extra_aggregates):
+    summary = await queryset.order_by().aaggregate(
+        last_modified=Max('updated_at'), count=Count('pk'), **extra_aggregates
+    )
+    return summary_validators(request, queryset.model, summary)
+
+
+def summary_validators(request, model, summary):
+    last_modified = summary.pop('last_modified')
+    count = summary['count']
+    etag = make_etag(
+        model._meta.label,
+        last_modified.isoformat() if last_modified else None,
+        sorted(summary.items()),
+        request.get_full_path(),
+        request.user.pk,
+    )
+    return etag, None, count
+
+
+def page_validators(request, model, rows, *extra):
+    """ETag einer Keyset-Seite: Schlüssel der geladenen Zeilen, Cursor steckt im Pfad."""
+    return make_etag(model._meta.label, rows, *extra, request.get_full_path(), request.user.pk)
+
+
+def conditional_response(request, etag, last_modified, render):
+    """
+    Antwortet mit 304, wenn der Client den aktuellen Stand hat; sonst wird
+    render() aufgerufen (Serializer + Response) und mit Validatoren versehen.
+    """
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        start = time.perf_counter()
+        response = render()
+        track_cost(response, etag, start)
+    return add_validators(response, etag, last_modified)
+
+
+async def aconditional_response(request, etag, last_modified, render):
+    """Wie conditional_response, render ist hier eine Coroutine-Funktion (Async-Views)."""
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        start = time.perf_counter()
+        response = await render()
+        track_cost(response, etag, start)
+    return add_validators(response, etag, last_modified)
+
+
+def not_modified(request, etag, last_modified):
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        metrics.incr(f"conditional.{response.status_code}")
+        if response.status_code == 304:
+            record_saving(etag)
+    return response
+
+
+def add_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Immer revalidieren statt heuristisch aus Last-Modified zu cachen
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def track_cost(response, etag, start):
+    def remember(rendered):
+        cost = (len(rendered.content), (time.perf_counter() - start) * 1000)
+        with _costs_lock:
+            _costs[etag] = cost
+            _costs.move_to_end(etag)
+            while len(_costs) > COST_CACHE_SIZE:
+                _costs.popitem(last=False)
+
+    metrics.incr('conditional.200')
+    if isinstance(response, Response) and not response.is_rendered:
+        response.add_post_render_callback(remember)
+    elif not response.streaming:
+        remember(response)
+
+
+def record_saving(etag):
+    with _costs_lock:
+        cost = _costs.get(etag)
+    if cost is not None:
+        metrics.incr('conditional.bytes_saved', cost[0])
+        metrics.incr('conditional.render_ms_saved', round(cost[1], 3))
+
+
+class ConditionalGetMixin:
+    """
+    Für generische DRF-Views: list() und retrieve() mit ETag/Last-Modified
+    und 304 vor dem Serialisieren. Das Modell braucht ein Feld updated_at.
+    Die ermittelte Anzahl steht der Pagination als view.list_count zur Verfügung.
+    Weitere Aggregate für den ETag liefert get_list_aggregates(), im
+    Keyset-Modus entsprechend get_page_validator() je Zeile.
+    """
+
+    def get_list_aggregates(self):
+        return {}
+
+    def get_page_validator(self, obj):
+        return obj.pk, obj.updated_at.isoformat()
+
+    def page_etag(self, request, page):
+        return page_validators(
+            request, self.get_queryset().model, [self.get_page_validator(obj) for obj in page], self.paginator.has_more
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(self.paginator, KeysetPagination):
+            # Seite zuerst laden, der ETag ergibt sich aus ihr – kein MAX/COUNT über die ganze Liste
+            page = self.paginate_queryset(queryset)
+            return conditional_response(
+                request, self.page_etag(request, page), None,
+                lambda: self.get_paginated_response(self.get_serializer(page, many=True).data),
+            )
+        etag, last_modified, self.list_count = list_validators(request, queryset, **self.get_list_aggregates())
+        return conditional_response(
+            request, etag, last_modified, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = object_validators(instance)
+        return conditional_response(
+            request, etag, last_modified, lambda: Response(self.get_serializer(instance).data)
+        )
@@ -0,0 +1,70 @@
+"""
+SQLite-Einstellungen für den Betrieb mit mehreren gleichzeitigen Workern.
+
+Ohne Anpassung läuft SQLite im Rollback-Journal-Modus: ein Schreiber sperrt
+die ganze Datei auch für Leser, und wer die Sperre nicht sofort bekommt,
+scheitert mit "database is locked". Beim Öffnen jeder Verbindung
+(connection_created) werden deshalb die PRAGMAs aus SQLITE_PRAGMAS gesetzt:
+  - busy_timeout: so lange auf eine Sperre warten statt sofort abzubrechen,
+  - journal_mode=WAL: Leser und ein Schreiber blockieren sich nicht mehr
+    (nur über SQLITE_JOURNAL_MODE, das wsgi.py/asgi.py setzen – der Modus
+    wird in der Datei gespeichert),
+  - synchronous=NORMAL: im WAL-Modus sicher gegen Abstürze, fsync nur beim Checkpoint,
+  - mmap_size/cache_size: Seiten aus dem Speicher statt per read() lesen.
+Dazu in DATABASES CONN_MAX_AGE/CONN_HEALTH_CHECKS für Verbindungen, die
+über mehrere Anfragen offen bleiben.
+
+Schreibpfade öffnen ihre Transaktion mit write_transaction() statt atomic():
+unter SQLite mit BEGIN IMMEDIATE, also mit der Schreibsperre gleich zu
+Beginn – sonst kann das Hochstufen einer Lesetransaktion trotz busy_timeout
+sofort mit "database is locked" scheitern. Alle übrigen atomic()-Blöcke
+bleiben DEFERRED (transaction_mode in DATABASES), damit rein lesende
+Transaktionen nicht auf die Schreibsperre warten.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+WRITE_TRANSACTION_MODE = 'IMMEDIATE'
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    # Direkt auf der sqlite3-Verbindung: die PRAGMAs sollen nicht in der Abfrage-Messung auftauchen
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        if value is not None:
+            connection.connection.execute(f"PRAGMA {name} = {value}")
+
+
+def sqlite_pragmas(connection):
+    """Aktuelle Werte der konfigurierten PRAGMAs, z. B. zur Kontrolle im Benchmark."""
+    with connection.cursor() as cursor:
+        values = {}
+        for name in settings.SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}")
+            values[name] = cursor.fetchone()[0]
+        return values
+
+
+@contextmanager
+def write_transaction(using=None):
+    """atomic() für Blöcke, die schreiben; verschachtelt wie atomic() ein Savepoint."""
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    # Vorher verbinden: beim Verbinden würde transaction_mode aus den Settings neu gesetzt
+    connection.ensure_connection()
+    mode = connection.transaction_mode
+    # Nur für das BEGIN beim Betreten von atomic(); danach gilt wieder der konfigurierte Modus
+    connection.transaction_mode = WRITE_TRANSACTION_MODE
+    try:
+        with transaction.atomic(using=using):
+            connection.transaction_mode = mode
+            yield
+    finally:
+        connection.transaction_mode = mode
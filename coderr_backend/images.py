@@ -0,0 +1,184 @@
+"""
+Verkleinerte Varianten (Renditions) hochgeladener Bilder.
+
+Aus dem Original werden mit Pillow mehrere feste Breiten als WebP und als
+progressives JPEG erzeugt und im selben Storage unter <ordner>/renditions/
+abgelegt. Der Dateiname enthält einen Hash des Originalinhalts, z. B.
+offer_images/renditions/logo.3fa2c1d9.w320.webp – ein Name zeigt also immer
+auf denselben Inhalt und darf unbegrenzt gecacht werden.
+
+Die Zuordnung wird als JSON am Modell gespeichert:
+    {"source": "<name des Originals>", "webp": {"320": "<name>", ...}, "jpeg": {...}}
+Passt "source" nicht mehr zum aktuellen Bild, gilt die Zuordnung als veraltet.
+"""
+import hashlib
+import io
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': ('WEBP', {'method': 4}),
+    'jpeg': ('JPEG', {'optimize': True, 'progressive': True}),
+}
+
+# Wird nach dem Speichern neuer Renditions gesendet (das UPDATE löst kein post_save aus)
+renditions_updated = Signal()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def is_current(renditions, field_file):
+    """True, wenn die gespeicherte Zuordnung zum aktuellen Bild gehört."""
+    if not field_file:
+        return not renditions
+    return bool(renditions) and renditions.get('source') == field_file.name
+
+
+def rendition_names(renditions):
+    return [name for key, sizes in renditions.items() if key != 'source' for name in sizes.values()]
+
+
+def rendition_urls(renditions, field_file, request=None):
+    """Rendition-Map für die API: {"webp": {"320": url, ...}, "jpeg": {...}}; leer, solange veraltet."""
+    if not field_file or not is_current(renditions, field_file):
+        return {}
+    storage = field_file.storage
+    urls = {}
+    for key, sizes in renditions.items():
+        if key == 'source':
+            continue
+        urls[key] = {}
+        for width, name in sizes.items():
+            url = storage.url(name)
+            urls[key][width] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+def target_widths(source_width):
+    # Nicht hochskalieren; ist das Original kleiner als alle Breiten, eine Variante in Originalgröße
+    widths = [width for width in sorted(settings.IMAGE_RENDITION_WIDTHS) if width < source_width]
+    return widths or [source_width]
+
+
+def generate_renditions(field_file):
+    """Erzeugt alle Renditions für das Bild und gibt die Zuordnung zurück (ohne zu speichern)."""
+    storage = field_file.storage
+    with field_file.open('rb') as source_file:
+        data = source_file.read()
+    digest = hashlib.sha256(data).hexdigest()[:8]
+    directory, filename = os.path.split(field_file.name)
+    stem = os.path.splitext(filename)[0]
+
+    renditions = {'source': field_file.name}
+    with Image.open(io.BytesIO(data)) as image:
+        # Breite nach dem Drehen laut EXIF (Ausrichtung 5–8 vertauscht Breite und Höhe)
+        rotated = image.getexif().get(ExifTags.Base.Orientation, 1) in (5, 6, 7, 8)
+        source_width = image.height if rotated else image.width
+        widths = target_widths(source_width)
+        # JPEGs direkt in reduzierter Auflösung dekodieren – bei 3840px-Originalen deutlich schneller
+        scale = max(widths) / source_width
+        image.draft('RGB', (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            for key, (pil_format, options) in FORMATS.items():
+                name = os.path.join(directory, 'renditions', f"{stem}.{digest}.w{width}.{key}")
+                if not storage.exists(name):
+                    buffer = io.BytesIO()
+                    output = resized.convert('RGB') if pil_format == 'JPEG' else resized
+                    output.save(buffer, pil_format, quality=settings.IMAGE_RENDITION_QUALITY, **options)
+                    name = storage.save(name, ContentFile(buffer.getvalue()))
+                renditions.setdefault(key, {})[str(width)] = name
+    return renditions
+
+
+def update_renditions(model, pk, field_name, renditions_field):
+    """
+    Erzeugt die Renditions für ein gespeichertes Objekt und schreibt die Zuordnung
+    per UPDATE (ohne Signale). Wurde das Bild inzwischen ersetzt, wird nichts geschrieben.
+    """
+    instance = model.objects.filter(pk=pk).only('pk', field_name, renditions_field).first()
+    if instance is None:
+        return None
+    field_file = getattr(instance, field_name)
+    previous = getattr(instance, renditions_field) or {}
+    renditions = generate_renditions(field_file) if field_file else {}
+
+    values = {renditions_field: renditions}
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        values['updated_at'] = timezone.now()
+    if field_file:
+        unchanged = Q(**{field_name: field_file.name})
+    else:
+        unchanged = Q(**{f"{field_name}__isnull": True}) | Q(**{field_name: ''})
+    updated = model.objects.filter(unchanged, pk=pk).update(**values)
+    if not updated:
+        return None
+    renditions_updated.send(sender=model, pk=pk)
+
+    # Dateien, die zu keinem aktuellen Bild mehr gehören, entfernen
+    storage = field_file.storage
+    for name in set(rendition_names(previous)) - set(rendition_names(renditions)):
+        storage.delete(name)
+    return renditions
+
+
+def _run(model, pk, field_name, renditions_field):
+    try:
+        update_renditions(model, pk, field_name, renditions_field)
+    except Exception:
+        logger.exception("Renditions für %s %s konnten nicht erzeugt werden", model.__name__, pk)
+    finally:
+        # Eigene Datenbankverbindung des Worker-Threads schließen
+        connection.close()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_RENDITION_WORKERS, thread_name_prefix='renditions'
+            )
+        return _executor
+
+
+def schedule_renditions(instance, field_name, renditions_field):
+    """
+    Plant die Erzeugung nach dem Commit ein – im Hintergrund-Thread, sofern
+    IMAGE_RENDITIONS_ASYNC gesetzt ist, sonst direkt (z. B. in Tests).
+    """
+    args = (type(instance), instance.pk, field_name, renditions_field)
+
+    def submit():
+        if settings.IMAGE_RENDITIONS_ASYNC:
+            get_executor().submit(_run, *args)
+        else:
+            update_renditions(*args)
+
+    transaction.on_commit(submit)
+
+
+def needs_renditions(instance, field_name, renditions_field, update_fields=None):
+    """True, wenn das Bild gespeichert wurde und die Zuordnung nicht mehr dazu passt."""
+    if update_fields is not None and field_name not in update_fields:
+        return False
+    return not is_current(getattr(instance, renditions_field) or {}, getattr(instance, field_name))
@@ -0,0 +1,183 @@
+"""
+SQL-Messung pro Anfrage: Server-Timing-Header und Log langsamer Anfragen.
+
+Die Middleware hängt sich per connection.execute_wrapper an alle
+Datenbankverbindungen des Threads und zählt Abfragen und Datenbankzeit.
+Jede Antwort erhält einen Server-Timing-Header, z. B.
+    Server-Timing: db;dur=12.4;desc="9 queries", serialize;dur=3.1, total;dur=21.7
+  - db:        Summe der Abfragezeiten,
+  - serialize: Rendern der Antwort nach der View (DRF-Response -> JSON),
+  - total:     Wandzeit bis zur fertigen Antwort (bei Streaming bis zu den Headern).
+
+Anfragen über SLOW_REQUEST_THRESHOLD_MS landen als eine JSON-Zeile in
+SLOW_REQUEST_LOG – mit View-Name, Anzahl Abfragen und den am häufigsten
+wiederholten SQL-Anweisungen (typisches Zeichen für N+1-Abfragen).
+
+Der Aufwand pro Abfrage ist ein Zeitstempel und ein Dictionary-Eintrag; das
+Auswerten der Duplikate passiert nur für langsame Anfragen.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import FileResponse
+from django.utils import timezone
+
+from coderr_backend import metrics
+
+_log_lock = threading.Lock()
+
+
+class RequestStats:
+    """Abfragen einer Anfrage: Anzahl und Zeit je SQL-Text."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.render_start = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += duration
+            entry = self.statements.get(sql)
+            if entry is None:
+                self.statements[sql] = [1, duration]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+
+    def duplicates(self, limit=5):
+        repeated = [(sql, count, duration) for sql, (count, duration) in self.statements.items() if count > 1]
+        repeated.sort(key=lambda item: (item[1], item[2]), reverse=True)
+        return [
+            {'sql': sql[:500], 'count': count, 'ms': round(duration * 1000, 3)}
+            for sql, count, duration in repeated[:limit]
+        ]
+
+
+def install(stats):
+    """Aktiviert die Messung auf allen Datenbankverbindungen des aktuellen Threads."""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(stats))
+    return stack
+
+
+def server_timing(stats, total, serialize):
+    return (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+        f"serialize;dur={serialize * 1000:.1f}, total;dur={total * 1000:.1f}"
+    )
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    return match.view_name or match._func_path
+
+
+def log_slow_request(request, response, stats, total):
+    entry = {
+        'time': timezone.now().isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': view_name(request),
+        'status': response.status_code,
+        'wall_ms': round(total * 1000, 3),
+        'db_ms': round(stats.db_time * 1000, 3),
+        'queries': stats.queries,
+        'duplicates': stats.duplicates(),
+    }
+    path = settings.SLOW_REQUEST_LOG
+    directory = os.path.dirname(path)
+    line = json.dumps(entry, ensure_ascii=False) + '\n'
+    with _log_lock:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(line)
+    metrics.incr('requests.slow')
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Sollte möglichst weit oben in MIDDLEWARE stehen, damit total die übrigen Middlewares umfasst.
+    Sync und async: unter ASGI läuft die Kette sonst komplett im Thread-Pool.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        request._query_stats = stats
+        with install(stats):
+            response = self.get_response(request)
+        total = self.add_timing(request, response, stats)
+        if total is not None:
+            self.finish(request, response, stats, total)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        request._query_stats = stats
+        # Die async ORM-API fragt im Thread der Anfrage ab (sync_to_async, thread_sensitive) – dort messen
+        stack = await sync_to_async(install)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        total = self.add_timing(request, response, stats)
+        if total is not None:
+            await sync_to_async(self.finish)(request, response, stats, total)
+        return response
+
+    def add_timing(self, request, response, stats):
+        """Setzt Server-Timing; gibt total zurück oder None, wenn ein Stream erst nach dem letzten Block ausgewertet wird."""
+        total = time.perf_counter() - stats.start
+        serialize = time.perf_counter() - stats.render_start if stats.render_start is not None else 0.0
+        response['Server-Timing'] = server_timing(stats, total, serialize)
+
+        if response.streaming and not response.is_async and not isinstance(response, FileResponse):
+            # Abfragen beim Erzeugen des Inhalts (z. B. Exporte) erst nach dem letzten Block auswerten
+            response.streaming_content = self.measure_stream(request, response, stats, response.streaming_content)
+            return None
+        return total
+
+    def process_template_response(self, request, response):
+        # Wird direkt vor response.render() aufgerufen: ab hier zählt die Zeit als serialize
+        stats = getattr(request, '_query_stats', None)
+        if stats is not None:
+            stats.render_start = time.perf_counter()
+        return response
+
+    def measure_stream(self, request, response, stats, content):
+        try:
+            with install(stats):
+                yield from content
+        finally:
+            self.finish(request, response, stats, time.perf_counter() - stats.start)
+
+    def finish(self, request, response, stats, total):
+        threshold = settings.SLOW_REQUEST_THRESHOLD_MS
+        if settings.SLOW_REQUEST_LOG and threshold is not None and total * 1000 >= threshold:
+            log_slow_request(request, response, stats, total)
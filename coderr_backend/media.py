@@ -0,0 +1,147 @@
+"""
+Auslieferung der hochgeladenen Dateien unter MEDIA_URL.
+
+Ersetzt django.conf.urls.static.static (nur für DEBUG gedacht, ohne Validatoren):
+  - ETag/Last-Modified und 304 auf If-None-Match/If-Modified-Since,
+  - Cache-Control "immutable" für Namen mit Inhalts-Hash (Renditions aus
+    coderr_backend.images), sonst MEDIA_CACHE_MAX_AGE,
+  - einzelne Byte-Bereiche (Range) mit 206 bzw. 416,
+  - optional Übergabe des Dateiinhalts an den Proxy per X-Accel-Redirect
+    (nginx) oder X-Sendfile (Apache/lighttpd), siehe MEDIA_SENDFILE_BACKEND.
+"""
+import mimetypes
+import os
+import re
+from stat import S_ISREG
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+
+from coderr_backend import metrics
+
+# z. B. logo.3fa2c1d9.w320.webp
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8}\.w\d+\.[a-z]+$')
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CHUNK_SIZE = 64 * 1024
+
+
+def cache_control(path):
+    if HASHED_NAME.search(path):
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+
+def parse_range(header, size):
+    """
+    Liefert (start, ende) für einen einzelnen Bereich, None wenn der Header
+    ignoriert werden soll (fehlt, ungültig, mehrere Bereiche) und False,
+    wenn der Bereich nicht erfüllbar ist.
+    """
+    match = RANGE_HEADER.match(header.strip()) if header and size else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix-Bereich: die letzten n Bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if start >= size:
+        return False
+    if last and int(last) < start:
+        return None
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def sendfile_response(path, name, content_type):
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SENDFILE_BACKEND == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(name)
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404
+    if not S_ISREG(stat.st_mode):
+        raise Http404
+
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        metrics.incr(f"media.{response.status_code}")
+    elif settings.MEDIA_SENDFILE_BACKEND:
+        # Der Proxy übernimmt Body und Range-Anfragen; der Worker liest keine Bytes
+        response = sendfile_response(full_path, path, content_type)
+        metrics.incr('media.sendfile')
+    else:
+        byte_range = None
+        if if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(request.headers.get('Range'), size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{size}"
+            metrics.incr('media.416')
+        elif byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(full_path, start, end - start + 1), status=206, content_type=content_type
+            )
+            response['Content-Range'] = f"bytes {start}-{end}/{size}"
+            response['Content-Length'] = str(end - start + 1)
+            metrics.incr('media.206')
+        else:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+            metrics.incr('media.200')
+        response['Accept-Ranges'] = 'bytes'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control(path)
+    return response
@@ -0,0 +1,35 @@
+"""
+Prozessweite Zähler für Laufzeitkennzahlen (Cache-Treffer, 304-Antworten, ...).
+
+Die Werte gelten pro Worker-Prozess und beginnen nach einem Neustart bei null.
+Abrufbar für Admins über GET /api/base-info/metrics/.
+"""
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters = Counter()
+_gauges = {}
+
+
+def incr(name, amount=1):
+    with _lock:
+        _counters[name] += amount
+
+
+def register_gauge(name, func):
+    """Registriert eine Funktion, deren aktueller Wert im Snapshot erscheint (z. B. Cache-Größe)."""
+    _gauges[name] = func
+
+
+def snapshot():
+    with _lock:
+        data = dict(_counters)
+    for name, func in _gauges.items():
+        data[name] = func()
+    return dict(sorted(data.items()))
+
+
+def reset():
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,211 @@
+"""
+Pagination-Klassen für die API-Listen (Angebote, Profile).
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CountedPageNumberPagination(PageNumberPagination):
+    """
+    Seitennummern-Pagination, die die Gesamtzahl von ConditionalGetMixin
+    (view.list_count) übernimmt, statt ein zweites COUNT(*) auszuführen.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Gesamtzahl, die ConditionalGetMixin für den ETag bereits ermittelt hat
+        self.known_count = getattr(view, 'list_count', None)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async-Variante von paginate_queryset (COUNT und Seite über die async ORM-API)."""
+        self.known_count = getattr(view, 'list_count', None)
+        if self.known_count is None:
+            self.known_count = await queryset.acount()
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = DjangoPaginator(object_list, per_page)
+        if self.known_count is not None:
+            # cached_property vorbelegen, damit kein zweites COUNT(*) läuft
+            paginator.__dict__['count'] = self.known_count
+        return paginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-Pagination über (Sortierfeld, id): Jede Seite ist eine Bereichsabfrage
+    ab dem letzten gesehenen Schlüssel – ohne COUNT(*) und ohne OFFSET, die Kosten
+    bleiben also bei jeder Seitentiefe gleich.
+
+    Zeilen ohne Wert im Sortierfeld (NULL) werden in diesem Modus nicht ausgeliefert.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering_param = 'ordering'
+    ordering_fields = ()
+    default_ordering = '-id'
+    invalid_cursor_message = 'Ungültiger Cursor.'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_param, '').split(',')[0].strip()
+        if ordering.lstrip('-') not in self.ordering_fields:
+            ordering = self.default_ordering
+        return ordering.lstrip('-'), ordering.startswith('-')
+
+    def encode_cursor(self, value, pk, reverse):
+        position = {'v': str(value), 'i': pk}
+        if reverse:
+            position['r'] = 1
+        data = json.dumps(position, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            position = json.loads(data)
+            value = self.parse_cursor_value(model, position['v'])
+            pk = int(position['i'])
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        if value is None:
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        return value, pk, bool(position.get('r'))
+
+    def parse_cursor_value(self, model, raw):
+        """Wert aus dem Cursor in den Typ des Sortierfelds umwandeln (für Annotationen überschreiben)."""
+        return model._meta.get_field(self.field).to_python(raw)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([obj async for obj in self.get_page_queryset(queryset, request)])
+
+    def get_page_queryset(self, queryset, request):
+        """Die Bereichsabfrage für die angeforderte Seite (ein Element mehr als page_size)."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        self.has_cursor = cursor is not None
+        self.reverse = bool(cursor and cursor[2])
+
+        # Rückwärts blättern = in umgekehrter Richtung abfragen und danach umdrehen
+        descending = self.descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.filter(**{f"{self.field}__isnull": False}).order_by(
+            f"{prefix}{self.field}", f"{prefix}id"
+        )
+        if cursor:
+            value, pk, _ = cursor
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{lookup}": value}) | Q(**{self.field: value, f"id__{lookup}": pk})
+            )
+
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+        self.page = results
+        return results
+
+    def get_cursor_link(self, instance, reverse):
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        cursor = self.encode_cursor(getattr(instance, self.field), instance.pk, reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        has_next = self.has_cursor if self.reverse else self.has_more
+        if not self.page or not has_next:
+            return None
+        return self.get_cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        has_previous = self.has_more if self.reverse else self.has_cursor
+        if not self.page or not has_previous:
+            return None
+        return self.get_cursor_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class SelectablePaginationMixin:
+    """
+    Für generische Views: Seitennummern über pagination_class, Keyset-Pagination
+    über cursor_pagination_class auf Anfrage (?pagination=cursor oder ein vorhandener ?cursor=).
+    """
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        # Cursor-Modus nur auf Anfrage, das Frontend nutzt weiterhin Seitennummern
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            use_cursor = params.get('pagination') == 'cursor' or 'cursor' in params
+            if use_cursor and self.cursor_pagination_class is not None:
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is not None:
+                self._paginator = self.pagination_class()
+            else:
+                self._paginator = None
+        return self._paginator
@@ -0,0 +1,128 @@
+"""
+Lesende Anfragen an ein Replikat, schreibende an die primäre Datenbank.
+
+Die Middleware legt pro Anfrage fest, woher gelesen wird: GET/HEAD/OPTIONS
+vom Replikat (settings.DATABASE_REPLICA), alles andere von 'default'. Der
+Router fragt diese Entscheidung über eine ContextVar ab – sie wird auch in
+die Threads von sync_to_async übernommen, gilt also ebenso für die
+Async-Views. Außerhalb von Anfragen (Management-Kommandos, Shell) liest
+der Router immer von 'default'.
+
+Read-your-writes: Nach einer schreibenden Anfrage wird der Client für
+REPLICA_PIN_SECONDS an die primäre Datenbank gebunden, damit er seine
+eigene Änderung sofort sieht, auch wenn das Replikat noch nachhängt. Die
+Frist steht als Unix-Zeit im Cookie PIN_COOKIE und im Antwort-Header
+PIN_HEADER; Clients ohne Cookies (Token-Clients, Apps) schicken den Header
+bei den folgenden Anfragen einfach mit.
+"""
+import math
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PIN_COOKIE = 'read_primary_until'
+PIN_HEADER = 'X-Read-Primary-Until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def replica_alias():
+    """Alias des Replikats oder None, wenn keines konfiguriert ist."""
+    alias = settings.DATABASE_REPLICA
+    return alias if alias and alias in settings.DATABASES else None
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikat und primäre Datenbank enthalten dieselben Daten
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Das Replikat bekommt sein Schema mit der Kopie (sync_replica), nicht über migrate
+        if db == replica_alias():
+            return False
+        return None
+
+
+def reads_from_replica():
+    """True, wenn die aktuelle Anfrage vom Replikat liest (z. B. um nichts Veraltetes zu cachen)."""
+    alias = _read_alias.get()
+    return alias is not None and alias != 'default'
+
+
+def pinned_until(request, now):
+    """
+    Frist der Bindung an die primäre Datenbank aus Cookie oder Header (0 = keine).
+    Höchstens REPLICA_PIN_SECONDS ab jetzt – der Header kommt vom Client.
+    """
+    value = request.COOKIES.get(PIN_COOKIE) or request.headers.get(PIN_HEADER)
+    try:
+        until = float(value)
+    except (TypeError, ValueError):
+        return 0
+    if math.isnan(until):
+        return 0
+    return min(until, now + settings.REPLICA_PIN_SECONDS)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sollte vor allen Middlewares stehen, die schon Datenbankabfragen auslösen (Sessions, Authentifizierung).
+    Sync und async, damit die Middleware-Kette unter ASGI nicht in den Thread-Pool wechselt.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        replica = replica_alias()
+        if replica is None:
+            return self.get_response(request)
+
+        now = time.time()
+        token = _read_alias.set(self.read_alias(request, replica, now))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.pin(request, response, now)
+
+    async def __acall__(self, request):
+        replica = replica_alias()
+        if replica is None:
+            return await self.get_response(request)
+
+        now = time.time()
+        # sync_to_async übernimmt den Kontext, die Abfragen in den Threads sehen also denselben Alias
+        token = _read_alias.set(self.read_alias(request, replica, now))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.pin(request, response, now)
+
+    def read_alias(self, request, replica, now):
+        use_replica = request.method in SAFE_METHODS and pinned_until(request, now) <= now
+        return replica if use_replica else 'default'
+
+    def pin(self, request, response, now):
+        if request.method not in SAFE_METHODS and response.status_code < 500:
+            until = f"{now + settings.REPLICA_PIN_SECONDS:.3f}"
+            response.set_cookie(PIN_COOKIE, until, max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+            response[PIN_HEADER] = until
+        return response
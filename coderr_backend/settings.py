@@ -20,6 +20,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Auslieferung unter MEDIA_URL (coderr_backend/media.py)
+MEDIA_CACHE_MAX_AGE = 3600  # Sekunden für Originale; Namen mit Inhalts-Hash sind "immutable"
+# None: Worker liefert die Datei selbst; 'x-accel-redirect' (nginx) oder 'x-sendfile' (Apache/lighttpd)
+MEDIA_SENDFILE_BACKEND = os.environ.get('MEDIA_SENDFILE_BACKEND') or None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'  # interne nginx-location mit alias auf MEDIA_ROOT
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -54,6 +60,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'coderr_backend.instrumentation.QueryInstrumentationMiddleware',
+    'coderr_backend.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -83,9 +91,14 @@ CORS_ALLOW_METHODS = [
 CORS_ALLOW_HEADERS = [
     "authorization",
     "content-type",
-    "x-requested-with"
+    "x-requested-with",
+    "x-read-primary-until",
+    "idempotency-key",
 ]
 
+# Frist der Bindung an die primäre Datenbank nach Schreibzugriffen (coderr_backend/replicas.py)
+CORS_EXPOSE_HEADERS = ["x-read-primary-until"]
+
 CORS_ALLOW_CREDENTIALS = True
 
 
@@ -117,7 +130,44 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Verbindungen über mehrere Anfragen offen halten (Sekunden; 0 = je Anfrage neu, asgi.py setzt 0)
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1',
+        'OPTIONS': {
+            # Für alle atomic()-Blöcke; Schreibpfade nutzen write_transaction() mit IMMEDIATE
+            # (coderr_backend/database.py). IMMEDIATE hier ließe auch rein lesende Transaktionen auf die
+            # Schreibsperre warten – Vergleich: manage.py benchmark_sqlite_concurrency
+            'transaction_mode': os.environ.get('SQLITE_TRANSACTION_MODE', 'DEFERRED'),
+        },
+    }
+}
+
+# Lesereplikat (coderr_backend/replicas.py): lesende Anfragen gehen an diesen Alias, Schreibzugriffe an 'default'.
+# Lokal eine zweite SQLite-Datei, die "manage.py sync_replica" aus der primären kopiert.
+SQLITE_REPLICA_PATH = os.environ.get('SQLITE_REPLICA_PATH')
+DATABASE_REPLICA = 'replica' if SQLITE_REPLICA_PATH else None
+if DATABASE_REPLICA:
+    DATABASES[DATABASE_REPLICA] = {
+        **DATABASES['default'],
+        'NAME': SQLITE_REPLICA_PATH,
+        # In Tests zeigt das Replikat auf die Testdatenbank von 'default'
+        'TEST': {'MIRROR': 'default'},
     }
+DATABASE_ROUTERS = ['coderr_backend.replicas.PrimaryReplicaRouter']
+# Sekunden, die ein Client nach einem Schreibzugriff von der primären Datenbank liest
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+
+# Beim Öffnen jeder SQLite-Verbindung gesetzt (coderr_backend/database.py); None lässt den SQLite-Standard.
+# journal_mode wird in die Datenbankdatei geschrieben – daher nur, wenn ausdrücklich gesetzt
+# (wsgi.py/asgi.py setzen WAL), nicht bei jedem manage.py-Aufruf auf der eingecheckten db.sqlite3.
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or None
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'journal_mode': SQLITE_JOURNAL_MODE,
+    # NORMAL ist nur im WAL-Modus sicher gegen Stromausfall
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL' if SQLITE_JOURNAL_MODE == 'WAL' else None),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # Bytes
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024)),  # negativ: KiB statt Seiten
 }
 
 
@@ -169,9 +219,56 @@ AUTHENTICATION_BACKENDS = [
 
 # AUTH_USER_MODEL = 'user_auth_app.Profile'
 
+# Prozesslokaler Cache für Token-Authentifizierung (siehe user_auth_app/api/authentication.py)
+TOKEN_AUTH_CACHE_MAX_SIZE = 10000
+TOKEN_AUTH_CACHE_TTL = 300  # Sekunden
+
+# Sammelimport POST /api/offers/bulk/
+OFFER_BULK_MAX_ITEMS = 1000
+OFFER_BULK_BATCH_SIZE = 500
+
+# Zeilen pro Datenbank-Block und pro ausgegebenem Block beim Bestell-Export (orders_app/export.py)
+ORDER_EXPORT_CHUNK_SIZE = 2000
+
+# Aufbewahrung der Idempotency-Keys von POST /api/orders/ (orders_app/idempotency.py)
+ORDER_IDEMPOTENCY_KEY_TTL = int(os.environ.get('ORDER_IDEMPOTENCY_KEY_TTL', 24 * 3600))  # Sekunden
+
+# Server-Timing und Log langsamer Anfragen (coderr_backend/instrumentation.py); leerer Pfad schaltet das Log ab
+SLOW_REQUEST_THRESHOLD_MS = int(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 500))
+SLOW_REQUEST_LOG = os.environ.get('SLOW_REQUEST_LOG', str(BASE_DIR / 'logs' / 'slow_requests.jsonl'))
+
+# Native Async-Views für die lesenden Endpunkte (coderr_backend/async_views.py); asgi.py setzt ASYNC_READ_VIEWS=1
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS') == '1'
+# Gleichzeitige Datenbankzugriffe der Async-Views je Prozess (entspricht der Thread-Anzahl unter WSGI)
+ASYNC_DB_CONCURRENCY = int(os.environ.get('ASYNC_DB_CONCURRENCY', 16))
+
+# Antwort-Cache für anonyme Anfragen an GET /api/offers/ (offers_app/cache.py)
+OFFER_LIST_CACHE_TTL = 60  # Sekunden
+OFFER_LIST_CACHE_MAX_ENTRIES = 1000
+OFFER_LIST_CACHE_MAX_BYTES = 256 * 1024  # größere Antworten werden nicht gecacht
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Pro Prozess; bei mehreren Workern auf ein gemeinsames Backend (Memcached/Redis) umstellen
+    'offer_list': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'offer-list',
+        'TIMEOUT': OFFER_LIST_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': OFFER_LIST_CACHE_MAX_ENTRIES},
+    },
+}
+
+# Verkleinerte Bildvarianten für Offer.image und Profile.file (siehe coderr_backend/images.py)
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_RENDITION_WORKERS = 2
+IMAGE_RENDITIONS_ASYNC = True  # False: direkt nach dem Commit im Request-Thread erzeugen
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.api.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -0,0 +1,235 @@
+import os
+import shutil
+import tempfile
+import time
+import warnings
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management import call_command
+from django.db import connection, connections, router, transaction
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from offers_app import cache as offer_cache
+from offers_app.models import Offer
+from user_auth_app.models import Profile
+from .database import write_transaction
+from .media import serve_media
+from .replicas import PIN_COOKIE, PIN_HEADER, ReplicaRoutingMiddleware, pinned_until
+
+
+class ReplicaRoutingTests(TestCase):
+    """
+    Zweiter Datenbank-Alias 'replica': eine SQLite-Datei, die sync_replica vor den
+    Tests aus der (noch leeren) Testdatenbank kopiert. Was ein Test danach anlegt,
+    steht nur in 'default' – so zeigt das Ergebnis, von welchem Alias gelesen wurde.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        replica = {**connections['default'].settings_dict, 'NAME': os.path.join(cls.directory, 'replica.sqlite3')}
+        connections.settings['replica'] = replica
+        # Erst hier: der Test-Runner kennt den Alias nicht und legt dafür keine Testdatenbank an
+        cls.databases = {'default', 'replica'}
+        cls.replica_settings = override_settings(
+            DATABASES={**settings.DATABASES, 'replica': replica},
+            DATABASE_REPLICA='replica',
+        )
+        with warnings.catch_warnings():
+            # Nur replica_alias() und sync_replica lesen DATABASES; die Verbindung steht schon in connections
+            warnings.simplefilter('ignore')
+            cls.replica_settings.enable()
+        call_command('sync_replica', stdout=StringIO())
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.replica_settings.disable()
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.business, type='business')
+        Offer.objects.create(user=self.business, title='Logo Design', description='Logos')
+
+    def offer_count(self, **kwargs):
+        response = self.client.get('/api/offers/', **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['count']
+
+    def route(self, method, **headers):
+        """Alias und Cachebarkeit, wie sie eine View hinter der Middleware sieht."""
+        seen = {}
+
+        def view(request):
+            seen['alias'] = router.db_for_read(Offer)
+            seen['cacheable'] = offer_cache.is_cacheable(request)
+            return HttpResponse()
+
+        request = RequestFactory().generic(method, '/api/offers/', headers=headers)
+        request.user = AnonymousUser()
+        ReplicaRoutingMiddleware(view)(request)
+        return seen
+
+    def test_get_reads_from_replica(self):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            self.assertEqual(self.offer_count(), 0)
+        self.assertTrue(replica_queries.captured_queries)
+        self.assertEqual(self.route('HEAD')['alias'], 'replica')
+
+    def test_unsafe_methods_use_default(self):
+        for method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+            self.assertEqual(self.route(method)['alias'], 'default', method)
+
+        self.client.force_authenticate(self.business)
+        response = self.client.delete(f"/api/offers/{Offer.objects.get().id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Offer.objects.exists())
+        # Danach ist der Client an die primäre Datenbank gebunden
+        self.assertIn(PIN_HEADER, response)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_pin_cookie_or_header_forces_default(self):
+        until = f"{time.time() + 5:.3f}"
+        self.assertEqual(self.offer_count(headers={PIN_HEADER: until}), 1)
+        self.client.cookies[PIN_COOKIE] = until
+        self.assertEqual(self.offer_count(), 1)
+
+        self.client.cookies[PIN_COOKIE] = f"{time.time() - 1:.3f}"
+        self.assertEqual(self.offer_count(), 0)
+
+    def test_far_future_pin_is_clamped(self):
+        now = time.time()
+        for value in ('9e99', 'inf'):
+            request = RequestFactory().get('/', headers={PIN_HEADER: value})
+            self.assertEqual(pinned_until(request, now), now + settings.REPLICA_PIN_SECONDS)
+
+    def test_nan_pin_is_ignored(self):
+        request = RequestFactory().get('/', headers={PIN_HEADER: 'nan'})
+        self.assertEqual(pinned_until(request, time.time()), 0)
+        self.assertEqual(self.offer_count(headers={PIN_HEADER: 'nan'}), 0)
+
+    def test_replica_reads_are_not_cached(self):
+        self.assertEqual(self.route('GET'), {'alias': 'replica', 'cacheable': False})
+        until = f"{time.time() + 5:.3f}"
+        self.assertEqual(self.route('GET', **{PIN_HEADER: until}), {'alias': 'default', 'cacheable': True})
+
+
+class WriteTransactionTests(TransactionTestCase):
+    # Eigene Transaktionen: TestCase hielte jeden Test in einem äußeren atomic()-Block
+
+    def begin_statements(self, block):
+        with CaptureQueriesContext(connection) as context:
+            with block():
+                User.objects.exists()
+        return [query['sql'] for query in context.captured_queries if query['sql'].startswith('BEGIN')]
+
+    def test_write_transaction_takes_write_lock(self):
+        self.assertEqual(self.begin_statements(write_transaction), ['BEGIN IMMEDIATE'])
+
+    def test_read_transaction_stays_deferred(self):
+        self.assertEqual(self.begin_statements(transaction.atomic), ['BEGIN DEFERRED'])
+        # IMMEDIATE gilt nur für das eine BEGIN von write_transaction()
+        self.begin_statements(write_transaction)
+        self.assertEqual(self.begin_statements(transaction.atomic), ['BEGIN DEFERRED'])
+
+    def test_nested_write_transaction_is_savepoint(self):
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                with write_transaction():
+                    User.objects.create_user('business', password='secret')
+        self.assertFalse(any(query['sql'].startswith('BEGIN') for query in context.captured_queries))
+        self.assertTrue(User.objects.filter(username='business').exists())
+
+
+class ServeMediaTests(SimpleTestCase):
+    CONTENT = bytes(range(256)) * 4
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.media_root = os.path.join(directory, 'media')
+        os.makedirs(os.path.join(self.media_root, 'uploads'))
+        with open(os.path.join(self.media_root, 'uploads', 'logo.png'), 'wb') as file:
+            file.write(self.CONTENT)
+        with open(os.path.join(directory, 'secret.txt'), 'w') as file:
+            file.write('geheim')
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_SENDFILE_BACKEND=None)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get(self, path='uploads/logo.png', **headers):
+        return self.client.get(f"/media/{path}", headers=headers)
+
+    def test_full_response_with_validators(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}")
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_range_returns_206(self):
+        response = self.get(Range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f"bytes 10-19/{len(self.CONTENT)}")
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[10:20])
+
+        response = self.get(Range='bytes=-4')
+        self.assertEqual(response['Content-Range'], f"bytes 1020-1023/{len(self.CONTENT)}")
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[-4:])
+
+    def test_unsatisfiable_range_returns_416(self):
+        response = self.get(Range=f"bytes={len(self.CONTENT)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f"bytes */{len(self.CONTENT)}")
+
+    def test_stale_if_range_returns_full_file(self):
+        etag = self.get()['ETag']
+        response = self.get(Range='bytes=0-9', **{'If-Range': etag})
+        self.assertEqual(response.status_code, 206)
+
+        response = self.get(Range='bytes=0-9', **{'If-Range': '"veraltet"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.get()['ETag']
+        response = self.get(**{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_path_traversal_returns_404(self):
+        self.assertEqual(self.get('../secret.txt').status_code, 404)
+        self.assertEqual(self.get('uploads/../../secret.txt').status_code, 404)
+        self.assertEqual(self.get('uploads').status_code, 404)
+        self.assertEqual(self.get('uploads/fehlt.png').status_code, 404)
+        # Direkt, falls ein Client den Pfad schon vorher normalisiert
+        with self.assertRaises(Http404):
+            serve_media(RequestFactory().get('/'), '../secret.txt')
+
+    def test_hashed_rendition_is_immutable(self):
+        with open(os.path.join(self.media_root, 'uploads', 'logo.3fa2c1d9.w320.webp'), 'wb') as file:
+            file.write(b'webp')
+        self.assertIn('immutable', self.get('uploads/logo.3fa2c1d9.w320.webp')['Cache-Control'])
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel-redirect')
+    def test_x_accel_redirect_hands_file_to_proxy(self):
+        response = self.get(Range='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f"{settings.MEDIA_ACCEL_REDIRECT_PREFIX}uploads/logo.png")
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response.content, b'')
+        self.assertIn('ETag', response)
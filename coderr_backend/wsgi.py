@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_backend.settings')
+# Server-Prozesse: SQLite im WAL-Modus (coderr_backend/database.py)
+os.environ.setdefault('SQLITE_JOURNAL_MODE', 'WAL')
 
 application = get_wsgi_application()
@@ -0,0 +1,64 @@
+from django.db.models import Prefetch, aprefetch_related_objects
+from django.http import Http404, HttpResponse
+
+from coderr_backend.async_views import AsyncReadView
+from coderr_backend.conditional import aconditional_response, conditional_response, object_validators
+from .. import cache as offer_cache
+from ..models import Offer, OfferDetail
+from .serializers import OfferDetailFullSerializer, OfferDetailSerializer
+from .views import OfferDetailDetailView, OfferDetailView, OfferListCreateView
+
+
+class AsyncOfferListView(AsyncReadView):
+    """GET /api/offers/ unter ASGI – gleiche Filter, Pagination und Caches wie OfferListCreateView."""
+    sync_view_class = OfferListCreateView
+    requires_authentication = False
+
+    async def get(self, request):
+        if not offer_cache.is_cacheable(request):
+            return await self.list_response(request, self.get_sync_view(request))
+
+        key = offer_cache.make_key(request, offer_cache.get_generation())
+        entry = offer_cache.get_cached(key)
+        if entry is not None:
+            return conditional_response(
+                request, entry['etag'], entry['last_modified'],
+                lambda: HttpResponse(entry['content'], content_type=entry['content_type']),
+            )
+
+        response = await self.list_response(request, self.get_sync_view(request))
+        offer_cache.store(key, response)
+        return response
+
+
+class AsyncOfferDetailView(AsyncReadView):
+    """GET /api/offers/{id}/ unter ASGI."""
+    sync_view_class = OfferDetailView
+
+    async def get(self, request, pk):
+        try:
+            offer = await Offer.objects.aget(pk=pk)
+        except Offer.DoesNotExist:
+            raise Http404
+
+        async def render():
+            # Details erst nach der 304-Prüfung laden
+            await aprefetch_related_objects(
+                [offer], Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer_id').order_by('offer_id', 'id'))
+            )
+            return self.render(OfferDetailSerializer(offer, context={'request': request}).data)
+
+        etag, last_modified = object_validators(offer)
+        return await aconditional_response(request, etag, last_modified, render)
+
+
+class AsyncOfferDetailDetailView(AsyncReadView):
+    """GET /api/offerdetails/{id}/ unter ASGI."""
+    sync_view_class = OfferDetailDetailView
+
+    async def get(self, request, pk):
+        try:
+            detail = await OfferDetail.objects.aget(pk=pk)
+        except OfferDetail.DoesNotExist:
+            raise Http404
+        return self.render(OfferDetailFullSerializer(detail, context={'request': request}).data)
@@ -0,0 +1,47 @@
+from django.db import connection
+from rest_framework import filters
+
+from ..search import (
+    FTS_TABLE,
+    OFFER_TABLE,
+    POSTGRES_CONFIG,
+    postgres_tsquery,
+    search_tokens,
+    search_vector,
+    sqlite_match_expression,
+)
+
+
+class OfferFullTextSearchFilter(filters.SearchFilter):
+    """
+    Ersetzt die icontains-Suche von SearchFilter durch den Volltextindex
+    (SQLite FTS5 bzw. PostgreSQL tsvector/GIN) auf dem Parameter `search`.
+    Ohne explizites `ordering` werden Treffer nach Relevanz sortiert.
+    Andere Datenbanken fallen auf das Standardverhalten von SearchFilter zurück.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        tokens = search_tokens(' '.join(self.get_search_terms(request)))
+        if not tokens:
+            return queryset
+
+        if connection.vendor == 'sqlite':
+            return queryset.extra(
+                select={'search_rank': f"{FTS_TABLE}.rank"},
+                tables=[FTS_TABLE],
+                where=[f"{FTS_TABLE}.rowid = {OFFER_TABLE}.id", f"{FTS_TABLE} MATCH %s"],
+                params=[sqlite_match_expression(tokens)],
+            ).order_by('search_rank', '-updated_at')
+
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.search import SearchQuery, SearchRank
+            query = SearchQuery(postgres_tsquery(tokens), search_type='raw', config=POSTGRES_CONFIG)
+            return (
+                queryset
+                .annotate(search_document=search_vector())
+                .filter(search_document=query)
+                .annotate(search_rank=SearchRank(search_vector(), query))
+                .order_by('-search_rank', '-updated_at')
+            )
+
+        return super().filter_queryset(request, queryset, view)
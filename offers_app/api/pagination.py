@@ -1,6 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+from coderr_backend.pagination import CountedPageNumberPagination, KeysetPagination
 
-class OfferPagination(PageNumberPagination):
-    page_size = 6  
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+
+class OfferPagination(CountedPageNumberPagination):
+    page_size = 6
+
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Opt-in für /api/offers/ über ?pagination=cursor (oder einen vorhandenen ?cursor=).
+    Unterstützt die beiden Sortierungen des Endpunkts: updated_at und min_price.
+    """
+    ordering_fields = ('updated_at', 'min_price')
+    default_ordering = '-updated_at'
@@ -1,5 +1,6 @@
 from rest_framework import permissions
+from user_auth_app.roles import is_business
 
 class IsBusinessUser(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.groups.filter(name='business').exists()
\ No newline at end of file
+        return is_business(request.user)
\ No newline at end of file
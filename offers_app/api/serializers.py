@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 from ..models import Offer, OfferDetail
+from coderr_backend.images import rendition_urls
+from coderr_backend.database import write_transaction
 
 # Serializer für die GET-Anfragen der OfferDetails
 class OfferDetailGETSerializer(serializers.ModelSerializer):
@@ -25,8 +27,9 @@ class OfferDetailFullSerializer(serializers.ModelSerializer):
 # Serializer für die Liste der Angebote (GET /api/offers/)
 class OfferListSerializer(serializers.ModelSerializer):
     details = OfferDetailGETSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True)
+    min_delivery_time = serializers.IntegerField(read_only=True)
+    image_renditions = serializers.SerializerMethodField()
     user_details = serializers.SerializerMethodField()
 
     class Meta:
@@ -36,6 +39,7 @@ class OfferListSerializer(serializers.ModelSerializer):
             'user',
             'title',
             'image',
+            'image_renditions',
             'description',
             'created_at',
             'updated_at',
@@ -46,15 +50,8 @@ class OfferListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['user', 'created_at', 'updated_at', 'min_price', 'min_delivery_time', 'user_details']
 
-    def get_min_price(self, obj):
-        if obj.details.exists():
-            return min(detail.price for detail in obj.details.all())
-        return None
-
-    def get_min_delivery_time(self, obj):
-        if obj.details.exists():
-            return min(detail.delivery_time_in_days for detail in obj.details.all())
-        return None
+    def get_image_renditions(self, obj):
+        return rendition_urls(obj.image_renditions, obj.image, self.context.get('request'))
 
     def get_user_details(self, obj):
         user = obj.user
@@ -67,8 +64,9 @@ class OfferListSerializer(serializers.ModelSerializer):
 # Serializer für die Details eines einzelnen Angebots (GET /api/offers/{id}/)
 class OfferDetailSerializer(serializers.ModelSerializer):
     details = OfferDetailGETSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True)
+    min_delivery_time = serializers.IntegerField(read_only=True)
+    image_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
@@ -77,6 +75,7 @@ class OfferDetailSerializer(serializers.ModelSerializer):
             'user',
             'title',
             'image',
+            'image_renditions',
             'description',
             'created_at',
             'updated_at',
@@ -86,15 +85,9 @@ class OfferDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['user', 'created_at', 'updated_at', 'min_price', 'min_delivery_time']
 
-    def get_min_price(self, obj):
-        if obj.details.exists():
-            return min(detail.price for detail in obj.details.all())
-        return None
+    def get_image_renditions(self, obj):
+        return rendition_urls(obj.image_renditions, obj.image, self.context.get('request'))
 
-    def get_min_delivery_time(self, obj):
-        if obj.details.exists():
-            return min(detail.delivery_time_in_days for detail in obj.details.all())
-        return None
 
 # Serializer für die POST-Anfragen (unverändert)
 class OfferDetailPOSTSerializer(serializers.ModelSerializer):
@@ -105,6 +98,10 @@ class OfferDetailPOSTSerializer(serializers.ModelSerializer):
 class OfferSerializer(serializers.ModelSerializer):
     details = OfferDetailPOSTSerializer(many=True)
 
+    # Felder, die ein PATCH an Angebot bzw. Details ändern kann
+    OFFER_UPDATE_FIELDS = ('title', 'image', 'description')
+    DETAIL_UPDATE_FIELDS = ('title', 'revisions', 'delivery_time_in_days', 'price', 'features')
+
     class Meta:
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details']
@@ -127,35 +124,68 @@ class OfferSerializer(serializers.ModelSerializer):
             
             return data
 
-    def create(self, validated_data):
+    @staticmethod
+    def build_instances(user, validated_data):
+        """Erzeugt Offer und OfferDetails (noch ungespeichert) inkl. Minimalwerten."""
+        validated_data = dict(validated_data)
         details_data = validated_data.pop('details')
-        user = self.context['request'].user
         validated_data.pop('user', None)
-        offer = Offer.objects.create(user=user, **validated_data)
-        
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
-        
+        offer = Offer(user=user, **validated_data)
+        details = [OfferDetail(**detail_data) for detail_data in details_data]
+        offer.compute_min_values(details)
+        return offer, details
+
+    def create(self, validated_data):
+        """Angebot und Details in einer Transaktion: kein Angebot ohne Details, Details mit einem INSERT."""
+        offer, details = self.build_instances(self.context['request'].user, validated_data)
+        with write_transaction():
+            offer.save()
+            for detail in details:
+                detail.offer = offer
+            OfferDetail.objects.bulk_create(details)
         return offer
 
     def update(self, instance, validated_data):
+        """
+        Lädt alle Details mit einer Abfrage, vergleicht die Werte und schreibt nur
+        geänderte Felder (Details per bulk_update) – alles in einer Transaktion.
+        Ohne Änderung wird gar nicht geschrieben.
+        """
         details_data = validated_data.pop('details', None)
-        instance.title = validated_data.get('title', instance.title)
-        instance.image = validated_data.get('image', instance.image)
-        instance.description = validated_data.get('description', instance.description)
-        instance.status = validated_data.get('status', instance.status)
-        instance.save()
-
-        if details_data:
-            for detail_data in details_data:
-                offer_type = detail_data.get('offer_type')
-                # 🔽 Entferne try/except, um DoesNotExist als 400-Fehler zu propagieren
-                detail = instance.details.get(offer_type=offer_type)
-                detail.title = detail_data.get('title', detail.title)
-                detail.revisions = detail_data.get('revisions', detail.revisions)
-                detail.delivery_time_in_days = detail_data.get('delivery_time_in_days', detail.delivery_time_in_days)
-                detail.price = detail_data.get('price', detail.price)
-                detail.features = detail_data.get('features', detail.features)
-                detail.save()
-
-        return instance
\ No newline at end of file
+        changed_fields = apply_changes(instance, validated_data, self.OFFER_UPDATE_FIELDS)
+
+        changed_details, changed_detail_fields = [], set()
+        with write_transaction():
+            if details_data:
+                details = {detail.offer_type: detail for detail in instance.details.all()}
+                for detail_data in details_data:
+                    detail = details.get(detail_data.get('offer_type'))
+                    if detail is None:
+                        raise serializers.ValidationError(
+                            {"details": f"Offer detail '{detail_data.get('offer_type')}' does not exist."}
+                        )
+                    fields = apply_changes(detail, detail_data, self.DETAIL_UPDATE_FIELDS)
+                    if fields:
+                        changed_details.append(detail)
+                        changed_detail_fields.update(fields)
+
+                if changed_details:
+                    OfferDetail.objects.bulk_update(changed_details, sorted(changed_detail_fields))
+                    # Minimalwerte aus den bereits geladenen Details nachziehen
+                    changed_fields += instance.compute_min_values(list(details.values()))
+
+            if changed_fields or changed_details:
+                # Auch eine reine Detailänderung aktualisiert updated_at des Angebots
+                instance.save(update_fields=changed_fields + ['updated_at'])
+
+        return instance
+
+
+def apply_changes(instance, data, fields):
+    """Setzt die Werte aus data auf der Instanz und gibt die tatsächlich geänderten Felder zurück."""
+    changed = []
+    for field in fields:
+        if field in data and getattr(instance, field) != data[field]:
+            setattr(instance, field, data[field])
+            changed.append(field)
+    return changed
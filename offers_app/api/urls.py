@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import OfferListCreateView, OfferDetailView, OfferDetailDetailView
+from coderr_backend.async_views import read_view
+from .async_views import AsyncOfferDetailDetailView, AsyncOfferDetailView, AsyncOfferListView
+from .views import OfferListCreateView, OfferDetailView, OfferDetailDetailView, OfferBulkCreateView
 
 urlpatterns = [
-    path('offers/', OfferListCreateView.as_view(), name='offer-list-create'),
-    path('offers/<int:pk>/', OfferDetailView.as_view(), name='offer-detail'),
-    path('offerdetails/<int:pk>/', OfferDetailDetailView.as_view(), name='offer-detail-detail'),
+    path('offers/', read_view(OfferListCreateView, AsyncOfferListView), name='offer-list-create'),
+    path('offers/bulk/', OfferBulkCreateView.as_view(), name='offer-bulk-create'),
+    path('offers/<int:pk>/', read_view(OfferDetailView, AsyncOfferDetailView), name='offer-detail'),
+    path('offerdetails/<int:pk>/', read_view(OfferDetailDetailView, AsyncOfferDetailDetailView), name='offer-detail-detail'),
 ]
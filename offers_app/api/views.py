@@ -1,25 +1,48 @@
-from rest_framework import generics, filters
+from rest_framework import generics, filters, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min
-from django.http import Http404
+from django.http import Http404, HttpResponse
+from django.db.models import Prefetch
 from rest_framework.exceptions import ValidationError
 from ..models import Offer, OfferDetail
 from .serializers import OfferSerializer, OfferDetailSerializer, OfferListSerializer, OfferDetailFullSerializer
-from .pagination import OfferPagination
+from .pagination import OfferPagination, OfferCursorPagination
+from .filters import OfferFullTextSearchFilter
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.authentication import TokenAuthentication
+from user_auth_app.api.authentication import CachedTokenAuthentication
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from user_auth_app.roles import is_business
+from coderr_backend.conditional import ConditionalGetMixin, conditional_response
+from coderr_backend.database import write_transaction
+from coderr_backend.pagination import SelectablePaginationMixin
+from .. import cache as offer_cache
+from ..signals import offers_bulk_created
+from .permissions import IsBusinessUser
 
 
-class OfferListCreateView(generics.ListCreateAPIView):
+def with_read_relations(queryset):
+    """
+    Lädt Anbieter und OfferDetails einmal pro Abfrage statt einmal pro Angebot.
+    Die Serializer lesen danach nur noch aus dem Prefetch-Cache.
+    """
+    return queryset.select_related('user').prefetch_related(
+        # Details je Angebot in Anlage-Reihenfolge; (offer_id, id) liefert der Fremdschlüssel-Index ohne Sortierschritt
+        Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer_id').order_by('offer_id', 'id'))
+    )
+
+
+class OfferListCreateView(ConditionalGetMixin, SelectablePaginationMixin, generics.ListCreateAPIView):
     queryset = Offer.objects.all().order_by('-updated_at')
     permission_classes = [AllowAny]  
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     pagination_class = OfferPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    cursor_pagination_class = OfferCursorPagination
+    filter_backends = [DjangoFilterBackend, OfferFullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['user']  # Für creator_id
-    search_fields = ['title', 'description']
+    search_fields = ['title', 'description']  # Nur für Datenbanken ohne Volltextindex
     ordering_fields = ['updated_at', 'min_price']  
     parser_classes = (JSONParser, MultiPartParser, FormParser)
 
@@ -28,12 +51,27 @@ class OfferListCreateView(generics.ListCreateAPIView):
             return OfferListSerializer
         return OfferSerializer
 
+    def list(self, request, *args, **kwargs):
+        if not offer_cache.is_cacheable(request):
+            return super().list(request, *args, **kwargs)
+
+        # Generation vor der Abfrage lesen: ändert sich währenddessen etwas, ist der Eintrag sofort veraltet
+        key = offer_cache.make_key(request, offer_cache.get_generation())
+        entry = offer_cache.get_cached(key)
+        if entry is not None:
+            return conditional_response(
+                request, entry['etag'], entry['last_modified'],
+                lambda: HttpResponse(entry['content'], content_type=entry['content_type']),
+            )
+
+        response = super().list(request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            response.add_post_render_callback(lambda rendered: offer_cache.store(key, rendered))
+        return response
+
     def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.annotate(
-            min_price=Min('details__price'),
-            min_delivery_time=Min('details__delivery_time_in_days')
-        )
+        # min_price und min_delivery_time sind denormalisierte, indizierte Spalten auf Offer
+        qs = with_read_relations(super().get_queryset())
         
         # Filter
         creator_id = self.request.query_params.get('creator_id')
@@ -59,16 +97,16 @@ class OfferListCreateView(generics.ListCreateAPIView):
         return qs
 
     def perform_create(self, serializer):
-        if not hasattr(self.request.user, 'profile') or self.request.user.profile.type != 'business':
+        if not is_business(self.request.user):
             raise PermissionDenied("Only business users can create offers.")
         serializer.save(user=self.request.user)  # Der Benutzer wird im Serializer gesetzt
 
 
-class OfferDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OfferDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Offer.objects.all()
     serializer_class = OfferDetailSerializer  
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get_serializer_class(self):
         if self.request.method == 'PATCH':
@@ -76,13 +114,15 @@ class OfferDetailView(generics.RetrieveUpdateDestroyAPIView):
         return OfferDetailSerializer
 
     def get_object(self):
+        # Kein Prefetch: bei 304 werden die Details nicht gebraucht, beim Serialisieren
+        # lädt sie eine Abfrage nach, und ein Update arbeitet nie mit veralteten Details
         try:
             offer = Offer.objects.get(pk=self.kwargs['pk'])
         except Offer.DoesNotExist:
             raise Http404
 
         if self.request.method in ['PATCH', 'PUT', 'DELETE']:
-            if not (self.request.user.is_staff or offer.user == self.request.user):
+            if not (self.request.user.is_staff or offer.user_id == self.request.user.id):
                 raise PermissionDenied("You do not have permission to modify this offer.")
         return offer
 
@@ -92,4 +132,64 @@ class OfferDetailDetailView(generics.RetrieveAPIView):
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailFullSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+
+
+class OfferBulkCreateView(APIView):
+    """
+    POST /api/offers/bulk/:
+      Legt viele Angebote auf einmal an (JSON-Array im Format von POST /api/offers/).
+      Jedes Element wird mit OfferSerializer validiert; alle gültigen Angebote und
+      ihre Details werden per bulk_create in einer Transaktion eingefügt.
+      Antwort: Ergebnis pro Element (index, status, id bzw. errors) –
+      201 wenn alle, 207 wenn nur ein Teil, 400 wenn kein Element gültig war.
+    """
+    permission_classes = [IsAuthenticated, IsBusinessUser]
+    authentication_classes = [CachedTokenAuthentication]
+    parser_classes = (JSONParser,)
+
+    def post(self, request, format=None):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"detail": "Erwartet wird ein nicht leeres JSON-Array von Angeboten."})
+        if len(items) > settings.OFFER_BULK_MAX_ITEMS:
+            raise ValidationError({"detail": f"Maximal {settings.OFFER_BULK_MAX_ITEMS} Angebote pro Anfrage."})
+
+        results = []
+        offers, details_per_offer = [], []
+        for index, item in enumerate(items):
+            serializer = OfferSerializer(data=item, context={'request': request})
+            if not serializer.is_valid():
+                results.append({"index": index, "status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors})
+                continue
+            offer, details = OfferSerializer.build_instances(request.user, serializer.validated_data)
+            offers.append(offer)
+            details_per_offer.append(details)
+            results.append({"index": index, "status": status.HTTP_201_CREATED})
+
+        if offers:
+            with write_transaction():
+                Offer.objects.bulk_create(offers, batch_size=settings.OFFER_BULK_BATCH_SIZE)
+                all_details = []
+                for offer, details in zip(offers, details_per_offer):
+                    for detail in details:
+                        detail.offer = offer
+                        all_details.append(detail)
+                OfferDetail.objects.bulk_create(all_details, batch_size=settings.OFFER_BULK_BATCH_SIZE)
+                # bulk_create löst keine Signale aus; den Suchindex pflegen die Datenbank-Trigger
+                offers_bulk_created.send(sender=Offer, offers=offers)
+
+        created = iter(offers)
+        for result in results:
+            if result["status"] == status.HTTP_201_CREATED:
+                result["id"] = next(created).id
+
+        if not offers:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif len(offers) < len(items):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response({"created": len(offers), "failed": len(items) - len(offers), "results": results},
+                        status=response_status)
+
@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_offer_search_index(sender, using, **kwargs):
+    from django.db import connections
+    from .search import ensure_search_index
+    ensure_search_index(connections[using])
 
 
 class OffersAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'offers_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Trigger gehen verloren, wenn SQLite die Tabelle in einer Migration neu aufbaut
+        post_migrate.connect(ensure_offer_search_index, sender=self)
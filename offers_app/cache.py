@@ -0,0 +1,93 @@
+"""
+Antwort-Cache für anonyme Anfragen an GET /api/offers/.
+
+Schlüssel: Generation + Host + normalisierter Query-String. Jede Änderung an
+Offer/OfferDetail erhöht die Generation (siehe signals.py und die Bulk-Pfade);
+alte Einträge werden dadurch nie mehr gelesen und laufen über TTL bzw.
+MAX_ENTRIES aus – kein Löschen einzelner Schlüssel nötig.
+
+Der Cache-Alias "offer_list" ist standardmäßig ein LocMemCache pro Prozess. Mit
+mehreren Workern muss er auf ein gemeinsames Backend (Memcached/Redis) zeigen,
+damit die Generation in allen Workern gleichzeitig steigt.
+
+Anfragen, die vom Lesereplikat lesen (coderr_backend/replicas.py), nutzen den
+Cache nicht: die Generation steigt schon beim Commit auf der primären
+Datenbank, eine Seite vom nachhängenden Replikat landete sonst veraltet
+unter der neuen Generation.
+"""
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import parse_http_date_safe
+
+from coderr_backend import metrics
+from coderr_backend.replicas import reads_from_replica
+
+CACHE_ALIAS = 'offer_list'
+GENERATION_KEY = 'offers:generation'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_generation():
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Startwert aus der Uhrzeit: wird der Zähler verdrängt, kann keine alte Generation wiederkehren
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _incr_generation():
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+    metrics.incr('offer_list_cache.bump')
+
+
+def bump_generation():
+    """
+    Macht alle gecachten Listen ungültig. Sofort (damit die schreibende
+    Transaktion selbst nichts Altes liest) und noch einmal nach dem Commit,
+    damit keine parallel gelesene, noch alte Seite unter der neuen Generation landet.
+    """
+    _incr_generation()
+    transaction.on_commit(_incr_generation)
+
+
+def is_cacheable(request):
+    return request.method == 'GET' and not request.user.is_authenticated and not reads_from_replica()
+
+
+def make_key(request, generation):
+    params = sorted(
+        (key, value) for key, values in request.GET.lists() for value in values if value != ''
+    )
+    return f"offers:list:{generation}:{request.get_host()}:{urlencode(params)}"
+
+
+def get_cached(key):
+    entry = get_cache().get(key)
+    metrics.incr('offer_list_cache.hit' if entry is not None else 'offer_list_cache.miss')
+    return entry
+
+
+def store(key, response):
+    """Legt die gerenderte Antwort ab, sofern sie erfolgreich und nicht zu groß ist."""
+    if response.status_code != 200 or len(response.content) > settings.OFFER_LIST_CACHE_MAX_BYTES:
+        return
+    get_cache().set(key, {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'etag': response.get('ETag'),
+        'last_modified': parse_http_date_safe(response.get('Last-Modified')),
+    }, timeout=settings.OFFER_LIST_CACHE_TTL)
+    metrics.incr('offer_list_cache.store')
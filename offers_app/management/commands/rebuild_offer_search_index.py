@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from offers_app.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Legt den Volltextindex für Angebote (inkl. Trigger) bei Bedarf an und baut ihn neu auf."
+
+    def handle(self, *args, **options):
+        rebuild_search_index(connection)
+        self.stdout.write(self.style.SUCCESS(f"Suchindex für {connection.vendor} neu aufgebaut."))
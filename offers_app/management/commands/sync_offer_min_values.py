@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+
+from coderr_backend.database import write_transaction
+from offers_app.cache import bump_generation
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    help = (
+        "Berechnet Offer.min_price und Offer.min_delivery_time aus den OfferDetails neu "
+        "(Backfill) oder prüft mit --check nur, ob die gespeicherten Werte stimmen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Nur prüfen, nichts schreiben. Beendet sich mit Fehler, wenn Abweichungen gefunden werden.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        rows = (
+            Offer.objects
+            .annotate(
+                calc_min_price=Min('details__price'),
+                calc_min_delivery_time=Min('details__delivery_time_in_days'),
+            )
+            .values_list('id', 'min_price', 'min_delivery_time', 'calc_min_price', 'calc_min_delivery_time')
+            .order_by('id')
+        )
+
+        stale = []
+        total = 0
+        for offer_id, min_price, min_delivery_time, calc_price, calc_delivery_time in rows.iterator():
+            total += 1
+            if min_price != calc_price or min_delivery_time != calc_delivery_time:
+                stale.append(Offer(id=offer_id, min_price=calc_price, min_delivery_time=calc_delivery_time))
+
+        if options['check']:
+            if stale:
+                ids = ', '.join(str(offer.id) for offer in stale[:20])
+                raise CommandError(f"{len(stale)} von {total} Angeboten haben veraltete Minimalwerte (z. B. IDs: {ids}).")
+            self.stdout.write(self.style.SUCCESS(f"Alle {total} Angebote sind konsistent."))
+            return
+
+        with write_transaction():
+            Offer.objects.bulk_update(stale, ['min_price', 'min_delivery_time'], batch_size=options['batch_size'])
+            if stale:
+                # bulk_update löst keine Signale aus
+                bump_generation()
+        self.stdout.write(self.style.SUCCESS(f"{len(stale)} von {total} Angeboten aktualisiert."))
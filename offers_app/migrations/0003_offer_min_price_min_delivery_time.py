@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:40
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def backfill_min_values(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    offers = list(Offer.objects.annotate(
+        calc_min_price=Min('details__price'),
+        calc_min_delivery_time=Min('details__delivery_time_in_days'),
+    ))
+    for offer in offers:
+        offer.min_price = offer.calc_min_price
+        offer.min_delivery_time = offer.calc_min_delivery_time
+    Offer.objects.bulk_update(offers, ['min_price', 'min_delivery_time'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_offer_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_min_values, migrations.RunPython.noop),
+    ]
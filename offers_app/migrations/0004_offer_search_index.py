@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:05
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from offers_app.search import ensure_search_index
+    ensure_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    from offers_app.search import drop_search_index
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_offer_min_price_min_delivery_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
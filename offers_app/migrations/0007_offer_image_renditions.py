@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+def ensure_search_index(apps, schema_editor):
+    # SQLite baut die Tabelle für AddField neu auf; dabei gehen die FTS-Trigger verloren
+    from offers_app.search import ensure_search_index
+    ensure_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0006_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(ensure_search_index, migrations.RunPython.noop),
+    ]
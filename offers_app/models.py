@@ -16,17 +16,42 @@ class Offer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def min_price(self):
-        details = self.details.all()
-        if details.exists():
-            return min(detail.price for detail in details)
-        return None
-
-    def min_delivery_time(self):
-        details = self.details.all()
-        if details.exists():
-            return min(detail.delivery_time_in_days for detail in details)
-        return None
+    # Denormalisierte Minimalwerte der OfferDetails, damit Filter und Sortierung
+    # auf /api/offers/ ohne JOIN und GROUP BY auskommen.
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+
+    # Verkleinerte Varianten von image, erzeugt von coderr_backend.images
+    image_renditions = models.JSONField(default=dict, blank=True)
+
+    def compute_min_values(self, details=None):
+        """
+        Berechnet min_price und min_delivery_time aus den übergebenen Details
+        (oder aus der Datenbank) und setzt sie auf der Instanz, ohne zu speichern.
+        Gibt die Namen der geänderten Felder zurück.
+        """
+        if details is None:
+            details = list(self.details.all())
+        prices = [detail.price for detail in details]
+        delivery_times = [detail.delivery_time_in_days for detail in details]
+        values = {
+            'min_price': min(prices) if prices else None,
+            'min_delivery_time': min(delivery_times) if delivery_times else None,
+        }
+        changed = []
+        for field, value in values.items():
+            if getattr(self, field) != value:
+                setattr(self, field, value)
+                changed.append(field)
+        return changed
+
+    class Meta:
+        indexes = [
+            # Keyset-Pagination auf (updated_at, id); min_price ist bereits einzeln indiziert
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_at_id_idx'),
+            # creator_id-Filter mit der Standardsortierung -updated_at
+            models.Index(fields=['user', '-updated_at'], name='offer_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.status}"
@@ -47,5 +72,10 @@ class OfferDetail(models.Model):
     features = models.JSONField()  # Liste von Features (z. B. ["Logo Design", "Visitenkarte"])
     offer_type = models.CharField(max_length=20, choices=OFFER_TYPE_CHOICES)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.offer_type})"
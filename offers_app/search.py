@@ -0,0 +1,109 @@
+"""
+Volltextindex für Angebote (Titel + Beschreibung).
+
+SQLite: FTS5-Schattentabelle mit externem Inhalt (offers_app_offer), die über
+Trigger bei jedem INSERT/UPDATE/DELETE auf offers_app_offer aktuell gehalten
+wird – auch bei bulk_create() und QuerySet.update().
+
+PostgreSQL: GIN-Index auf dem tsvector-Ausdruck, den auch der Suchfilter
+verwendet, damit der Planer den Index nutzt.
+"""
+import re
+
+OFFER_TABLE = 'offers_app_offer'
+FTS_TABLE = 'offers_app_offer_fts'
+POSTGRES_INDEX = 'offer_search_gin'
+POSTGRES_CONFIG = 'simple'
+
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {OFFER_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {OFFER_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON {OFFER_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+
+
+def search_vector():
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('title', 'description', config=POSTGRES_CONFIG)
+
+
+def search_tokens(term):
+    """Zerlegt die Eingabe in Wörter; Operatoren und Anführungszeichen fallen weg."""
+    return re.findall(r'\w+', term)
+
+
+def sqlite_match_expression(tokens):
+    # Präfixsuche pro Wort, damit Treffer schon während des Tippens erscheinen
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def postgres_tsquery(tokens):
+    return ' & '.join(f"{token}:*" for token in tokens)
+
+
+def ensure_search_index(connection):
+    """
+    Legt Index, Trigger bzw. GIN-Index an, falls sie fehlen (idempotent).
+    SQLite verliert Trigger, wenn eine Migration die Tabelle neu aufbaut;
+    fehlen sie, wird der Index deshalb zusätzlich neu aufgebaut.
+    """
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                [f"{FTS_TABLE}%"],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if FTS_TABLE not in existing:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    f"title, description, content='{OFFER_TABLE}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                )
+            missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(SQLITE_TRIGGERS[name])
+            if FTS_TABLE not in existing or missing:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif connection.vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from .models import Offer
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [POSTGRES_INDEX])
+            if cursor.fetchone():
+                return
+        with connection.schema_editor() as schema_editor:
+            schema_editor.add_index(Offer, GinIndex(search_vector(), name=POSTGRES_INDEX))
+
+
+def rebuild_search_index(connection):
+    ensure_search_index(connection)
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(connection):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {POSTGRES_INDEX}")
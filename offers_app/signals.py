@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from coderr_backend.images import needs_renditions, renditions_updated, schedule_renditions
+from user_auth_app.roles import is_business
+from .cache import bump_generation
+from .models import Offer, OfferDetail
+
+User = get_user_model()
+
+# Felder des Anbieters, die die Angebotsliste zeigt (user_details)
+LISTED_USER_FIELDS = {'first_name', 'last_name', 'username'}
+
+# bulk_create löst kein post_save aus: POST /api/offers/bulk/ sendet stattdessen
+# dieses Signal (sender=Offer, offers=Liste der angelegten Angebote) in seiner Transaktion
+offers_bulk_created = Signal()
+
+
+@receiver(post_save, sender=Offer)
+def offer_image_saved(sender, instance, update_fields=None, **kwargs):
+    if needs_renditions(instance, 'image', 'image_renditions', update_fields):
+        schedule_renditions(instance, 'image', 'image_renditions')
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+@receiver(offers_bulk_created, sender=Offer)
+def offer_changed(sender, **kwargs):
+    bump_generation()
+
+
+@receiver(renditions_updated, sender=Offer)
+def offer_renditions_updated(sender, **kwargs):
+    bump_generation()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and not set(update_fields) & LISTED_USER_FIELDS:
+        return
+    # Nur Anbieter haben Angebote; die Rolle ist meist schon bekannt (Token-Cache, select_related), sonst eine schmale Abfrage
+    if is_business(instance):
+        bump_generation()
@@ -1,3 +1,396 @@
-from django.test import TestCase
+import base64
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from base_info_app.models import PlatformStats
+from user_auth_app.models import Profile
+from . import cache as offer_cache
+from .api.async_views import AsyncOfferListView
+from .models import Offer, OfferDetail
+
+# URLs mit der Async-View, wie unter ASGI mit ASYNC_READ_VIEWS
+urlpatterns = [
+    path('api/offers/', AsyncOfferListView.as_view()),
+    path('', include('coderr_backend.urls')),
+]
+
+
+class QueryBudgetMixin:
+    """
+    Test-Helfer: Ein Endpunkt darf höchstens `budget` SQL-Abfragen ausführen.
+    Schlägt fehl (inkl. Liste der Abfragen), sobald z. B. ein N+1-Zugriff im Serializer auftaucht.
+    """
+
+    def assertQueryBudget(self, budget, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, **kwargs)
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(query['sql'] for query in context.captured_queries)
+            self.fail(f"{method.upper()} {url}: {executed} Abfragen, Budget {budget}.\n{queries}")
+        return response
+
+
+def create_offer(user, title, base_price=100):
+    offer = Offer.objects.create(user=user, title=title, description=f"{title} Beschreibung")
+    details = [
+        OfferDetail(offer=offer, title='Basic', revisions=1, delivery_time_in_days=7,
+                    price=base_price, features=['Logo'], offer_type='basic'),
+        OfferDetail(offer=offer, title='Standard', revisions=2, delivery_time_in_days=5,
+                    price=base_price + 50, features=['Logo'], offer_type='standard'),
+        OfferDetail(offer=offer, title='Premium', revisions=3, delivery_time_in_days=3,
+                    price=base_price + 100, features=['Logo'], offer_type='premium'),
+    ]
+    OfferDetail.objects.bulk_create(details)
+    offer.compute_min_values(details)
+    offer.save()
+    return offer
+
+
+def offer_payload(title, base_price=100):
+    """Request-Body für POST /api/offers/ mit den drei Paketen."""
+    return {
+        'title': title,
+        'description': f"{title} Beschreibung",
+        'details': [
+            {'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': 7, 'price': base_price,
+             'features': ['Logo'], 'offer_type': 'basic'},
+            {'title': 'Standard', 'revisions': 2, 'delivery_time_in_days': 5, 'price': base_price + 50,
+             'features': ['Logo'], 'offer_type': 'standard'},
+            {'title': 'Premium', 'revisions': 3, 'delivery_time_in_days': 3, 'price': base_price + 100,
+             'features': ['Logo'], 'offer_type': 'premium'},
+        ],
+    }
+
+
+class OfferQueryBudgetTests(QueryBudgetMixin, TestCase):
+    # count + Angebote (inkl. User-JOIN) + Details-Prefetch
+    LIST_BUDGET = 3
+    # Token + Angebot + Details-Prefetch
+    DETAIL_BUDGET = 3
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        self.token = Token.objects.create(user=self.user)
+
+    def test_offer_list_query_count_does_not_grow_with_page_size(self):
+        create_offer(self.user, 'Erstes Angebot')
+        self.assertQueryBudget(self.LIST_BUDGET, 'get', '/api/offers/')
+
+        for index in range(11):
+            create_offer(self.user, f"Angebot {index}")
+        response = self.assertQueryBudget(self.LIST_BUDGET, 'get', '/api/offers/?page_size=12')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 12)
+        self.assertEqual(len(response.data['results'][0]['details']), 3)
+        self.assertEqual(response.data['results'][0]['user_details']['username'], 'business')
+
+    def test_offer_detail_query_budget(self):
+        offer = create_offer(self.user, 'Angebot')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        response = self.assertQueryBudget(self.DETAIL_BUDGET, 'get', f"/api/offers/{offer.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['details']), 3)
+        self.assertEqual(response.data['min_price'], 100)
+
+
+@override_settings(ROOT_URLCONF='offers_app.tests')
+class AsyncOfferListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        create_offer(self.user, 'Angebot')
+
+    async def test_user_filter(self):
+        client = AsyncClient()
+        response = await client.get(f"/api/offers/?user={self.user.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+
+        response = await client.get('/api/offers/?user=999999')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('user', response.json())
+
+    async def test_malformed_cursor(self):
+        response = await AsyncClient().get('/api/offers/?pagination=cursor&cursor=e30')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.json())
+
+
+class OfferCreateUpdateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+
+    def test_min_values_after_create_and_detail_patch(self):
+        response = self.client.post('/api/offers/', offer_payload('Logo', 120), format='json')
+        self.assertEqual(response.status_code, 201)
+        offer = Offer.objects.get(id=response.json()['id'])
+        self.assertEqual(offer.details.count(), 3)
+        self.assertEqual(offer.min_price, 120)
+        self.assertEqual(offer.min_delivery_time, 3)
+
+        # Nur die Details ändern: Standard wird am günstigsten, Basic am schnellsten
+        details = offer_payload('Logo', 120)['details']
+        details[1]['price'] = 80
+        details[0]['delivery_time_in_days'] = 1
+        response = self.client.patch(f"/api/offers/{offer.id}/", {'details': details}, format='json')
+        self.assertEqual(response.status_code, 200)
+        offer.refresh_from_db()
+        self.assertEqual(offer.title, 'Logo')
+        self.assertEqual(offer.min_price, 80)
+        self.assertEqual(offer.min_delivery_time, 1)
+
+    def test_failed_detail_insert_leaves_no_offer(self):
+        payload = offer_payload('Logo')
+        # Das Einfügen der Details scheitern lassen: das Angebot darf nicht allein übrig bleiben
+        with mock.patch.object(OfferDetail.objects, 'bulk_create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.client.post('/api/offers/', payload, format='json')
+        self.assertFalse(Offer.objects.exists())
+
+
+class OfferBulkCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+        # Zeile jetzt anlegen: danach ändert sich offer_count nur noch über die Signale
+        PlatformStats.load()
+
+    def invalid_payload(self, title):
+        payload = offer_payload(title)
+        payload['details'] = payload['details'][:1]
+        return payload
+
+    def test_all_valid_returns_201(self):
+        generation = offer_cache.get_generation()
+        response = self.client.post('/api/offers/bulk/', [offer_payload('A'), offer_payload('B', 50)], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(response.json()['failed'], 0)
+
+        offer = Offer.objects.get(id=response.json()['results'][1]['id'])
+        self.assertEqual(offer.details.count(), 3)
+        self.assertEqual(offer.min_price, 50)
+        self.assertEqual(offer.min_delivery_time, 3)
+        # Über das Signal offers_bulk_created statt post_save
+        self.assertEqual(PlatformStats.load().offer_count, 2)
+        self.assertNotEqual(offer_cache.get_generation(), generation)
+
+    def test_partially_valid_returns_207(self):
+        response = self.client.post('/api/offers/bulk/', [self.invalid_payload('A'), offer_payload('B')], format='json')
+        self.assertEqual(response.status_code, 207)
+        results = response.json()['results']
+        self.assertEqual(results[0]['index'], 0)
+        self.assertEqual(results[0]['status'], 400)
+        self.assertIn('errors', results[0])
+        self.assertEqual(results[1]['status'], 201)
+        self.assertEqual(list(Offer.objects.values_list('id', flat=True)), [results[1]['id']])
+        self.assertEqual(PlatformStats.load().offer_count, 1)
+
+    def test_no_valid_item_returns_400(self):
+        response = self.client.post('/api/offers/bulk/', [self.invalid_payload('A')], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['created'], 0)
+        self.assertFalse(Offer.objects.exists())
+        self.assertEqual(PlatformStats.load().offer_count, 0)
+
+    def test_non_list_body_returns_400(self):
+        self.assertEqual(self.client.post('/api/offers/bulk/', {}, format='json').status_code, 400)
+        self.assertEqual(self.client.post('/api/offers/bulk/', [], format='json').status_code, 400)
+
+
+class OfferConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        self.offers = [create_offer(self.user, f"Angebot {index}", base_price=100 + index) for index in range(3)]
+
+    def test_matching_etag_returns_304(self):
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/offers/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_has_no_last_modified(self):
+        response = self.client.get('/api/offers/')
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_deleting_older_row_changes_list_etag(self):
+        etag = self.client.get('/api/offers/')['ETag']
+        # Nicht das neueste Angebot: MAX(updated_at) bleibt gleich, die Anzahl nicht
+        self.offers[0].delete()
+        response = self.client.get('/api/offers/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_keyset_page_etag_follows_rows_on_page(self):
+        url = '/api/offers/?pagination=cursor&ordering=min_price&page_size=2'
+        etag = self.client.get(url)['ETag']
+
+        # Drittes Angebot liegt nicht auf der ersten Seite
+        self.offers[2].title = 'Geändert'
+        self.offers[2].save()
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+        self.offers[1].title = 'Geändert'
+        self.offers[1].save()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class OfferListCacheGenerationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+
+    def assertGenerationChanges(self, action):
+        generation = offer_cache.get_generation()
+        action()
+        self.assertNotEqual(offer_cache.get_generation(), generation)
+
+    def test_offer_create_update_delete_bump_generation(self):
+        self.assertGenerationChanges(
+            lambda: self.assertEqual(self.client.post('/api/offers/', offer_payload('Logo'), format='json').status_code, 201)
+        )
+        offer = Offer.objects.get()
+        details = offer_payload('Logo', 80)['details']
+        self.assertGenerationChanges(
+            lambda: self.assertEqual(
+                self.client.patch(f"/api/offers/{offer.id}/", {'details': details}, format='json').status_code, 200
+            )
+        )
+        self.assertGenerationChanges(
+            lambda: self.assertEqual(self.client.delete(f"/api/offers/{offer.id}/").status_code, 204)
+        )
+
+    def test_business_rename_bumps_generation(self):
+        create_offer(self.user, 'Logo')
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Neu'
+        self.assertGenerationChanges(user.save)
+
+    def test_unlisted_user_changes_keep_generation(self):
+        customer = User.objects.create_user('customer', password='secret')
+        Profile.objects.create(user=customer, type='customer')
+        generation = offer_cache.get_generation()
+
+        customer.first_name = 'Neu'
+        customer.save()
+        self.user.last_login = self.user.date_joined
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual(offer_cache.get_generation(), generation)
+
+    def test_known_role_needs_no_query(self):
+        user = User.objects.select_related('profile').get(pk=self.user.pk)
+        user.last_name = 'Neu'
+        with CaptureQueriesContext(connection) as context:
+            user.save()
+        self.assertFalse(any('offers_app_offer' in query['sql'] for query in context.captured_queries))
+        self.assertFalse(any('user_auth_app_profile' in query['sql'] for query in context.captured_queries))
+
+
+class OfferKeysetPaginationTests(TestCase):
+    URL = '/api/offers/?pagination=cursor&ordering=min_price&page_size=2'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        # Gleiche min_price: die Reihenfolge innerhalb des Gleichstands entscheidet die id
+        self.offers = [create_offer(self.user, f"Angebot {index}", base_price=100) for index in range(5)]
+        self.offers.append(create_offer(self.user, 'Günstig', base_price=50))
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([offer['id'] for offer in response.json()['results']])
+            url = response.json()[link]
+        return pages
+
+    def test_pages_have_no_duplicates_or_gaps_with_ties(self):
+        pages = self.walk(self.URL, 'next')
+        ids = [offer_id for page in pages for offer_id in page]
+        expected = [self.offers[-1].id] + [offer.id for offer in self.offers[:-1]]
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2])
+
+    def test_previous_links_walk_back_over_the_same_pages(self):
+        forward = self.walk(self.URL, 'next')
+        last_page = self.client.get(self.URL)
+        while last_page.json()['next']:
+            last_page = self.client.get(last_page.json()['next'])
+        backward = self.walk(last_page.json()['previous'], 'previous')
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_next_is_null_on_last_page(self):
+        response = self.client.get('/api/offers/?pagination=cursor&page_size=6')
+        self.assertEqual(len(response.json()['results']), 6)
+        self.assertIsNone(response.json()['next'])
+        self.assertIsNone(response.json()['previous'])
+
+    def test_malformed_or_tampered_cursor_returns_400(self):
+        tampered = base64.urlsafe_b64encode(b'{"v":"billig","i":1}').decode().rstrip('=')
+        for cursor in ('nicht-base64!', 'e30', tampered, base64.urlsafe_b64encode(b'[1]').decode()):
+            response = self.client.get(f"{self.URL}&cursor={cursor}")
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertIn('cursor', response.json())
+
+
+class OfferSearchIndexTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+
+    def search(self, term):
+        response = self.client.get('/api/offers/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [offer['id'] for offer in response.json()['results']]
+
+    def test_index_follows_create_update_delete(self):
+        response = self.client.post('/api/offers/', offer_payload('Maskottchen'), format='json')
+        self.assertEqual(response.status_code, 201)
+        offer_id = response.json()['id']
+        create_offer(self.user, 'Webseite')
+        self.assertEqual(self.search('maskottchen'), [offer_id])
+
+        response = self.client.patch(f"/api/offers/{offer_id}/", {
+            'title': 'Illustration',
+            'description': 'Comicfiguren für Vereine',
+            'details': offer_payload('Illustration')['details'],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.search('maskottchen'), [])
+        self.assertEqual(self.search('illustration'), [offer_id])
+        self.assertEqual(self.search('comicfiguren'), [offer_id])
+
+        # Die Datenbank-Trigger pflegen den Index auch ohne Signale
+        Offer.objects.filter(id=offer_id).update(title='Plakat')
+        self.assertEqual(self.search('plakat'), [offer_id])
+
+        self.assertEqual(self.client.delete(f"/api/offers/{offer_id}/").status_code, 204)
+        self.assertEqual(self.search('plakat'), [])
+        self.assertEqual(self.search('comicfiguren'), [])
@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.shortcuts import aget_object_or_404
+
+from coderr_backend.async_views import AsyncReadView
+from ..models import OrderStatusCount
+from .views import CompletedOrderCountView, OrderCountView
+
+User = get_user_model()
+
+
+class AsyncOrderCountView(AsyncReadView):
+    """GET /api/order-count/{business_user_id}/ unter ASGI."""
+    sync_view_class = OrderCountView
+
+    async def get(self, request, business_user_id):
+        # Wie OrderCountView: gezählt wird für den angemeldeten Nutzer
+        order_count = await OrderStatusCount.aget_count(request.user.id, 'in_progress')
+        return self.render({"order_count": order_count})
+
+
+class AsyncCompletedOrderCountView(AsyncReadView):
+    """GET /api/completed-order-count/{business_user_id}/ unter ASGI."""
+    sync_view_class = CompletedOrderCountView
+
+    async def get(self, request, business_user_id):
+        business_user = await aget_object_or_404(User.objects.only('id'), id=business_user_id)
+        completed_order_count = await OrderStatusCount.aget_count(business_user.id, 'completed')
+        return self.render({"completed_order_count": completed_order_count})
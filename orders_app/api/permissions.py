@@ -1,6 +1,7 @@
 # permissions.py
 from rest_framework import permissions
 from rest_framework.exceptions import PermissionDenied
+from user_auth_app.roles import is_business
 
 class IsBusinessUserOwner(permissions.BasePermission):
     """
@@ -12,7 +13,7 @@ class IsBusinessUserOwner(permissions.BasePermission):
             return False
         
         # Prüfe, ob der Benutzer ein Business-Profil hat
-        if not hasattr(request.user, 'profile') or request.user.profile.type != 'business':
+        if not is_business(request.user):
             raise PermissionDenied("Nur Business-Nutzer dürfen diese Aktion ausführen.")
         
         # Prüfe, ob die angefragete business_user_id mit der User-ID übereinstimmt
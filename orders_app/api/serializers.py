@@ -37,17 +37,16 @@ class OrderSerializer(serializers.ModelSerializer):
 class OrderCreateSerializer(serializers.Serializer):
     offer_detail_id = serializers.IntegerField()
 
-    def validate_offer_detail_id(self, value):
+    def validate(self, attrs):
+        # Detail, Angebot und Anbieter in einer Abfrage; create() verwendet das Objekt weiter
         try:
-            offer_detail = OfferDetail.objects.get(id=value)
+            attrs['offer_detail'] = OfferDetail.objects.select_related('offer__user').get(id=attrs['offer_detail_id'])
         except OfferDetail.DoesNotExist:
-            raise serializers.ValidationError("Ungültige OfferDetail ID.")
-        return value
+            raise serializers.ValidationError({'offer_detail_id': "Ungültige OfferDetail ID."})
+        return attrs
 
     def create(self, validated_data):
-        offer_detail_id = validated_data['offer_detail_id']
-        # Hole das OfferDetail aus der Offers-App
-        offer_detail = OfferDetail.objects.get(id=offer_detail_id)
+        offer_detail = validated_data['offer_detail']
         request = self.context.get('request')
         customer_user = request.user
 
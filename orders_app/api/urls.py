@@ -1,9 +1,12 @@
 from django.urls import path
-from .views import OrderListCreateView, OrderDetailView, OrderCountView, CompletedOrderCountView
+from coderr_backend.async_views import read_view
+from .async_views import AsyncCompletedOrderCountView, AsyncOrderCountView
+from .views import OrderListCreateView, OrderDetailView, OrderCountView, CompletedOrderCountView, OrderExportView
 
 urlpatterns = [
     path('orders/', OrderListCreateView.as_view(), name='order-list-create'),
+    path('orders/export/', OrderExportView.as_view(), name='order-export'),
     path('orders/<int:pk>/', OrderDetailView.as_view(), name='order-detail'),
-    path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'),
-    path('completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('order-count/<int:business_user_id>/', read_view(OrderCountView, AsyncOrderCountView), name='order-count'),
+    path('completed-order-count/<int:business_user_id>/', read_view(CompletedOrderCountView, AsyncCompletedOrderCountView), name='completed-order-count'),
 ]
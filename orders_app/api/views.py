@@ -1,20 +1,31 @@
+from datetime import datetime, time, timedelta
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from .permissions import IsBusinessUserOwner
-from rest_framework.authentication import TokenAuthentication
+from user_auth_app.api.authentication import CachedTokenAuthentication
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from django.db import IntegrityError
 from django.db.models import Q
-from ..models import Order
+from ..models import Order, OrderStatusCount
 from .serializers import OrderSerializer, OrderCreateSerializer, OrderStatusUpdateSerializer
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from user_auth_app.roles import is_customer
+from coderr_backend.conditional import ConditionalGetMixin
+from coderr_backend.database import write_transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from ..export import FORMATS, export_querysets, stream_export
+from .. import idempotency
 
 User = get_user_model()
 
 
-class OrderListCreateView(generics.ListCreateAPIView):
+class OrderListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET /orders/:
       Gibt eine Liste aller Bestellungen zurück, bei denen der angemeldete Nutzer
@@ -25,7 +36,7 @@ class OrderListCreateView(generics.ListCreateAPIView):
       Nur Nutzer mit einem CustomerProfile dürfen Bestellungen erstellen.
     """
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     serializer_class = OrderSerializer
 
     def get_queryset(self):
@@ -33,18 +44,46 @@ class OrderListCreateView(generics.ListCreateAPIView):
         return Order.objects.filter(Q(customer_user=user) | Q(business_user=user)).order_by('-created_at')
 
     def create(self, request, *args, **kwargs):
-        if not hasattr(request.user, "profile") or request.user.profile.type != "customer":
+        if not is_customer(request.user):
             raise PermissionDenied("Nur Kunden können Bestellungen erstellen.")
         
+        key = idempotency.request_key(request)
+        if key is not None:
+            entry = idempotency.lookup(request.user, key)
+            if entry is not None:
+                return self.replay(request, entry)
+
         serializer = OrderCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        order = serializer.save()
+        try:
+            with write_transaction():
+                order = serializer.save()
+                if key is not None:
+                    idempotency.remember(request.user, key, order, serializer.validated_data['offer_detail_id'])
+        except IntegrityError:
+            # Eine gleichzeitige Wiederholung mit demselben Schlüssel war schneller
+            entry = idempotency.lookup(request.user, key) if key is not None else None
+            if entry is None:
+                raise
+            return self.replay(request, entry)
         read_serializer = OrderSerializer(order, context={'request': request})
         return Response(read_serializer.data, status=status.HTTP_201_CREATED)
 
+    def replay(self, request, entry):
+        """Antwort der ursprünglichen Anfrage zum selben Idempotency-Key."""
+        if str(request.data.get('offer_detail_id')) != str(entry.offer_detail_id):
+            return Response(
+                {idempotency.HEADER: "Dieser Schlüssel wurde bereits für eine andere Bestellung verwendet."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        response = Response(OrderSerializer(entry.order, context={'request': request}).data,
+                            status=status.HTTP_201_CREATED)
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
 
 
-class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OrderDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET /orders/{id}/:
       Ruft die Details einer spezifischen Bestellung ab.
@@ -59,7 +98,7 @@ class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def update(self, request, *args, **kwargs):
       instance = self.get_object()
@@ -88,16 +127,13 @@ class OrderCountView(APIView):
     GET /orders/order-count/{business_user_id}/:
     Gibt die Anzahl der laufenden Bestellungen für den angemeldeten Business-Nutzer zurück.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated] 
 
     def get(self, request, business_user_id):
         # Business-User wird bereits durch die Permission validiert
         business_user = request.user  # Direkt aus dem Request
-        order_count = Order.objects.filter(
-            business_user=business_user, 
-            status='in_progress'
-        ).count()
+        order_count = OrderStatusCount.get_count(business_user.id, 'in_progress')
         return Response({"order_count": order_count})
 
 
@@ -107,9 +143,59 @@ class CompletedOrderCountView(APIView):
     Gibt die Anzahl der abgeschlossenen Bestellungen für einen Business-Nutzer zurück.
     """
     # permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def get(self, request, business_user_id):
         business_user = get_object_or_404(User, id=business_user_id)
-        completed_order_count = Order.objects.filter(business_user=business_user, status='completed').count()
-        return Response({"completed_order_count": completed_order_count})
\ No newline at end of file
+        completed_order_count = OrderStatusCount.get_count(business_user.id, 'completed')
+        return Response({"completed_order_count": completed_order_count})
+
+
+class OrderExportView(APIView):
+    """
+    GET /orders/export/:
+      Streamt die Bestellungen des angemeldeten Nutzers (als Kunde oder Anbieter) für die Buchhaltung.
+      - export_format: 'csv' (Standard) oder 'ndjson'
+      - date_from, date_to: Zeitraum (JJJJ-MM-TT, jeweils einschließlich)
+      - status: ein oder mehrere Status, kommagetrennt
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        params = request.query_params
+        export_format = params.get('export_format', 'csv')
+        if export_format not in FORMATS:
+            raise ValidationError({"export_format": f"Erlaubt: {', '.join(FORMATS)}."})
+
+        statuses = [value for value in params.get('status', '').split(',') if value]
+        valid_statuses = {choice for choice, _ in Order.STATUS_CHOICES}
+        if not set(statuses) <= valid_statuses:
+            raise ValidationError({"status": f"Erlaubt: {', '.join(sorted(valid_statuses))}."})
+
+        date_from = self.parse_day(params, 'date_from')
+        date_to = self.parse_day(params, 'date_to')
+        querysets = export_querysets(
+            request.user,
+            date_from=date_from,
+            date_to=date_to + timedelta(days=1) if date_to else None,
+            statuses=statuses,
+        )
+
+        response = StreamingHttpResponse(stream_export(querysets, export_format), content_type=FORMATS[export_format])
+        filename = f"orders_{timezone.localdate():%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def parse_day(self, params, name):
+        """Tagesbeginn (aktuelle Zeitzone) für einen Parameter im Format JJJJ-MM-TT."""
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({name: "Datum im Format JJJJ-MM-TT erwartet."})
+        return timezone.make_aware(datetime.combine(day, time.min))
@@ -0,0 +1,106 @@
+"""
+Export der Bestellungen als CSV oder NDJSON für die Buchhaltung.
+
+Die Zeilen kommen per values_list(...).iterator(chunk_size=...) direkt aus dem
+Datenbank-Cursor und werden blockweise als Text ausgegeben – ohne Modell-
+instanzen und ohne OrderSerializer. Der Speicherbedarf hängt damit nur von
+ORDER_EXPORT_CHUNK_SIZE ab, nicht von der Anzahl der Bestellungen, und der
+erste Block geht raus, sobald die ersten Zeilen gelesen sind.
+"""
+import csv
+import heapq
+import io
+import json
+
+from django.conf import settings
+
+from .models import Order
+
+FIELDS = (
+    'id', 'created_at', 'updated_at', 'status', 'title', 'offer_type', 'price',
+    'revisions', 'delivery_time_in_days', 'features', 'customer_user_id', 'business_user_id',
+)
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def export_rows(querysets):
+    """
+    Tupel in der Reihenfolge von FIELDS, gelesen in Blöcken aus dem Cursor.
+    Die Teilabfragen sind jeweils nach Index sortiert und werden hier
+    zusammengeführt – ein ORDER BY über "Kunde ODER Anbieter" müsste vor der
+    ersten Zeile erst alle Treffer sortieren.
+    """
+    iterators = [
+        queryset.values_list(*FIELDS).iterator(chunk_size=settings.ORDER_EXPORT_CHUNK_SIZE)
+        for queryset in querysets
+    ]
+    return heapq.merge(*iterators, key=lambda row: (row[1], -row[0]))
+
+
+def chunked(lines):
+    """Fasst einzelne Zeilen zu Blöcken zusammen – ein yield pro Zeile wäre bei 1 Mio. Zeilen spürbar teurer."""
+    size = settings.ORDER_EXPORT_CHUNK_SIZE
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_lines(rows):
+    output = io.StringIO()
+    writer = csv.writer(output)
+
+    def line(values):
+        writer.writerow(values)
+        value = output.getvalue()
+        output.seek(0)
+        output.truncate()
+        return value
+
+    yield line(FIELDS)
+    for row in rows:
+        row = list(row)
+        row[1] = row[1].isoformat()
+        row[2] = row[2].isoformat()
+        row[9] = json.dumps(row[9], ensure_ascii=False)
+        yield line(row)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        record = dict(zip(FIELDS, row))
+        record['created_at'] = record['created_at'].isoformat()
+        record['updated_at'] = record['updated_at'].isoformat()
+        record['price'] = str(record['price'])
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def stream_export(querysets, export_format):
+    lines = csv_lines if export_format == 'csv' else ndjson_lines
+    return chunked(lines(export_rows(querysets)))
+
+
+def export_querysets(user, date_from=None, date_to=None, statuses=None):
+    """
+    Bestellungen des Nutzers als Anbieter und als Kunde, chronologisch; date_to ist exklusiv.
+    Die Sortierung (created_at, -id) entspricht den Indizes order_*_created_idx, SQLite sortiert also nicht.
+    """
+    queryset = Order.objects.all()
+    if date_from is not None:
+        queryset = queryset.filter(created_at__gte=date_from)
+    if date_to is not None:
+        queryset = queryset.filter(created_at__lt=date_to)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    ordering = ('created_at', '-id')
+    return (
+        queryset.filter(business_user=user).order_by(*ordering),
+        queryset.filter(customer_user=user).exclude(business_user=user).order_by(*ordering),
+    )
@@ -0,0 +1,50 @@
+"""
+Idempotency-Key für POST /orders/.
+
+Ein Client, der nach einem Timeout erneut sendet, schickt denselben Header
+Idempotency-Key mit. Innerhalb von ORDER_IDEMPOTENCY_KEY_TTL Sekunden liefert
+die API dann die bereits angelegte Bestellung zurück (eine Abfrage, kein
+Insert). Abgelaufene Schlüssel räumt "manage.py prune_idempotency_keys" ab.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import OrderIdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_LENGTH = OrderIdempotencyKey._meta.get_field('key').max_length
+
+
+def request_key(request):
+    key = request.headers.get(HEADER)
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_LENGTH:
+        raise ValidationError({HEADER: f"Muss zwischen 1 und {MAX_LENGTH} Zeichen lang sein."})
+    return key
+
+
+def expiry_cutoff():
+    return timezone.now() - timedelta(seconds=settings.ORDER_IDEMPOTENCY_KEY_TTL)
+
+
+def lookup(user, key):
+    """Gültiger Eintrag samt Bestellung oder None; ein abgelaufener wird gelöscht, damit der Schlüssel neu vergeben werden kann."""
+    entry = OrderIdempotencyKey.objects.select_related('order').filter(user=user, key=key).first()
+    if entry is not None and entry.created_at < expiry_cutoff():
+        entry.delete()
+        return None
+    return entry
+
+
+def remember(user, key, order, offer_detail_id):
+    return OrderIdempotencyKey.objects.create(user=user, key=key, order=order, offer_detail_id=offer_detail_id)
+
+
+def prune():
+    deleted, _ = OrderIdempotencyKey.objects.filter(created_at__lt=expiry_cutoff()).delete()
+    return deleted
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from orders_app.idempotency import prune
+
+
+class Command(BaseCommand):
+    help = "Löscht Idempotency-Keys von Bestellungen, die älter als ORDER_IDEMPOTENCY_KEY_TTL sind."
+
+    def handle(self, *args, **options):
+        count = prune()
+        self.stdout.write(self.style.SUCCESS(f"{count} abgelaufene Idempotency-Keys gelöscht."))
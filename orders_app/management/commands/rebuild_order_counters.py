@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from orders_app.models import OrderStatusCount
+
+
+class Command(BaseCommand):
+    help = "Baut die Bestellzähler (OrderStatusCount) pro Business-User und Status aus der Order-Tabelle neu auf."
+
+    def handle(self, *args, **options):
+        count = OrderStatusCount.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{count} Zähler neu aufgebaut."))
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_status_counts(apps, schema_editor):
+    Order = apps.get_model('orders_app', 'Order')
+    OrderStatusCount = apps.get_model('orders_app', 'OrderStatusCount')
+    rows = Order.objects.values('business_user_id', 'status').annotate(total=Count('id')).order_by()
+    OrderStatusCount.objects.bulk_create([
+        OrderStatusCount(business_user_id=row['business_user_id'], status=row['status'], count=row['total'])
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_status_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('business_user', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill_status_counts, migrations.RunPython.noop),
+    ]
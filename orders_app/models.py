@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models import Count, F
 from django.conf import settings
+from coderr_backend.database import write_transaction
 
 class Order(models.Model):
     STATUS_CHOICES = (
@@ -28,5 +30,112 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Geladenen Status merken, damit die Signal-Handler Statuswechsel zählen können
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Die Signal-Handler passen OrderStatusCount in derselben Transaktion an
+        with write_transaction():
+            if not self._state.adding and self.pk is not None:
+                # Status beim Laden kann veraltet sein (parallele PATCHes): aktuellen Stand gesperrt lesen,
+                # damit der Zähler vom tatsächlich gespeicherten Status abgezogen wird
+                self._loaded_status = (
+                    Order.objects.select_for_update().filter(pk=self.pk).values_list('status', flat=True).first()
+                )
+            super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            # Bestellliste: customer_user ODER business_user, sortiert nach -created_at
+            models.Index(fields=['customer_user', '-created_at'], name='order_customer_created_idx'),
+            models.Index(fields=['business_user', '-created_at'], name='order_business_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
+
+
+class OrderStatusCount(models.Model):
+    """
+    Anzahl der Bestellungen pro (Business-User, Status). Wird bei jedem Anlegen,
+    Statuswechsel und Löschen einer Bestellung in derselben Transaktion angepasst
+    (siehe signals.py), damit die Zähl-Endpunkte kein COUNT(*) brauchen.
+    """
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='order_status_counts'
+    )
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('business_user', 'status')
+
+    @classmethod
+    def apply(cls, business_user_id, status, delta):
+        if not delta:
+            return
+        with write_transaction():
+            updated = cls.objects.filter(business_user_id=business_user_id, status=status).update(
+                count=F('count') + delta
+            )
+            # Zeile nur für neue Bestellungen anlegen – nicht beim kaskadierenden Löschen eines Users
+            if not updated and delta > 0:
+                cls.objects.get_or_create(business_user_id=business_user_id, status=status)
+                cls.objects.filter(business_user_id=business_user_id, status=status).update(
+                    count=F('count') + delta
+                )
+
+    @classmethod
+    def get_count(cls, business_user_id, status):
+        count = cls.objects.filter(business_user_id=business_user_id, status=status).values_list('count', flat=True).first()
+        return count or 0
+
+    @classmethod
+    async def aget_count(cls, business_user_id, status):
+        count = await cls.objects.filter(business_user_id=business_user_id, status=status).values_list('count', flat=True).afirst()
+        return count or 0
+
+    @classmethod
+    def rebuild(cls):
+        """Berechnet alle Zähler aus der Order-Tabelle neu."""
+        rows = Order.objects.values('business_user_id', 'status').annotate(total=Count('id')).order_by()
+        counters = [
+            cls(business_user_id=row['business_user_id'], status=row['status'], count=row['total'])
+            for row in rows
+        ]
+        with write_transaction():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(counters, batch_size=500)
+        return len(counters)
+
+    def __str__(self):
+        return f"{self.business_user_id} {self.status}: {self.count}"
+
+
+class OrderIdempotencyKey(models.Model):
+    """
+    Idempotency-Key eines POST /orders/: Wiederholt ein Client die Anfrage mit
+    demselben Schlüssel (z. B. nach einem Timeout), wird die ursprüngliche
+    Bestellung zurückgegeben statt eine zweite anzulegen. Gültig für
+    ORDER_IDEMPOTENCY_KEY_TTL Sekunden (siehe orders_app/idempotency.py).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    key = models.CharField(max_length=255)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='+')
+    # Zum Erkennen eines wiederverwendeten Schlüssels mit anderem Inhalt
+    offer_detail_id = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        return f"{self.user_id} {self.key}"
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Order, OrderStatusCount
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, **kwargs):
+    if created:
+        OrderStatusCount.apply(instance.business_user_id, instance.status, 1)
+        return
+    previous = getattr(instance, '_loaded_status', None)
+    if previous is not None and previous != instance.status:
+        OrderStatusCount.apply(instance.business_user_id, previous, -1)
+        OrderStatusCount.apply(instance.business_user_id, instance.status, 1)
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    OrderStatusCount.apply(instance.business_user_id, instance.status, -1)
@@ -1,3 +1,265 @@
-from django.test import TestCase
+import csv
+import json
+from datetime import datetime, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from offers_app.models import Offer, OfferDetail
+from user_auth_app.models import Profile
+from .models import Order, OrderIdempotencyKey, OrderStatusCount
+
+
+def order_fields(business, customer, **extra):
+    return {
+        'customer_user': customer,
+        'business_user': business,
+        'title': 'Logo Design',
+        'revisions': 1,
+        'delivery_time_in_days': 5,
+        'price': 100,
+        'features': ['Logo'],
+        'offer_type': 'basic',
+        **extra,
+    }
+
+
+class OrderStatusCountTests(TestCase):
+    def setUp(self):
+        self.business = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user('customer', password='secret')
+        Profile.objects.create(user=self.customer, type='customer')
+
+    def counts(self):
+        return {
+            status: OrderStatusCount.get_count(self.business.id, status)
+            for status, _ in Order.STATUS_CHOICES
+        }
+
+    def test_create_increments_count(self):
+        Order.objects.create(**order_fields(self.business, self.customer))
+        Order.objects.create(**order_fields(self.business, self.customer))
+        self.assertEqual(self.counts(), {'in_progress': 2, 'completed': 0, 'cancelled': 0})
+
+    def test_status_change_moves_exactly_one_count(self):
+        order = Order.objects.create(**order_fields(self.business, self.customer))
+        Order.objects.create(**order_fields(self.business, self.customer))
+        order.status = 'completed'
+        order.save()
+        self.assertEqual(self.counts(), {'in_progress': 1, 'completed': 1, 'cancelled': 0})
+
+    def test_save_with_unchanged_status_is_noop(self):
+        order = Order.objects.create(**order_fields(self.business, self.customer))
+        order.title = 'Neuer Titel'
+        order.save()
+        Order.objects.get(pk=order.pk).save()
+        self.assertEqual(self.counts(), {'in_progress': 1, 'completed': 0, 'cancelled': 0})
+
+    def test_stale_instance_moves_count_from_stored_status(self):
+        order = Order.objects.create(**order_fields(self.business, self.customer))
+        stale = Order.objects.get(pk=order.pk)
+        order.status = 'completed'
+        order.save()
+        stale.status = 'cancelled'
+        stale.save()
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 0, 'cancelled': 1})
+
+    def test_delete_decrements_count(self):
+        order = Order.objects.create(**order_fields(self.business, self.customer, status='completed'))
+        Order.objects.create(**order_fields(self.business, self.customer, status='completed'))
+        order.delete()
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 1, 'cancelled': 0})
+
+    def test_count_views_return_counter_values(self):
+        Order.objects.create(**order_fields(self.business, self.customer))
+        Order.objects.create(**order_fields(self.business, self.customer, status='completed'))
+        Order.objects.create(**order_fields(self.business, self.customer, status='completed'))
+        client = APIClient()
+        client.force_authenticate(self.business)
+
+        response = client.get(f"/api/order-count/{self.business.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'order_count': 1})
+
+        response = client.get(f"/api/completed-order-count/{self.business.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'completed_order_count': 2})
+
+    def test_rebuild_command_repairs_counts_after_bulk_create(self):
+        Order.objects.create(**order_fields(self.business, self.customer))
+        # bulk_create löst keine Signale aus, die Zähler bleiben zurück
+        Order.objects.bulk_create([
+            Order(**order_fields(self.business, self.customer)),
+            Order(**order_fields(self.business, self.customer, status='cancelled')),
+        ])
+        self.assertEqual(self.counts(), {'in_progress': 1, 'completed': 0, 'cancelled': 0})
+
+        call_command('rebuild_order_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), {'in_progress': 2, 'completed': 0, 'cancelled': 1})
+
+
+class OrderIdempotencyTests(TestCase):
+    def setUp(self):
+        self.business = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user('customer', password='secret')
+        Profile.objects.create(user=self.customer, type='customer')
+        offer = Offer.objects.create(user=self.business, title='Logo Design', description='Logos')
+        self.basic = OfferDetail.objects.create(offer=offer, title='Basic', revisions=1, delivery_time_in_days=7,
+                                                price=100, features=['Logo'], offer_type='basic')
+        self.standard = OfferDetail.objects.create(offer=offer, title='Standard', revisions=2, delivery_time_in_days=5,
+                                                   price=150, features=['Logo'], offer_type='standard')
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+
+    def post(self, detail_id, key=None):
+        headers = {'Idempotency-Key': key} if key is not None else {}
+        return self.client.post('/api/orders/', {'offer_detail_id': detail_id}, format='json', headers=headers)
+
+    def age_keys(self, **kwargs):
+        OrderIdempotencyKey.objects.filter(**kwargs).update(created_at=timezone.now() - timedelta(days=2))
+
+    def test_replay_returns_original_order(self):
+        first = self.post(self.basic.id, 'abc')
+        second = self.post(self.basic.id, 'abc')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertFalse(first.has_header('Idempotent-Replayed'))
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_same_key_with_other_offer_detail_is_rejected(self):
+        self.post(self.basic.id, 'abc')
+        response = self.post(self.standard.id, 'abc')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_expired_key_is_replaced(self):
+        first = self.post(self.basic.id, 'abc')
+        self.age_keys()
+        second = self.post(self.basic.id, 'abc')
+        self.assertEqual(second.status_code, 201)
+        self.assertFalse(second.has_header('Idempotent-Replayed'))
+        self.assertNotEqual(second.json()['id'], first.json()['id'])
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(OrderIdempotencyKey.objects.get().order_id, second.json()['id'])
+
+    def test_same_key_from_other_user_is_independent(self):
+        other = User.objects.create_user('other', password='secret')
+        Profile.objects.create(user=other, type='customer')
+        self.post(self.basic.id, 'abc')
+        self.client.force_authenticate(other)
+        response = self.post(self.standard.id, 'abc')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_unknown_offer_detail_returns_400(self):
+        response = self.post(999999, 'abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIsInstance(response.json()['offer_detail_id'], list)
+        self.assertFalse(OrderIdempotencyKey.objects.exists())
+
+    def test_invalid_key_returns_400(self):
+        self.assertEqual(self.post(self.basic.id, 'x' * 300).status_code, 400)
+        self.assertEqual(self.post(self.basic.id, '  ').status_code, 400)
+        self.assertFalse(Order.objects.exists())
+
+    def test_prune_deletes_only_expired_keys(self):
+        self.post(self.basic.id, 'old')
+        self.post(self.basic.id, 'new')
+        self.age_keys(key='old')
+
+        call_command('prune_idempotency_keys', stdout=StringIO())
+        self.assertEqual(list(OrderIdempotencyKey.objects.values_list('key', flat=True)), ['new'])
+        self.assertEqual(Order.objects.count(), 2)
+
+
+class OrderExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.user, type='business')
+        self.partner = User.objects.create_user('partner', password='secret')
+        Profile.objects.create(user=self.partner, type='business')
+        stranger = User.objects.create_user('stranger', password='secret')
+
+        # (Anbieter, Kunde, Status, Tag im Januar 2026, Stunde)
+        rows = [
+            (self.user, self.partner, 'in_progress', 1, 10),
+            (self.partner, self.user, 'completed', 2, 0),
+            (self.user, self.user, 'completed', 2, 12),
+            (self.user, self.partner, 'cancelled', 3, 23),
+            (self.partner, self.user, 'in_progress', 4, 0),
+            (self.partner, stranger, 'completed', 2, 8),
+        ]
+        self.orders = []
+        for business, customer, status, day, hour in rows:
+            order = Order.objects.create(**order_fields(business, customer, status=status))
+            created_at = timezone.make_aware(datetime(2026, 1, day, hour))
+            Order.objects.filter(pk=order.pk).update(created_at=created_at)
+            self.orders.append(order)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        response = self.client.get('/api/orders/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def export_ids(self, **params):
+        _, content = self.export(export_format='ndjson', **params)
+        return [json.loads(line)['id'] for line in content.splitlines()]
+
+    def test_csv(self):
+        response, content = self.export()
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual([int(row['id']) for row in rows], [order.id for order in self.orders[:5]])
+        self.assertEqual(rows[0]['created_at'], '2026-01-01T10:00:00+00:00')
+        self.assertEqual(json.loads(rows[0]['features']), ['Logo'])
+
+    def test_ndjson(self):
+        response, content = self.export(export_format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        record = json.loads(content.splitlines()[1])
+        self.assertEqual(record['id'], self.orders[1].id)
+        self.assertEqual(record['status'], 'completed')
+        self.assertEqual(record['price'], '100.00')
+        self.assertEqual(record['business_user_id'], self.partner.id)
+        self.assertEqual(record['customer_user_id'], self.user.id)
+
+    @override_settings(ORDER_EXPORT_CHUNK_SIZE=2)
+    def test_both_sides_merged_in_order_without_duplicates(self):
+        # Reihenfolge nach created_at über mehrere Blöcke; die Bestellung an sich selbst nur einmal
+        self.assertEqual(self.export_ids(), [order.id for order in self.orders[:5]])
+
+    def test_status_filter(self):
+        self.assertEqual(self.export_ids(status='completed'), [self.orders[1].id, self.orders[2].id])
+        self.assertEqual(
+            self.export_ids(status='in_progress,cancelled'),
+            [self.orders[0].id, self.orders[3].id, self.orders[4].id],
+        )
+
+    def test_date_filters_are_inclusive(self):
+        self.assertEqual(
+            self.export_ids(date_from='2026-01-02', date_to='2026-01-03'),
+            [self.orders[1].id, self.orders[2].id, self.orders[3].id],
+        )
+        self.assertEqual(self.export_ids(date_from='2026-01-04'), [self.orders[4].id])
+        self.assertEqual(self.export_ids(date_to='2026-01-01'), [self.orders[0].id])
+
+    def test_invalid_parameters_return_400(self):
+        for params in ({'export_format': 'xlsx'}, {'status': 'lost'}, {'date_from': '02.01.2026'}):
+            response = self.client.get('/api/orders/export/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn(next(iter(params)), response.json())
+
+    def test_anonymous_returns_401(self):
+        self.assertEqual(APIClient().get('/api/orders/export/').status_code, 401)
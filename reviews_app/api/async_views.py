@@ -0,0 +1,10 @@
+from coderr_backend.async_views import AsyncReadView
+from .views import ReviewListCreateView
+
+
+class AsyncReviewListView(AsyncReadView):
+    """GET /api/reviews/ unter ASGI – gleiche Filter und Sortierung wie ReviewListCreateView."""
+    sync_view_class = ReviewListCreateView
+
+    async def get(self, request):
+        return await self.list_response(request, self.get_sync_view(request))
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from ..models import Review
 from django.contrib.auth import get_user_model
+from user_auth_app.roles import is_business
 
 User = get_user_model()
 
@@ -19,6 +20,9 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'reviewer', 'created_at', 'updated_at']
 
 class ReviewCreateSerializer(serializers.ModelSerializer):
+    # Profil gleich mitladen, damit die Rollenprüfung keine zweite Abfrage braucht
+    business_user = serializers.PrimaryKeyRelatedField(queryset=User.objects.select_related('profile'))
+
     class Meta:
         model = Review
         fields = [
@@ -34,7 +38,7 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
 
     def validate_business_user(self, value):
         # Sicherstellen, dass der angegebene User ein Geschäftsbenutzer ist
-        if not hasattr(value, 'profile') or value.profile.type != 'business':
+        if not is_business(value):
             raise serializers.ValidationError("Eine Bewertung kann nur für einen Geschäftsbenutzer abgegeben werden.")
         return value
 
@@ -1,7 +1,9 @@
 from django.urls import path
+from coderr_backend.async_views import read_view
+from .async_views import AsyncReviewListView
 from .views import ReviewListCreateView, ReviewDetailView
 
 urlpatterns = [
-    path('reviews/', ReviewListCreateView.as_view(), name='review-list-create'),
+    path('reviews/', read_view(ReviewListCreateView, AsyncReviewListView), name='review-list-create'),
     path('reviews/<str:pk>/', ReviewDetailView.as_view(), name='review-detail'),
 ]
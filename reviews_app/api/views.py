@@ -1,8 +1,10 @@
 from rest_framework import generics, filters, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
+from user_auth_app.api.authentication import CachedTokenAuthentication
 from rest_framework.exceptions import PermissionDenied, NotFound
 from django.shortcuts import get_object_or_404
+from user_auth_app.roles import is_customer
+from coderr_backend.conditional import ConditionalGetMixin
 from ..models import Review
 from .serializers import (
     ReviewSerializer, 
@@ -10,7 +12,7 @@ from .serializers import (
     ReviewUpdateSerializer
 )
 
-class ReviewListCreateView(generics.ListCreateAPIView):
+class ReviewListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET /api/reviews/:
       Listet alle Bewertungen. Unterstützt die Filterung über die Query-Parameter:
@@ -24,7 +26,7 @@ class ReviewListCreateView(generics.ListCreateAPIView):
       Ein Benutzer kann pro Geschäftsbenutzer nur eine Bewertung abgeben.
     """
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['updated_at', 'rating']
     ordering = ['-updated_at']
@@ -46,13 +48,13 @@ class ReviewListCreateView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         # Nur Kunden dürfen Bewertungen erstellen.
-        if not hasattr(self.request.user, "profile") or self.request.user.profile.type != "customer":
+        if not is_customer(self.request.user):
             raise PermissionDenied("Nur authentifizierte Kunden können Bewertungen erstellen.")
         serializer.save()
 
-class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ReviewDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Review.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     
     def get_object(self):
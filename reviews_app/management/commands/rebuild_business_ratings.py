@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews_app.models import BusinessRating
+
+
+class Command(BaseCommand):
+    help = "Berechnet die Bewertungsübersicht (BusinessRating) aller Geschäftsbenutzer aus den Reviews neu."
+
+    def handle(self, *args, **options):
+        count = BusinessRating.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{count} Bewertungsübersichten neu berechnet."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_business_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessRating = apps.get_model('reviews_app', 'BusinessRating')
+    rows = Review.objects.values('business_user_id').annotate(count=Count('id'), total=Sum('rating')).order_by()
+    BusinessRating.objects.bulk_create([
+        BusinessRating(
+            business_user_id=row['business_user_id'],
+            review_count=row['count'],
+            rating_sum=row['total'],
+            average_rating=row['total'] / row['count'],
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reviews_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRating',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('average_rating', models.FloatField(db_index=True, default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_business_ratings, migrations.RunPython.noop),
+    ]
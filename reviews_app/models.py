@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.conf import settings
+from coderr_backend.database import write_transaction
 
 class Review(models.Model):
     business_user = models.ForeignKey(
@@ -19,6 +22,89 @@ class Review(models.Model):
 
     class Meta:
         unique_together = ('business_user', 'reviewer')  # Ein Reviewer kann pro Geschäftsbenutzer nur eine Bewertung abgeben
+        indexes = [
+            models.Index(fields=['business_user', '-updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['reviewer', '-updated_at'], name='review_reviewer_updated_idx'),
+            models.Index(fields=['-updated_at'], name='review_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Geladene Bewertung merken, damit die Signal-Handler Differenzen verbuchen können
+        instance._loaded_rating = instance.__dict__.get('rating')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Die Signal-Handler passen BusinessRating/PlatformStats in derselben Transaktion an
+        with write_transaction():
+            super().save(*args, **kwargs)
+        self._loaded_rating = self.rating
 
     def __str__(self):
         return f"Review {self.id} by {self.reviewer} for {self.business_user}"
+
+
+class BusinessRating(models.Model):
+    """
+    Bewertungsübersicht pro Geschäftsbenutzer. Wird in derselben Transaktion wie
+    das Anlegen, Ändern und Löschen einer Review angepasst (siehe signals.py),
+    sodass Profilseiten und "Top bewertet" die Review-Tabelle nie durchsuchen müssen.
+    """
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_summary'
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    average_rating = models.FloatField(default=0, db_index=True)
+
+    @classmethod
+    def apply(cls, business_user_id, count_delta=0, rating_delta=0):
+        """Verbucht Deltas atomar per UPDATE; average_rating wird in SQL aus den neuen Werten berechnet."""
+        if not count_delta and not rating_delta:
+            return
+        new_count = F('review_count') + count_delta
+        new_sum = F('rating_sum') + rating_delta
+        values = {
+            'review_count': new_count,
+            'rating_sum': new_sum,
+            'average_rating': Coalesce(
+                Cast(new_sum, FloatField()) / NullIf(new_count, 0),
+                Value(0.0),
+                output_field=FloatField(),
+            ),
+        }
+        with write_transaction():
+            updated = cls.objects.filter(business_user_id=business_user_id).update(**values)
+            # Zeile nur für eine neue Review anlegen – nicht beim kaskadierenden Löschen eines Users
+            if not updated and count_delta > 0:
+                cls.objects.get_or_create(business_user_id=business_user_id)
+                cls.objects.filter(business_user_id=business_user_id).update(**values)
+
+    @classmethod
+    def rebuild(cls):
+        """Berechnet alle Übersichten aus der Review-Tabelle neu."""
+        rows = (
+            Review.objects.values('business_user_id')
+            .annotate(count=Count('id'), total=Sum('rating'))
+            .order_by()
+        )
+        summaries = [
+            cls(
+                business_user_id=row['business_user_id'],
+                review_count=row['count'],
+                rating_sum=row['total'],
+                average_rating=row['total'] / row['count'],
+            )
+            for row in rows
+        ]
+        with write_transaction():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(summaries, batch_size=500)
+        return len(summaries)
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.average_rating:.1f} ({self.review_count})"
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import BusinessRating, Review
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    if created:
+        BusinessRating.apply(instance.business_user_id, count_delta=1, rating_delta=instance.rating)
+        return
+    previous = getattr(instance, '_loaded_rating', None)
+    if previous is not None:
+        BusinessRating.apply(instance.business_user_id, rating_delta=instance.rating - previous)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    BusinessRating.apply(instance.business_user_id, count_delta=-1, rating_delta=-instance.rating)
@@ -1,3 +1,64 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from user_auth_app.models import Profile
+from .models import BusinessRating, Review
+
+
+class BusinessRatingTests(TestCase):
+    def setUp(self):
+        self.business = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.business, type='business')
+        self.customers = []
+        for index in range(2):
+            customer = User.objects.create_user(f"customer{index}", password='secret')
+            Profile.objects.create(user=customer, type='customer')
+            self.customers.append(customer)
+
+    def review(self, customer, rating):
+        return Review.objects.create(business_user=self.business, reviewer=customer, rating=rating, description='Text')
+
+    def summary(self):
+        return BusinessRating.objects.get(business_user=self.business)
+
+    def test_create_updates_average_and_count(self):
+        self.review(self.customers[0], 4)
+        self.review(self.customers[1], 5)
+        summary = self.summary()
+        self.assertEqual(summary.review_count, 2)
+        self.assertEqual(summary.rating_sum, 9)
+        self.assertEqual(summary.average_rating, 4.5)
+
+    def test_rating_update_moves_sum(self):
+        review = self.review(self.customers[0], 4)
+        self.review(self.customers[1], 2)
+        review.rating = 1
+        review.save()
+        summary = self.summary()
+        self.assertEqual(summary.review_count, 2)
+        self.assertEqual(summary.rating_sum, 3)
+        self.assertEqual(summary.average_rating, 1.5)
+
+    def test_unchanged_rating_save_keeps_sum(self):
+        review = self.review(self.customers[0], 4)
+        review.description = 'Neuer Text'
+        review.save()
+        Review.objects.get(pk=review.pk).save()
+        summary = self.summary()
+        self.assertEqual(summary.review_count, 1)
+        self.assertEqual(summary.rating_sum, 4)
+
+    def test_delete_updates_average_and_count(self):
+        review = self.review(self.customers[0], 2)
+        self.review(self.customers[1], 5)
+        review.delete()
+        summary = self.summary()
+        self.assertEqual(summary.review_count, 1)
+        self.assertEqual(summary.average_rating, 5.0)
+
+    def test_deleting_last_review_resets_average(self):
+        self.review(self.customers[0], 4).delete()
+        summary = self.summary()
+        self.assertEqual(summary.review_count, 0)
+        self.assertEqual(summary.rating_sum, 0)
+        self.assertEqual(summary.average_rating, 0.0)
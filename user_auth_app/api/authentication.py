@@ -0,0 +1,162 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from coderr_backend import metrics
+
+
+class TokenCache:
+    """
+    Begrenzter LRU-Cache mit TTL: Token-Key -> (User, Token, Profiltyp).
+    Einträge werden bei Token-Löschung/-Neuerstellung, bei Änderungen am User
+    (z. B. Deaktivierung) und am Profil über die Signale in signals.py verworfen.
+
+    Der Cache lebt pro Prozess; in anderen Workern begrenzt die TTL, wie lange
+    ein gelöschtes Token noch akzeptiert werden kann.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return self._max_size if self._max_size is not None else settings.TOKEN_AUTH_CACHE_MAX_SIZE
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else settings.TOKEN_AUTH_CACHE_TTL
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.incr('auth_cache.miss')
+                return None
+            if entry[-1] < time.monotonic():
+                self._remove(key)
+                metrics.incr('auth_cache.expired')
+                metrics.incr('auth_cache.miss')
+                return None
+            self._entries.move_to_end(key)
+        metrics.incr('auth_cache.hit')
+        return entry[:-1]
+
+    def set(self, key, user, token, profile_type):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (user, token, profile_type, time.monotonic() + self.ttl)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                metrics.incr('auth_cache.eviction')
+
+    def invalidate_key(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._keys_by_user.get(entry[0].pk)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[entry[0].pk]
+
+
+token_cache = TokenCache()
+metrics.register_gauge('auth_cache.size', lambda: len(token_cache))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in-Ersatz für TokenAuthentication: Bei einem Treffer im Prozess-Cache
+    entfällt die Token+User-Abfrage komplett. Jede Anfrage erhält eine eigene
+    Kopie des Users, damit Änderungen nicht in andere Anfragen durchschlagen.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            user, token, profile_type = cached
+            return self.prepare_user(user, profile_type), token
+
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user', 'user__profile').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return self.accept_token(key, token)
+
+    async def aauthenticate(self, request):
+        """Async-Gegenstück zu authenticate() für die Views in coderr_backend.async_views."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.')
+            )
+
+        cached = token_cache.get(key)
+        if cached is not None:
+            user, token, profile_type = cached
+            return self.prepare_user(user, profile_type), token
+
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related('user', 'user__profile').aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return self.accept_token(key, token)
+
+    def accept_token(self, key, token):
+        user = token.user
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        profile = getattr(user, 'profile', None)
+        profile_type = profile.type if profile is not None else None
+        token_cache.set(key, user, token, profile_type)
+        return self.prepare_user(user, profile_type), token
+
+    def prepare_user(self, user, profile_type):
+        user = copy.copy(user)
+        # Das Profil nicht zwischen Anfragen teilen; die Rolle liefert user_auth_app.roles
+        user._state.fields_cache.pop('profile', None)
+        user._profile_type = profile_type
+        return user
@@ -0,0 +1,19 @@
+from coderr_backend.pagination import CountedPageNumberPagination, KeysetPagination
+
+
+class ProfilePagination(CountedPageNumberPagination):
+    page_size = 20
+
+
+class ProfileCursorPagination(KeysetPagination):
+    """Opt-in über ?pagination=cursor; Sortierung nach id (Standard) oder den Bewertungsfeldern."""
+    page_size = 20
+    ordering_fields = ('id', 'average_rating', 'review_count')
+    default_ordering = 'id'
+    # Annotationen der Business-Liste haben kein Modellfeld
+    cursor_types = {'average_rating': float, 'review_count': int}
+
+    def parse_cursor_value(self, model, raw):
+        if self.field in self.cursor_types:
+            return self.cursor_types[self.field](raw)
+        return super().parse_cursor_value(model, raw)
@@ -1,7 +1,9 @@
 from rest_framework import serializers
+from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
 from ..models import Profile
+from coderr_backend.images import rendition_urls
 
 User = get_user_model()
 
@@ -26,9 +28,36 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
 class ProfileSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True) 
+    file_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'email', 'file', 
+        fields = ['user', 'username', 'first_name', 'last_name', 'email', 'file', 'file_renditions',
                   'location', 'tel', 'description', 'working_hours', 'type', 'created_at']
 
+    def get_file_renditions(self, obj):
+        return rendition_urls(obj.file_renditions, obj.file, self.context.get('request'))
+
+
+class BusinessProfileSerializer(ProfileSerializer):
+    """Profil eines Geschäftsbenutzers inkl. Bewertungsübersicht (ohne Zugriff auf die Review-Tabelle)."""
+    review_count = serializers.SerializerMethodField()
+    average_rating = serializers.SerializerMethodField()
+
+    class Meta(ProfileSerializer.Meta):
+        fields = ProfileSerializer.Meta.fields + ['review_count', 'average_rating']
+
+    def get_summary(self, obj):
+        try:
+            return obj.user.rating_summary
+        except ObjectDoesNotExist:
+            return None
+
+    def get_review_count(self, obj):
+        summary = self.get_summary(obj)
+        return summary.review_count if summary else 0
+
+    def get_average_rating(self, obj):
+        summary = self.get_summary(obj)
+        return round(summary.average_rating, 1) if summary else 0.0
+
@@ -12,9 +12,14 @@ from rest_framework.views import APIView
 
 from django.shortcuts import get_object_or_404
 from ..models import Profile
-from .serializers import ProfileSerializer
+from .serializers import ProfileSerializer, BusinessProfileSerializer
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.authentication import TokenAuthentication
+from .authentication import CachedTokenAuthentication
+from coderr_backend.conditional import ConditionalGetMixin, conditional_response, object_validators
+from coderr_backend.pagination import SelectablePaginationMixin
+from .pagination import ProfileCursorPagination, ProfilePagination
 
 
 User = get_user_model()
@@ -98,7 +103,7 @@ class CustomLoginView(APIView):
 
 class ProfileDetailView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
 
     def get(self, request, pk, format=None):
@@ -106,12 +111,19 @@ class ProfileDetailView(APIView):
             return Response({"detail": "User not authenticated"}, status=status.HTTP_403_FORBIDDEN)
 
         try:
-            profile = Profile.objects.get(user_id=pk)
+            profile = Profile.objects.select_related('user', 'user__rating_summary').get(user_id=pk)
         except Profile.DoesNotExist:
             return Response({"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = ProfileSerializer(profile)
-        return Response(serializer.data)
+        # Bewertungsübersicht hat kein eigenes updated_at und fließt daher direkt in den ETag ein
+        summary = getattr(profile.user, 'rating_summary', None)
+        etag, last_modified = object_validators(
+            profile, summary and summary.review_count, summary and summary.rating_sum
+        )
+        serializer_class = BusinessProfileSerializer if profile.type == 'business' else ProfileSerializer
+        return conditional_response(
+            request, etag, last_modified, lambda: Response(serializer_class(profile).data)
+        )
 
     def put(self, request, pk, format=None):
         try:
@@ -138,20 +150,75 @@ class ProfileDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class BusinessProfileListView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request, format=None):
-        business_profiles = Profile.objects.filter(type='business')
-        serializer = ProfileSerializer(business_profiles, many=True)
-        return Response(serializer.data)
-
-
-class CustomerProfileListView(APIView):
+class ProfileListView(ConditionalGetMixin, SelectablePaginationMixin, generics.ListAPIView):
+    """
+    Gemeinsame Basis der Profilverzeichnisse: paginiert (Seitennummern oder
+    ?pagination=cursor), Benutzer per JOIN statt einer Abfrage pro Zeile.
+      - location: Teilstring des Orts
+      - name: Teilstring von Vorname, Nachname oder Benutzername
+    """
     permission_classes = [IsAuthenticated]
-
-    def get(self, request, format=None):
-        customer_profiles = Profile.objects.filter(type='customer')
-        serializer = ProfileSerializer(customer_profiles, many=True)
-        return Response(serializer.data)
-
+    serializer_class = ProfileSerializer
+    pagination_class = ProfilePagination
+    cursor_pagination_class = ProfileCursorPagination
+    profile_type = None
+
+    def get_queryset(self):
+        queryset = Profile.objects.filter(type=self.profile_type).select_related('user').order_by('id')
+        location = self.request.query_params.get('location')
+        name = self.request.query_params.get('name')
+        if location:
+            queryset = queryset.filter(location__icontains=location)
+        if name:
+            queryset = queryset.filter(
+                Q(first_name__icontains=name) | Q(last_name__icontains=name) | Q(user__username__icontains=name)
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        # Wie ProfileDetailView ohne Request-Kontext: Datei-URLs bleiben relativ
+        return self.get_serializer_class()(*args, **kwargs)
+
+
+class BusinessProfileListView(ProfileListView):
+    """
+    GET /api/profiles/business/:
+      Listet die Geschäftsprofile inkl. review_count und average_rating.
+      - ordering: 'average_rating', 'review_count' (mit '-' absteigend, z. B. für "Top bewertet").
+
+    Die Sortierung nach Bewertung läuft als Sortierschritt (temp B-tree) über alle
+    Geschäftsprofile: SQLite beginnt beim Filter type='business' (profile_type_id_idx)
+    und kann die Reihenfolge aus dem Index von BusinessRating.average_rating nicht
+    übernehmen – gemessen auch mit einer 0-Zeile pro Profil, INNER JOIN und Sortierung
+    auf der Spalte statt Coalesce. Bei 10.000 Geschäftsprofilen kostet die Abfrage
+    so ~8 ms statt ~1,6 ms nach id (manage.py benchmark_query_plans); im Seitennummern-
+    Modus lesen COUNT und ETag ohnehin alle Geschäftsprofile (~20 ms je Anfrage).
+    """
+    serializer_class = BusinessProfileSerializer
+    profile_type = 'business'
+
+    def get_queryset(self):
+        # Profile ohne Bewertungen zählen als 0 – damit gibt es auch für den Cursor keine NULL-Werte
+        queryset = super().get_queryset().select_related('user__rating_summary').annotate(
+            average_rating=Coalesce('user__rating_summary__average_rating', 0.0),
+            review_count=Coalesce('user__rating_summary__review_count', 0),
+        )
+        ordering = self.request.query_params.get('ordering', '')
+        if ordering.lstrip('-') in ('average_rating', 'review_count'):
+            queryset = queryset.order_by(ordering, 'id')
+        return queryset
+
+    def get_list_aggregates(self):
+        # Bewertungsübersicht hat kein eigenes updated_at und fließt daher über die Summen in den ETag ein
+        return {
+            'review_sum': Sum('user__rating_summary__review_count'),
+            'rating_sum': Sum('user__rating_summary__rating_sum'),
+        }
+
+    def get_page_validator(self, obj):
+        return obj.pk, obj.updated_at.isoformat(), obj.average_rating, obj.review_count
+
+
+class CustomerProfileListView(ProfileListView):
+    """GET /api/profiles/customer/: Listet die Kundenprofile."""
+    profile_type = 'customer'
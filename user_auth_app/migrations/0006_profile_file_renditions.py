@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0005_alter_profile_description_alter_profile_email_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='file_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:57
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Bestehende Profile: Zeitpunkt der letzten Änderung ist unbekannt, created_at übernehmen
+    Profile = apps.get_model('user_auth_app', 'Profile')
+    Profile.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0006_profile_file_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0007_profile_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['type', 'id'], name='profile_type_id_idx'),
+        ),
+    ]
@@ -7,12 +7,34 @@ class Profile(models.Model):
     last_name = models.CharField(max_length=255, blank=True, default="")
     email = models.EmailField(blank=True, default="")
     file = models.ImageField(upload_to='profile_pics', blank=True, null=True)
+    # Verkleinerte Varianten von file, erzeugt von coderr_backend.images
+    file_renditions = models.JSONField(default=dict, blank=True)
     location = models.CharField(max_length=255, blank=True, default="")
     tel = models.CharField(max_length=20, blank=True, default="")
     description = models.TextField(blank=True, default="")
     working_hours = models.CharField(max_length=100, blank=True, default="")
     type = models.CharField(max_length=50, choices=[('business', 'Business'), ('customer', 'Customer')], blank=False, null=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Profilverzeichnisse: WHERE type = ... ORDER BY id
+            models.Index(fields=['type', 'id'], name='profile_type_id_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Geladenen Typ merken, damit die Signal-Handler einen Wechsel erkennen – nur wenn er mitgeladen wurde
+        if 'type' in field_names:
+            instance._loaded_type = instance.__dict__['type']
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if 'type' in self.__dict__:
+            self._loaded_type = self.type
 
     def __str__(self):
         return self.user.username
@@ -0,0 +1,37 @@
+"""
+Zentrale Rollenauflösung (business/customer) für Berechtigungen und Views.
+
+Der Profiltyp wird pro User-Objekt – also pro Anfrage – höchstens einmal
+geladen: aus dem Token-Cache der Authentifizierung, aus einem per
+select_related('profile') mitgeladenen Profil oder mit einer einzigen
+schmalen Abfrage. Danach liegt er auf `user._profile_type`.
+"""
+from .models import Profile
+
+BUSINESS = 'business'
+CUSTOMER = 'customer'
+
+
+def get_profile_type(user):
+    if user is None or not user.is_authenticated:
+        return None
+    try:
+        return user._profile_type
+    except AttributeError:
+        pass
+
+    if 'profile' in user._state.fields_cache:
+        profile = user._state.fields_cache['profile']
+        profile_type = profile.type if profile is not None else None
+    else:
+        profile_type = Profile.objects.filter(user_id=user.pk).values_list('type', flat=True).first()
+    user._profile_type = profile_type
+    return profile_type
+
+
+def is_business(user):
+    return get_profile_type(user) == BUSINESS
+
+
+def is_customer(user):
+    return get_profile_type(user) == CUSTOMER
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from coderr_backend.images import needs_renditions, schedule_renditions
+
+from .api.authentication import token_cache
+from .models import Profile
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    token_cache.invalidate_key(instance.key)
+
+
+@receiver(post_save, sender=Token)
+def token_saved(sender, instance, **kwargs):
+    # Neu erzeugtes Token: evtl. noch gecachte alte Tokens des Users verwerfen
+    token_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Deckt Deaktivierung (is_active=False), Passwort- und Rechteänderungen ab
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=Profile)
+def profile_file_saved(sender, instance, update_fields=None, **kwargs):
+    if needs_renditions(instance, 'file', 'file_renditions', update_fields):
+        schedule_renditions(instance, 'file', 'file_renditions')
@@ -1,3 +1,176 @@
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from reviews_app.models import Review
+from .api.authentication import token_cache
+from .models import Profile
+from .roles import BUSINESS, get_profile_type, is_business, is_customer
+
+
+# TTL weit über der Testdauer: ein 401 kann nur aus dem Verwerfen des Eintrags kommen
+@override_settings(TOKEN_AUTH_CACHE_TTL=3600)
+class TokenCacheInvalidationTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user('customer', password='secret')
+        Profile.objects.create(user=self.user, type='customer')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def get_orders(self):
+        return self.client.get('/api/orders/')
+
+    def test_cached_token_skips_token_query(self):
+        self.assertEqual(self.get_orders().status_code, 200)
+        self.assertIsNotNone(token_cache.get(self.token.key))
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.get_orders().status_code, 200)
+        self.assertFalse(any('authtoken_token' in query['sql'] for query in context.captured_queries))
+
+    def test_deleted_token_is_rejected_on_next_request(self):
+        self.assertEqual(self.get_orders().status_code, 200)
+        self.token.delete()
+        self.assertEqual(self.get_orders().status_code, 401)
+
+    def test_deactivated_user_is_rejected_on_next_request(self):
+        self.assertEqual(self.get_orders().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_orders().status_code, 401)
+
+    def test_profile_change_drops_cached_role(self):
+        self.assertEqual(self.get_orders().status_code, 200)
+        profile = Profile.objects.get(user=self.user)
+        profile.type = 'business'
+        profile.save()
+        self.assertIsNone(token_cache.get(self.token.key))
+
+
+class RoleTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.business = User.objects.create_user('business', password='secret')
+        Profile.objects.create(user=self.business, type=BUSINESS)
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def profile_queries(self, context):
+        return [query['sql'] for query in context.captured_queries if 'FROM "user_auth_app_profile"' in query['sql']]
+
+    def test_permission_classes_need_no_profile_query(self):
+        token = Token.objects.create(user=self.business)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        payload = {
+            'title': 'Logo', 'description': 'Logos',
+            'details': [
+                {'title': offer_type, 'revisions': 1, 'delivery_time_in_days': 3, 'price': 100,
+                 'features': ['Logo'], 'offer_type': offer_type}
+                for offer_type in ('basic', 'standard', 'premium')
+            ],
+        }
+        # Erste Anfrage: Profil kommt mit der Token-Abfrage, danach aus dem Token-Cache
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                response = client.post('/api/offers/bulk/', [payload], format='json')
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(self.profile_queries(context), [])
+
+    def test_role_is_loaded_once_per_user_object(self):
+        user = User.objects.get(pk=self.business.pk)
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(is_business(user))
+            self.assertFalse(is_customer(user))
+        self.assertEqual(len(context.captured_queries), 1)
+
+        user = User.objects.select_related('profile').get(pk=self.business.pk)
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(is_business(user))
+        self.assertEqual(context.captured_queries, [])
+
+    def test_user_without_profile_has_no_role(self):
+        user = User.objects.create_user('ohne_profil', password='secret')
+        self.assertIsNone(get_profile_type(user))
+        self.assertFalse(is_business(user))
+        self.assertFalse(is_customer(user))
+
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        self.assertEqual(client.post('/api/offers/bulk/', [], format='json').status_code, 403)
+        self.assertEqual(client.post('/api/orders/', {'offer_detail_id': 1}, format='json').status_code, 403)
+
+    def test_anonymous_user_has_no_role(self):
+        self.assertIsNone(get_profile_type(AnonymousUser()))
+        self.assertIsNone(get_profile_type(None))
+
+
+class BusinessProfileListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user('kunde', password='secret')
+        Profile.objects.create(user=self.customer, type='customer', location='Berlin')
+        self.client.force_authenticate(self.customer)
+
+        rows = [
+            ('anna', 'Anna', 'Schmidt', 'Berlin'),
+            ('bernd', 'Bernd', 'Meier', 'Hamburg'),
+            ('carla', 'Carla', 'Schneider', 'Berlin-Mitte'),
+        ]
+        self.profiles = {}
+        for username, first_name, last_name, location in rows:
+            user = User.objects.create_user(username, password='secret')
+            self.profiles[username] = Profile.objects.create(
+                user=user, type='business', first_name=first_name, last_name=last_name, location=location
+            )
+        self.rate('bernd', 5)
+        self.rate('carla', 3)
+
+    def rate(self, username, rating):
+        Review.objects.create(business_user=self.profiles[username].user, reviewer=self.customer,
+                              rating=rating, description='Text')
+
+    def usernames(self, response):
+        return [profile['username'] for profile in response.json()['results']]
+
+    def test_paginated_shape(self):
+        response = self.client.get('/api/profiles/business/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()), ['count', 'next', 'previous', 'results'])
+        self.assertEqual(response.json()['count'], 3)
+        self.assertIsNotNone(response.json()['next'])
+        self.assertIsNone(response.json()['previous'])
+        self.assertEqual(self.usernames(response), ['anna', 'bernd'])
+
+        response = self.client.get(response.json()['next'])
+        self.assertIsNone(response.json()['next'])
+        self.assertEqual(self.usernames(response), ['carla'])
+
+    def test_rating_fields_and_ordering(self):
+        response = self.client.get('/api/profiles/business/', {'ordering': '-average_rating'})
+        self.assertEqual(self.usernames(response), ['bernd', 'carla', 'anna'])
+        anna = response.json()['results'][2]
+        self.assertEqual((anna['average_rating'], anna['review_count']), (0.0, 0))
+
+        response = self.client.get('/api/profiles/business/', {'ordering': 'review_count'})
+        self.assertEqual(self.usernames(response), ['anna', 'bernd', 'carla'])
+
+    def test_location_filter(self):
+        response = self.client.get('/api/profiles/business/', {'location': 'berlin'})
+        self.assertEqual(self.usernames(response), ['anna', 'carla'])
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_name_filter(self):
+        # Vorname, Nachname oder Benutzername
+        self.assertEqual(self.usernames(self.client.get('/api/profiles/business/', {'name': 'schn'})), ['carla'])
+        self.assertEqual(self.usernames(self.client.get('/api/profiles/business/', {'name': 'BERND'})), ['bernd'])
+        self.assertEqual(self.usernames(self.client.get('/api/profiles/business/', {'name': 'an'})), ['anna'])
+        self.assertEqual(self.client.get('/api/profiles/business/', {'name': 'xyz'}).json()['count'], 0)